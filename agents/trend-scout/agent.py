@@ -13,8 +13,6 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
 import aiohttp
-import feedparser
-from pytrends.request import TrendReq
 import redis
 from opentelemetry import trace
 from opentelemetry.exporter.jaeger import JaegerExporter
@@ -22,6 +20,19 @@ from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from pydantic import BaseModel, Field, validator
 
+from archive import DEFAULT_ARCHIVE_DIR, TrendArchive
+from blocking_pool import BlockingStagePool, EventLoopLagMonitor
+from dedup import NearDuplicateClusterer, shingles
+from feed_cache import FeedValidatorCache
+from quota import DistributedQuota
+from ranking import TrendRanker
+from scheduler import AdaptivePollScheduler, IngestedItemStore, SourceRegistry
+from seen_index import SeenEntryIndex
+from summarizer import ExtractiveSummarizer, clip
+from term_stats import BurstDetector
+from trends_planner import TrendsKeywordPlanner
+from velocity import KeywordSeriesStore
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,6 +59,13 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+# Binary-safe connection for packed time-series values
+binary_redis_client = redis.Redis(
+    host=os.getenv('REDIS_HOST', 'redis-cluster.grayghostai'),
+    port=int(os.getenv('REDIS_PORT', '6379')),
+    password=os.getenv('REDIS_PASSWORD')
+)
+
 class TrendSource(BaseModel):
     """Configuration for a trend data source"""
     name: str
@@ -55,6 +73,9 @@ class TrendSource(BaseModel):
     url: Optional[str] = None
     keywords: List[str] = Field(default_factory=list)
     enabled: bool = True
+    poll_interval: Optional[int] = None  # Fixed scheduler interval; learned when unset
+    quota: Optional[int] = None  # Per-source call budget per quota window
+    weight: float = 1.0  # Ranking multiplier for items from this source
 
 class TrendBrief(BaseModel):
     """Output format for trend briefs"""
@@ -78,13 +99,94 @@ class TrendScout:
     """Main agent class for trend scouting"""
     
     def __init__(self):
+        self.source_registry = SourceRegistry(redis_client)
         self.sources = self._load_sources()
         self.api_quota = int(os.getenv('API_QUOTA', '1000'))
         self.ttl_hours = int(os.getenv('TTL_HOURS', '24'))
-        self.api_calls_made = 0
+        
+        # Quota is shared by all replicas through Redis token buckets
+        self.quota = DistributedQuota(
+            redis_client,
+            capacity=self.api_quota,
+            window_seconds=int(os.getenv('API_QUOTA_WINDOW_SECONDS', '3600'))
+        )
+        
+        # Blocking parse/pytrends stages run on a bounded executor pool
+        self.stage_pool = BlockingStagePool(
+            kind=os.getenv('TREND_EXECUTOR_KIND', 'thread'),
+            max_workers=int(os.getenv('TREND_EXECUTOR_WORKERS', '4')),
+            max_queue=int(os.getenv('TREND_EXECUTOR_QUEUE', '32'))
+        )
+        self.stage_timeout = float(os.getenv('TREND_STAGE_TIMEOUT', '60'))
+        self.loop_monitor = EventLoopLagMonitor()
+        self.feed_cache = FeedValidatorCache(redis_client, stage_pool=self.stage_pool)
+        self.trends_planner = TrendsKeywordPlanner(
+            redis_client,
+            self.stage_pool,
+            quota=self.quota,
+            anchor=os.getenv('TREND_ANCHOR_KEYWORD', 'technology'),
+            stage_timeout=self.stage_timeout
+        )
+        
+        # Incremental mode only passes entries not seen before into brief generation
+        self.ingest_mode = os.getenv('TREND_INGEST_MODE', 'full')
+        self.seen_index = SeenEntryIndex(
+            redis_client,
+            ttl_seconds=int(os.getenv('SEEN_ENTRY_TTL_HOURS', '168')) * 3600
+        )
+        
+        # Scheduled mode: sources are polled in the background and briefs
+        # read from the ingested store instead of fetching on the request path
+        self.scheduler_enabled = os.getenv('TREND_SCHEDULER_ENABLED', 'false').lower() == 'true'
+        self.deduplicator = NearDuplicateClusterer(
+            threshold=float(os.getenv('TREND_DEDUP_THRESHOLD', '0.5'))
+        )
+        self.burst_detector = BurstDetector(
+            short_half_life=float(os.getenv('TREND_BURST_SHORT_HALF_LIFE', '3600')),
+            long_half_life=float(os.getenv('TREND_BURST_LONG_HALF_LIFE', '86400'))
+        )
+        self.series_store = KeywordSeriesStore(
+            binary_redis_client,
+            capacity=int(os.getenv('TREND_SERIES_CAPACITY', '336')),
+            ttl_seconds=int(os.getenv('TREND_SERIES_TTL_DAYS', '30')) * 86400
+        )
+        self.summarizer = ExtractiveSummarizer()
+        
+        # Everything ingested and briefed is kept in an hourly-partitioned
+        # Parquet archive for backtesting and historical queries
+        self.archive = TrendArchive(
+            os.getenv('TREND_ARCHIVE_DIR', DEFAULT_ARCHIVE_DIR),
+            flush_rows=int(os.getenv('TREND_ARCHIVE_FLUSH_ROWS', '5000')),
+            flush_seconds=float(os.getenv('TREND_ARCHIVE_FLUSH_SECONDS', '300')),
+            compact_interval=float(os.getenv('TREND_ARCHIVE_COMPACT_SECONDS', '3600'))
+        )
+        self.max_briefs = int(os.getenv('TREND_MAX_BRIEFS', '3'))
+        self.rank_half_life = float(os.getenv('TREND_RANK_HALF_LIFE', '21600'))
+        self.item_store = IngestedItemStore(redis_client, retention_seconds=self.ttl_hours * 3600)
+        self.scheduler = AdaptivePollScheduler(
+            registry=self.source_registry,
+            store=self.item_store,
+            poll_fn=self._poll_source,
+            replica_id=os.getenv('HOSTNAME', 'trend-scout-0'),
+            min_interval=int(os.getenv('TREND_POLL_MIN_SECONDS', '60')),
+            max_interval=int(os.getenv('TREND_POLL_MAX_SECONDS', '21600')),
+            concurrency_budget=int(os.getenv('TREND_POLL_CONCURRENCY', '64'))
+        )
         
     def _load_sources(self) -> List[TrendSource]:
-        """Load trend sources from configuration"""
+        """Load trend sources from the registry, seeding it with defaults"""
+        default_sources = self._default_sources()
+        try:
+            registered = self.source_registry.all_sources()
+            if registered:
+                return [TrendSource(**source) for source in registered]
+            self.source_registry.register([source.dict() for source in default_sources])
+        except redis.RedisError as e:
+            logger.warning(f"Source registry unavailable, using defaults: {e}")
+        return default_sources
+    
+    def _default_sources(self) -> List[TrendSource]:
+        """Built-in trend sources used to seed the registry"""
         default_sources = [
             TrendSource(
                 name="Krebs on Security",
@@ -101,121 +203,161 @@ class TrendScout:
             TrendSource(
                 name="Google Trends - Tech",
                 type="trends",
-                keywords=["AI", "cybersecurity", "cloud", "blockchain"]
+                keywords=["AI", "cybersecurity", "cloud", "blockchain"],
+                poll_interval=3600,
+                quota=100
             )
         ]
         return default_sources
     
     @tracer.start_as_current_span("fetch_rss_feed")
-    async def _fetch_rss_feed(self, source: TrendSource) -> List[Dict[str, Any]]:
-        """Fetch and parse RSS feed"""
-        if self.api_calls_made >= self.api_quota:
-            logger.warning(f"API quota exceeded: {self.api_calls_made}/{self.api_quota}")
+    async def _fetch_rss_feed(self, source: TrendSource, incremental: bool = False) -> List[Dict[str, Any]]:
+        """Fetch and parse RSS feed, optionally keeping only unseen entries"""
+        reservation = self.quota.reserve(source.name, source.quota)
+        if not reservation.granted:
+            logger.warning(
+                f"API quota exceeded for {source.name} ({reservation.scope}), "
+                f"refill in {reservation.retry_after:.0f}s"
+            )
             return []
             
         async with aiohttp.ClientSession() as session:
             try:
-                async with session.get(source.url, timeout=30) as response:
-                    content = await response.text()
-                    feed = feedparser.parse(content)
-                    self.api_calls_made += 1
-                    
-                    items = []
-                    for entry in feed.entries[:10]:  # Limit to 10 most recent
-                        items.append({
-                            'title': entry.get('title', ''),
-                            'link': entry.get('link', ''),
-                            'summary': entry.get('summary', ''),
-                            'published': entry.get('published_parsed', None),
-                            'source': source.name
-                        })
-                    return items
-                    
+                # Conditional GET: unchanged feeds are served from the parsed cache
+                entries = await self.feed_cache.fetch_entries(session, source.url)
+                
+                entries = entries[:10]  # Limit to 10 most recent
+                if incremental:
+                    entries = self.seen_index.filter_new(source.name, entries)
+                
+                items = []
+                for entry in entries:
+                    items.append({
+                        'title': entry.get('title', ''),
+                        'link': entry.get('link', ''),
+                        'summary': entry.get('summary', ''),
+                        'published': entry.get('published_parsed', None),
+                        'source': source.name
+                    })
+                return items
+                
             except Exception as e:
                 logger.error(f"Error fetching RSS from {source.name}: {e}")
                 return []
     
     @tracer.start_as_current_span("fetch_google_trends")
-    def _fetch_google_trends(self, source: TrendSource) -> List[Dict[str, Any]]:
+    async def _fetch_google_trends(self, source: TrendSource) -> List[Dict[str, Any]]:
         """Fetch Google Trends data"""
-        if self.api_calls_made >= self.api_quota:
-            logger.warning(f"API quota exceeded: {self.api_calls_made}/{self.api_quota}")
-            return []
-            
         try:
-            pytrends = TrendReq(hl='en-US', tz=360)
-            pytrends.build_payload(source.keywords, timeframe='now 1-d')
-            interest_df = pytrends.interest_over_time()
-            self.api_calls_made += 1
+            interest = await self.trends_planner.fetch(
+                source.keywords,
+                'now 1-d',
+                source=source.name,
+                source_budget=source.quota
+            )
             
-            if interest_df.empty:
+            if not interest:
                 return []
                 
+            # Extend the stored history and score momentum across all keywords at once
+            series = self.series_store.record(
+                'now 1-d', {k: (ts, values) for k, (ts, values, _) in interest.items()}
+            )
+            momentum = self.series_store.momentum(list(interest), 'now 1-d', series)
+            
             # Convert to list of trend items
             items = []
-            for keyword in source.keywords:
-                if keyword in interest_df.columns:
-                    avg_interest = interest_df[keyword].mean()
-                    items.append({
-                        'title': f"Trending: {keyword}",
-                        'interest_score': float(avg_interest),
-                        'keyword': keyword,
-                        'source': 'Google Trends'
-                    })
+            for keyword, (_, points, _) in interest.items():
+                items.append({
+                    'title': f"Trending: {keyword}",
+                    'interest_score': float(points.mean()),
+                    'keyword': keyword,
+                    'source': 'Google Trends',
+                    **momentum.get(keyword, {})
+                })
             
-            return sorted(items, key=lambda x: x['interest_score'], reverse=True)[:5]
+            return sorted(
+                items,
+                key=lambda x: (x.get('momentum', 0.0), x['interest_score']),
+                reverse=True
+            )[:5]
             
         except Exception as e:
             logger.error(f"Error fetching Google Trends: {e}")
             return []
     
-    @tracer.start_as_current_span("generate_brief")
-    def _generate_brief(self, raw_items: List[Dict[str, Any]], source: str) -> Optional[TrendBrief]:
-        """Generate a 5-line brief from raw trend data"""
-        if not raw_items:
-            return None
-            
-        # Sort by relevance/interest
-        sorted_items = sorted(
-            raw_items,
-            key=lambda x: x.get('interest_score', 0) + len(x.get('title', '')),
-            reverse=True
-        )
+    async def _poll_source(self, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Scheduler poll callback: fetch new items for one registered source"""
+        source = TrendSource(**config)
         
-        # Extract top item for main brief
-        top_item = sorted_items[0]
+        if source.type == 'rss':
+            items = await self._fetch_rss_feed(source, incremental=True)
+        elif source.type == 'trends':
+            items = await self._fetch_google_trends(source)
+        else:
+            items = []
         
-        # Generate 5-line summary
-        summary_lines = [
-            f"TREND: {top_item.get('title', 'Unknown trend detected')}",
-            f"SOURCE: {source} | RELEVANCE: High",
-            f"KEY INSIGHT: {self._extract_insight(top_item)}",
-            f"OPPORTUNITY: {self._suggest_opportunity(top_item)}",
-            f"ACTION: Monitor for next 24-48 hours"
-        ]
+        for item in items:
+            item['source_name'] = source.name
+        self.burst_detector.observe(items)
+        self.archive.append_items(items)
+        await self.archive.maybe_flush()
+        return items
+    
+    def _rank_stories(self, raw_items: List[Dict[str, Any]], k: int) -> TrendRanker:
+        """Collapse duplicate stories and keep the top K by decayed score"""
+        ranker = TrendRanker(
+            k=k,
+            half_life=self.rank_half_life,
+            source_weights={source.name: source.weight for source in self.sources},
+            burst_detector=self.burst_detector
+        )
+        # Collapse the same story reported by several sources into one item
+        ranker.extend(self.deduplicator.cluster(raw_items))
+        return ranker
+    
+    @tracer.start_as_current_span("generate_brief")
+    def _generate_briefs(self, ranker: TrendRanker, source: str) -> List[TrendBrief]:
+        """Generate a 5-line brief for each of the top-ranked stories"""
+        ranked_items = ranker.top()
+        if not ranked_items:
+            return []
         
-        # Calculate relevance score
-        relevance_score = min(1.0, len(sorted_items) / 10.0)
+        # Volume of distinct stories, scaled by each story's share of the leader's score
+        volume = min(1.0, ranker.seen / 10.0)
+        best_score = ranked_items[0]['rank_score'] or 1.0
+        generated_at = datetime.utcnow()
         
-        brief = TrendBrief(
-            id=f"trend_{datetime.utcnow().timestamp()}",
-            title=top_item.get('title', ''),
-            summary=summary_lines,
-            source=source,
-            relevance_score=relevance_score,
-            keywords=self._extract_keywords(sorted_items),
-            timestamp=datetime.utcnow(),
-            raw_data={'items': sorted_items[:3]}  # Include top 3 for context
-        )
+        briefs = []
+        for rank, item in enumerate(ranked_items):
+            # Generate 5-line summary
+            summary_lines = [
+                f"TREND: {clip(item.get('title') or 'Unknown trend detected', 93)}",
+                f"SOURCE: {source} | RELEVANCE: {'High' if rank == 0 else 'Medium'}",
+                f"KEY INSIGHT: {self._extract_insight(item)}",
+                f"OPPORTUNITY: {self._suggest_opportunity(item)}",
+                f"ACTION: Monitor for next 24-48 hours"
+            ]
+            
+            briefs.append(TrendBrief(
+                id=f"trend_{generated_at.timestamp()}_{rank}",
+                title=item.get('title', ''),
+                summary=summary_lines,
+                source=source,
+                relevance_score=round(volume * item['rank_score'] / best_score, 3),
+                keywords=self._extract_keywords([item]),
+                timestamp=generated_at,
+                raw_data={'items': [item]}
+            ))
         
-        return brief
+        return briefs
     
     def _extract_insight(self, item: Dict[str, Any]) -> str:
         """Extract key insight from trend item"""
-        if 'summary' in item:
-            # Truncate summary to fit line limit
-            return item['summary'][:80] + "..."
-        elif 'interest_score' in item:
+        insight = self.summarizer.key_sentence(item.get('summary', ''), max_chars=83)
+        if insight:
+            return insight
+        if 'interest_score' in item:
             return f"Search interest at {item['interest_score']:.0f}% of peak"
         else:
             return "Emerging topic gaining traction"
@@ -234,62 +376,130 @@ class TrendScout:
             return "Analyze impact on target audience"
     
     def _extract_keywords(self, items: List[Dict[str, Any]]) -> List[str]:
-        """Extract unique keywords from all items"""
-        keywords = set()
+        """Extract keywords, preferring terms that are rising right now"""
+        keywords = []
+        for item in items:
+            if 'keyword' in item and item['keyword'] not in keywords:
+                keywords.append(item['keyword'])
+        
+        # Rank the items' own terms/bigrams by burst score; when history is
+        # too thin to show a burst, fall back to the most mentioned terms
+        candidates = set()
         for item in items:
-            if 'keyword' in item:
-                keywords.add(item['keyword'])
-            if 'title' in item:
-                # Simple keyword extraction from title
-                words = item['title'].lower().split()
-                keywords.update(w for w in words if len(w) > 4)
+            candidates.update(shingles(item.get('title', '')))
         
-        return list(keywords)[:10]
+        rising = self.burst_detector.top_rising(k=10, candidates=candidates)
+        if len(rising) < 10:
+            rising += self.burst_detector.top_rising(k=10, candidates=candidates, min_support=0)
+        
+        for term, _ in rising:
+            if term not in keywords:
+                keywords.append(term)
+        
+        return keywords[:10]
     
     @tracer.start_as_current_span("process_request")
     async def process(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Main processing method for agent requests"""
         logger.info(f"Processing trend scout request: {request}")
+        self.loop_monitor.ensure_started()
+        self.archive.ensure_started()
+        
+        # Historical queries are answered from the archive without fetching
+        if 'archive_query' in request:
+            await asyncio.to_thread(self.archive.flush)
+            result = await asyncio.to_thread(self.archive.query_records, request['archive_query'])
+            return {
+                'status': 'success',
+                'archive': result,
+                'timestamp': datetime.utcnow().isoformat()
+            }
         
         # Extract sources from request
         requested_sources = request.get('sources', ['all'])
+        incremental = request.get('mode', self.ingest_mode) == 'incremental'
         
         # Collect trend data
         all_items = []
         
-        for source in self.sources:
-            if 'all' not in requested_sources and source.name not in requested_sources:
-                continue
+        if self.scheduler_enabled:
+            self.scheduler.start()
+            all_items = self.item_store.recent(
+                window_seconds=int(request.get('window_hours', 6)) * 3600
+            )
+            if 'all' not in requested_sources:
+                all_items = [i for i in all_items if i.get('source_name') in requested_sources]
+        else:
+            for source in self.sources:
+                if 'all' not in requested_sources and source.name not in requested_sources:
+                    continue
+                    
+                if source.type == 'rss':
+                    items = await self._fetch_rss_feed(source, incremental=incremental)
+                elif source.type == 'trends':
+                    items = await self._fetch_google_trends(source)
+                else:
+                    continue
                 
-            if source.type == 'rss':
-                items = await self._fetch_rss_feed(source)
-                all_items.extend(items)
-            elif source.type == 'trends':
-                items = self._fetch_google_trends(source)
+                for item in items:
+                    item['source_name'] = source.name
                 all_items.extend(items)
+            
+            # Scheduled polls archive as they ingest; direct fetches archive here
+            self.archive.append_items(all_items)
+            await self.archive.maybe_flush()
+        
+        # Fold new items into the term statistics before keyword extraction
+        self.burst_detector.observe(all_items)
+        
+        ingestion = {
+            'mode': 'scheduled' if self.scheduler_enabled else ('incremental' if incremental else 'full'),
+            'new_entries_per_source': self.seen_index.stats() if incremental or self.scheduler_enabled else {}
+        }
         
-        # Generate brief
-        brief = self._generate_brief(all_items, ', '.join(requested_sources))
+        # Rank stories and generate a brief for each of the leaders
+        max_briefs = max(1, int(request.get('max_briefs', self.max_briefs)))
+        ranker = self._rank_stories(all_items, max_briefs)
+        briefs = self._generate_briefs(ranker, ', '.join(requested_sources))
         
-        if not brief:
+        if not briefs:
             return {
                 'status': 'no_trends',
                 'message': 'No significant trends detected',
+                'ingestion': ingestion,
                 'timestamp': datetime.utcnow().isoformat()
             }
         
-        # Cache result in Redis
-        cache_key = f"trend_brief:{brief.id}"
-        redis_client.setex(
-            cache_key,
-            timedelta(hours=self.ttl_hours),
-            json.dumps(brief.dict(), default=str)
-        )
+        self.archive.append_briefs([brief.dict() for brief in briefs])
+        await self.archive.maybe_flush()
+        
+        # Cache results in Redis
+        pipe = redis_client.pipeline(transaction=False)
+        for brief in briefs:
+            pipe.setex(
+                f"trend_brief:{brief.id}",
+                timedelta(hours=self.ttl_hours),
+                json.dumps(brief.dict(), default=str)
+            )
+        pipe.execute()
         
         return {
             'status': 'success',
-            'brief': brief.dict(),
-            'api_calls_remaining': self.api_quota - self.api_calls_made,
+            'brief': briefs[0].dict(),
+            'briefs': [brief.dict() for brief in briefs],
+            'ranking': ranker.stats(),
+            'api_calls_remaining': self.quota.remaining(),
+            'api_quota': self.quota.stats(),
+            'feed_cache': self.feed_cache.stats(),
+            'trends_planner': self.trends_planner.stats(),
+            'ingestion': ingestion,
+            'rising_terms': self.burst_detector.top_rising(k=10),
+            'runtime': {
+                'scheduler': self.scheduler.stats() if self.scheduler_enabled else None,
+                'executor': self.stage_pool.stats(),
+                'event_loop': self.loop_monitor.stats(),
+                'archive': self.archive.stats()
+            },
             'timestamp': datetime.utcnow().isoformat()
         }
 
@@ -314,6 +524,11 @@ async def main():
     print(json.dumps(result, indent=2))
     
     # Cleanup
+    if scout.scheduler_enabled:
+        await scout.scheduler.stop()
+    await scout.archive.stop()
+    scout.loop_monitor.stop()
+    scout.stage_pool.shutdown()
     await asyncio.sleep(1)  # Allow spans to flush
 
 if __name__ == "__main__":
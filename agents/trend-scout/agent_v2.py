@@ -5,14 +5,15 @@ Following Anthropic best practices and n8n AI integration patterns
 """
 
 import asyncio
+import copy
 import json
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 
 import aiohttp
-import feedparser
-from pytrends.request import TrendReq
+import redis
 
 # Import enterprise base class
 import sys
@@ -25,9 +26,39 @@ from base.enterprise_agent import (
     AgentContext,
     StructuredPromptBuilder
 )
+from archive import DEFAULT_ARCHIVE_DIR, TrendArchive
+from batch_jobs import AnthropicBatchBackend, BatchJobManager, LocalBatchBackend
+from blocking_pool import BlockingStagePool, EventLoopLagMonitor
+from dedup import NearDuplicateClusterer
+from feed_cache import FeedValidatorCache
+from prompt_budget import compact_json, compact_trend, estimate_tokens, pack_by_budget
+from quota import DistributedQuota
+from ranking import TrendRanker
+from scheduler import IngestedItemStore, SourceRegistry
+from semantic_cache import SemanticCache
+from speculation import BriefSpeculator
+from summarizer import ExtractiveSummarizer, clip
+from swr_cache import StaleWhileRevalidateCache
+from trends_planner import TrendsKeywordPlanner
+from velocity import KeywordSeriesStore
+from virality_model import ViralityCascade, ViralityModel
 
 logger = logging.getLogger(__name__)
 
+ANALYSIS_SYSTEM_PROMPT = "You are a content strategist analyzing trends for social media content creation."
+DEFAULT_AUDIENCE = 'general tech audience'
+
+# Every predict_virality response carries these fields, whichever tier answered
+VIRALITY_RESPONSE_FIELDS: Dict[str, Any] = {
+    'virality_score': None,
+    'confidence_level': None,
+    'key_strengths': [],
+    'improvement_suggestions': [],
+    'optimal_posting_time': None,
+    'expected_metrics': {'views_range': None, 'engagement_rate': None, 'share_likelihood': None},
+    'risk_factors': []
+}
+
 class TrendScoutAgent(EnterpriseAgent):
     """
     Enterprise Trend Scout Agent
@@ -42,10 +73,139 @@ class TrendScoutAgent(EnterpriseAgent):
         )
         
         # Agent-specific configuration
+        self.source_registry = SourceRegistry(self.redis_client)
         self.rss_sources = self._load_rss_sources()
         self.api_quota = int(os.getenv('TREND_API_QUOTA', '1000'))
         self.trend_cache_ttl = int(os.getenv('TREND_CACHE_TTL', '3600'))
         
+        # Hourly discovery results, refreshed by one replica at a time
+        self.discover_cache = StaleWhileRevalidateCache(
+            self.redis_client,
+            key="trends:discover:latest",
+            period_seconds=self.trend_cache_ttl,
+            stale_ttl=int(os.getenv('TREND_CACHE_STALE_TTL', '21600')),
+            refresh_ahead=int(os.getenv('TREND_CACHE_REFRESH_AHEAD', '120')),
+            lock_ttl=int(os.getenv('TREND_CACHE_LOCK_TTL', '120'))
+        )
+        
+        # Quota is shared by all replicas through Redis token buckets
+        self.quota = DistributedQuota(
+            self.redis_client,
+            capacity=self.api_quota,
+            window_seconds=int(os.getenv('TREND_API_QUOTA_WINDOW_SECONDS', '3600'))
+        )
+        
+        # Blocking parse/pytrends stages run on a bounded executor pool
+        self.stage_pool = BlockingStagePool(
+            kind=os.getenv('TREND_EXECUTOR_KIND', 'thread'),
+            max_workers=int(os.getenv('TREND_EXECUTOR_WORKERS', '4')),
+            max_queue=int(os.getenv('TREND_EXECUTOR_QUEUE', '32'))
+        )
+        self.stage_timeout = float(os.getenv('TREND_STAGE_TIMEOUT', '60'))
+        self.loop_monitor = EventLoopLagMonitor()
+        self.feed_cache = FeedValidatorCache(self.redis_client, stage_pool=self.stage_pool)
+        self.trends_planner = TrendsKeywordPlanner(
+            self.redis_client,
+            self.stage_pool,
+            quota=self.quota,
+            anchor=os.getenv('TREND_ANCHOR_KEYWORD', 'technology'),
+            stage_timeout=self.stage_timeout
+        )
+        self.deduplicator = NearDuplicateClusterer(
+            threshold=float(os.getenv('TREND_DEDUP_THRESHOLD', '0.5'))
+        )
+        
+        # Briefs are drafted locally; Claude only polishes the top-ranked ones
+        self.summarizer = ExtractiveSummarizer()
+        self.brief_polish_top_n = int(os.getenv('TREND_BRIEF_POLISH_TOP_N', '1'))
+        
+        # Rising stories, from scheduler-ingested items and discovery, can get
+        # polished briefs ahead of demand, drawing on their own quota so
+        # fetches are never starved (off by default)
+        self.speculation_enabled = os.getenv('TREND_SPECULATION_ENABLED', 'false').lower() == 'true'
+        self.speculator = BriefSpeculator(
+            self.redis_client,
+            DistributedQuota(
+                self.redis_client,
+                capacity=int(os.getenv('TREND_SPECULATION_BUDGET', '24')),
+                window_seconds=int(os.getenv('TREND_API_QUOTA_WINDOW_SECONDS', '3600')),
+                key_prefix="speculation_quota"
+            ),
+            self.deduplicator,
+            audience=DEFAULT_AUDIENCE,
+            item_store=IngestedItemStore(self.redis_client),
+            top_n=int(os.getenv('TREND_SPECULATION_TOP_N', '3')),
+            freshness_seconds=int(os.getenv('TREND_SPECULATION_FRESHNESS', '1800')),
+            interval_seconds=int(os.getenv('TREND_SPECULATION_INTERVAL', '300')),
+            window_seconds=int(os.getenv('TREND_SPECULATION_WINDOW', '21600'))
+        )
+        
+        # Near-duplicate analyze/virality requests are served from memory
+        similarity_threshold = float(os.getenv('TREND_SEMANTIC_CACHE_THRESHOLD', '0.88'))
+        semantic_capacity = int(os.getenv('TREND_SEMANTIC_CACHE_SIZE', '2048'))
+        semantic_ttl = int(os.getenv('TREND_SEMANTIC_CACHE_TTL', '21600'))
+        self.analysis_cache = SemanticCache(
+            'analyze_trend', capacity=semantic_capacity,
+            threshold=similarity_threshold, ttl_seconds=semantic_ttl
+        )
+        self.virality_cache = SemanticCache(
+            'predict_virality', capacity=semantic_capacity,
+            threshold=similarity_threshold, ttl_seconds=semantic_ttl
+        )
+        
+        # Virality is scored locally first; only contenders escalate to Claude
+        self.virality_cascade = ViralityCascade(
+            ViralityModel(self.redis_client),
+            threshold=float(os.getenv('TREND_VIRALITY_THRESHOLD', '50')),
+            band=float(os.getenv('TREND_VIRALITY_BAND', '15')),
+            min_samples=int(os.getenv('TREND_VIRALITY_MIN_SAMPLES', '50'))
+        )
+        
+        # compare_trends: local shortlist, then chunked map-reduce comparison
+        self.compare_top_k = int(os.getenv('TREND_COMPARE_TOP_K', '5'))
+        self.compare_shortlist = int(os.getenv('TREND_COMPARE_SHORTLIST', '40'))
+        self.compare_chunk_size = int(os.getenv('TREND_COMPARE_CHUNK_SIZE', '10'))
+        self.compare_token_budget = int(os.getenv('TREND_COMPARE_TOKEN_BUDGET', '3000'))
+        self.compare_concurrency = int(os.getenv('TREND_COMPARE_CONCURRENCY', '4'))
+        
+        # Historical archive of fetched items and generated briefs
+        self.archive = TrendArchive(
+            os.getenv('TREND_ARCHIVE_DIR', DEFAULT_ARCHIVE_DIR),
+            flush_rows=int(os.getenv('TREND_ARCHIVE_FLUSH_ROWS', '5000')),
+            flush_seconds=float(os.getenv('TREND_ARCHIVE_FLUSH_SECONDS', '300')),
+            compact_interval=float(os.getenv('TREND_ARCHIVE_COMPACT_SECONDS', '3600'))
+        )
+        
+        # Offline analysis jobs go through bulk submissions, off the interactive path.
+        # The local backend only returns stub replies, so it must be asked for
+        # explicitly; without an API key batch jobs are refused.
+        batch_backend_name = os.getenv('TREND_BATCH_BACKEND', 'anthropic')
+        if batch_backend_name == 'local':
+            batch_backend = LocalBatchBackend(self.redis_client)
+        elif batch_backend_name == 'anthropic' and self.anthropic_client:
+            batch_backend = AnthropicBatchBackend(self.anthropic_client)
+        else:
+            batch_backend = None
+        self.batch_jobs = BatchJobManager(
+            self.redis_client,
+            batch_backend,
+            parse=self._parse_anthropic_response,
+            on_results=self.archive.append_analyses,
+            submission_size=int(os.getenv('TREND_BATCH_SUBMISSION_SIZE', '100'))
+        ) if batch_backend else None
+        
+        # Keyword interest history lives in Redis as packed arrays, so it
+        # needs a connection that returns raw bytes
+        self.series_store = KeywordSeriesStore(
+            redis.Redis(
+                host=self.redis_host,
+                port=self.redis_port,
+                password=self.redis_password
+            ),
+            capacity=int(os.getenv('TREND_SERIES_CAPACITY', '336')),
+            ttl_seconds=int(os.getenv('TREND_SERIES_TTL_DAYS', '30')) * 86400
+        )
+        
         # Initialize trend tools
         self.tools = self._initialize_tools()
         
@@ -56,7 +216,11 @@ class TrendScoutAgent(EnterpriseAgent):
             "analyze_trend",
             "generate_brief",
             "compare_trends",
-            "predict_virality"
+            "predict_virality",
+            "record_virality_outcome",
+            "submit_analysis_batch",
+            "poll_analysis_batch",
+            "query_archive"
         ]
     
     def _initialize_tools(self) -> List[Dict[str, Any]]:
@@ -125,6 +289,10 @@ class TrendScoutAgent(EnterpriseAgent):
     async def process_action(self, action: str, data: Dict[str, Any], 
                            context: AgentContext) -> Dict[str, Any]:
         """Process specific actions"""
+        self.loop_monitor.ensure_started()
+        self.archive.ensure_started()
+        if self.speculation_enabled:
+            self.speculator.ensure_started(self._speculate_brief)
         
         if action == "discover_trends":
             return await self._discover_trends(data, context)
@@ -136,6 +304,14 @@ class TrendScoutAgent(EnterpriseAgent):
             return await self._compare_trends(data, context)
         elif action == "predict_virality":
             return await self._predict_virality(data, context)
+        elif action == "record_virality_outcome":
+            return await self._record_virality_outcome(data, context)
+        elif action == "submit_analysis_batch":
+            return await self._submit_analysis_batch(data, context)
+        elif action == "poll_analysis_batch":
+            return await self._poll_analysis_batch(data, context)
+        elif action == "query_archive":
+            return await self._query_archive(data, context)
         else:
             raise ValueError(f"Unknown action: {action}")
     
@@ -144,13 +320,20 @@ class TrendScoutAgent(EnterpriseAgent):
         """Discover current trends from multiple sources"""
         logger.info(f"Discovering trends with context: {context.request_id}")
         
-        # Check cache first
-        cache_key = f"trends:discover:{datetime.now().strftime('%Y%m%d%H')}"
-        cached_result = self.redis_client.get(cache_key)
-        if cached_result:
-            logger.info("Returning cached trends")
-            return json.loads(cached_result)
+        # Serve the last discovery while a single replica refreshes it
+        result = await self.discover_cache.get(lambda: self._run_discovery(data))
+        trends = result['value']
+        if result['status'] != 'miss':
+            logger.info(f"Returning {result['status']} cached trends ({result['age_seconds']}s old)")
         
+        metadata = trends.setdefault('discovery_metadata', {})
+        metadata['cache_status'] = result['status']
+        metadata['cache_age_seconds'] = result['age_seconds']
+        metadata['discover_cache'] = self.discover_cache.stats()
+        return trends
+    
+    async def _run_discovery(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a full tool-based discovery with Claude"""
         # Use Claude with tools to discover trends
         system_prompt = """You are an expert trend analyst specializing in technology and cybersecurity content.
 Your task is to identify trending topics that would make engaging social media content.
@@ -175,14 +358,7 @@ Focus on topics that are:
         
         # Process the response
         trends = await self._process_trend_discovery(response, data)
-        
-        # Cache the result
-        self.redis_client.setex(
-            cache_key,
-            self.trend_cache_ttl,
-            json.dumps(trends)
-        )
-        
+        self.speculator.observe(trends.get('trends', []))
         return trends
     
     async def _analyze_trend(self, data: Dict[str, Any], 
@@ -190,7 +366,19 @@ Focus on topics that are:
         """Deep analysis of a specific trend"""
         trend_data = data.get('trend', {})
         
-        analysis_prompt = f"""<trend_analysis>
+        # Reworded requests for the same trend reuse the earlier analysis
+        return await self._semantic_cached_call(
+            self.analysis_cache,
+            f"{trend_data.get('title', '')}\n{trend_data.get('description', '')}",
+            system_prompt=ANALYSIS_SYSTEM_PROMPT,
+            user_prompt=self._analysis_prompt(trend_data),
+            temperature=0.5,
+            max_tokens=2000
+        )
+    
+    @staticmethod
+    def _analysis_prompt(trend_data: Dict[str, Any]) -> str:
+        return f"""<trend_analysis>
 <trend>
 Title: {trend_data.get('title', 'Unknown')}
 Description: {trend_data.get('description', '')}
@@ -218,31 +406,151 @@ Return a JSON object with:
 - recommendation (pursue/monitor/skip)
 </output_format>
 </trend_analysis>"""
-        
-        response = await self.call_anthropic(
-            system_prompt="You are a content strategist analyzing trends for social media content creation.",
-            user_prompt=analysis_prompt,
-            temperature=0.5,
-            max_tokens=2000
-        )
-        
-        return response
     
     async def _generate_brief(self, data: Dict[str, Any], 
                             context: AgentContext) -> Dict[str, Any]:
-        """Generate a content brief from trend data"""
+        """Generate content briefs from trend data
+        
+        Every story gets a brief drafted locally by extractive summarization;
+        only the top ``polish_top_n`` drafts are rewritten by Claude.
+        """
         trends = data.get('trends', [])
-        target_audience = data.get('target_audience', 'general tech audience')
+        target_audience = data.get('target_audience', DEFAULT_AUDIENCE)
+        max_briefs = max(1, int(data.get('max_briefs', 1)))
+        polish_top_n = int(data.get('polish_top_n', self.brief_polish_top_n))
+        
+        # One representative per story, best-ranked stories first
+        ranker = TrendRanker(k=max_briefs)
+        ranker.extend(self.deduplicator.cluster(trends))
+        stories = ranker.top()
+        self.speculator.observe(trends)
+        
+        started = time.perf_counter()
+        drafts = [self._draft_brief(story, target_audience) for story in stories]
+        local_ms = (time.perf_counter() - started) * 1000
+        
+        briefs = []
+        for rank, (story, draft) in enumerate(zip(stories, drafts)):
+            if rank < polish_top_n:
+                # A rising story may already have been briefed in the background
+                brief = self.speculator.lookup(story, target_audience)
+                if brief is None:
+                    brief = await self._polish_brief(draft, trends if rank == 0 else [story], target_audience)
+            else:
+                brief = dict(draft, polished=False)
+            
+            brief['generated_at'] = datetime.now(timezone.utc).isoformat()
+            brief['trend_sources'] = story.get('cluster_sources') or [story.get('source', 'unknown')]
+            
+            # Store in Notion-ready format
+            brief['notion_properties'] = {
+                'Title': brief.get('headline', ''),
+                'Brief': '\n'.join(brief.get('brief_lines', [])),
+                'Content_Type': brief.get('content_type', 'news'),
+                'Urgency': brief.get('urgency_level', 'medium'),
+                'Status': 'Idea'
+            }
+            briefs.append(brief)
         
+        summarization = {
+            'stories': len(stories),
+            'polished': sum(1 for b in briefs if b['polished']),
+            'local_only': sum(1 for b in briefs if not b['polished']),
+            'speculative': sum(1 for b in briefs if 'speculative' in b),
+            'local_ms': round(local_ms, 2),
+            'speculation': self.speculator.stats()
+        }
+        
+        if not briefs:
+            return {'brief_lines': [], 'briefs': [], 'summarization': summarization}
+        
+        self.archive.append_briefs(briefs)
+        await self.archive.maybe_flush()
+        
+        # The top brief stays at the top level for existing consumers
+        return dict(briefs[0], briefs=briefs, summarization=summarization)
+    
+    def _draft_brief(self, story: Dict[str, Any], target_audience: str) -> Dict[str, Any]:
+        """Assemble a 5-line brief from the story's own text, without an LLM"""
+        title = story.get('title', 'Emerging trend')
+        text = story.get('summary') or story.get('description') or ''
+        sentences = [s for s in self.summarizer.summarize([text], max_sentences=2)
+                     if s.lower() != title.lower()]
+        
+        cluster_size = story.get('cluster_size', 1)
+        momentum = story.get('momentum', 0.0)
+        if cluster_size >= 3 or momentum > 1.0:
+            urgency = 'high'
+        elif cluster_size == 2 or momentum > 0:
+            urgency = 'medium'
+        else:
+            urgency = 'low'
+        
+        lowered = title.lower()
+        if any(term in lowered for term in ('how to', 'guide', 'tips', 'steps')):
+            content_type = 'how-to'
+        elif cluster_size > 1 or urgency == 'high':
+            content_type = 'news'
+        else:
+            content_type = 'analysis'
+        
+        if cluster_size > 1:
+            why_now = f"Covered by {cluster_size} sources right now: {', '.join(story.get('cluster_sources', [])[:3])}"
+        elif story.get('growth_rate'):
+            why_now = f"Search interest moving {story['growth_rate']:+.0%} against the previous window"
+        else:
+            why_now = f"Just reported by {story.get('source', 'our sources')}"
+        
+        takeaway = {
+            'how-to': f"Turn it into a step-by-step walkthrough for {target_audience}",
+            'news': f"Explain what changed and what {target_audience} should check today",
+            'analysis': f"Break down the impact for {target_audience} with a clear takeaway"
+        }[content_type]
+        timing = {
+            'high': "Publish within 24 hours while coverage peaks",
+            'medium': "Publish this week before the story cools",
+            'low': "Keep on the watchlist for the next 7 days"
+        }[urgency]
+        
+        return {
+            'brief_lines': [
+                clip(title, 100),
+                clip(why_now, 100),
+                clip(sentences[0], 100) if sentences else clip(title, 100),
+                clip(sentences[1], 100) if len(sentences) > 1 else clip(takeaway, 100),
+                timing
+            ],
+            'headline': clip(title, 70),
+            'hashtags': self.summarizer.key_terms([title, title, text], k=5),
+            'content_type': content_type,
+            'urgency_level': urgency,
+            'key_metrics': {
+                k: story[k] for k in ('cluster_size', 'rank_score', 'interest_score', 'momentum')
+                if k in story
+            }
+        }
+    
+    async def _speculate_brief(self, story: Dict[str, Any]) -> Dict[str, Any]:
+        """Polished brief for one story, generated ahead of any request"""
+        draft = self._draft_brief(story, DEFAULT_AUDIENCE)
+        return await self._polish_brief(draft, [story], DEFAULT_AUDIENCE)
+    
+    async def _polish_brief(self, draft: Dict[str, Any], trends: List[Dict[str, Any]],
+                            target_audience: str) -> Dict[str, Any]:
+        """Have Claude rewrite a locally drafted brief"""
         brief_prompt = f"""<brief_generation>
 <trends>
-{json.dumps(trends[:5], indent=2)}
+{json.dumps(trends[:5], indent=2, default=str)}
 </trends>
 
+<draft_brief>
+{json.dumps(draft, indent=2)}
+</draft_brief>
+
 <target_audience>{target_audience}</target_audience>
 
 <brief_requirements>
-Generate a 5-line executive brief that:
+Rewrite the draft into a 5-line executive brief that:
 1. LINE 1: Captures the main trend in an attention-grabbing way
 2. LINE 2: Explains why this matters RIGHT NOW
 3. LINE 3: Provides a key insight or surprising fact
@@ -250,6 +558,7 @@ Generate a 5-line executive brief that:
 5. LINE 5: Includes a specific timeframe or urgency factor
 
 Additional requirements:
+- Keep the facts from the draft and trends; do not invent new ones
 - Use active voice and strong verbs
 - Include specific numbers or data points where available
 - Avoid jargon unless necessary for the audience
@@ -257,14 +566,14 @@ Additional requirements:
 </brief_requirements>
 
 <output_format>
-{
+{{
   "brief_lines": ["line1", "line2", "line3", "line4", "line5"],
   "headline": "attention-grabbing headline under 10 words",
   "hashtags": ["relevant", "hashtags", "maximum", "5"],
   "content_type": "educational|news|how-to|analysis",
   "urgency_level": "high|medium|low",
-  "key_metrics": {"metric_name": value}
-}
+  "key_metrics": {{"metric_name": value}}
+}}
 </output_format>
 </brief_generation>"""
         
@@ -275,30 +584,117 @@ Additional requirements:
             max_tokens=1500
         )
         
-        # Post-process the brief
-        brief = response
-        brief['generated_at'] = datetime.now(timezone.utc).isoformat()
-        brief['trend_sources'] = [t.get('source', 'unknown') for t in trends[:3]]
-        
-        # Store in Notion-ready format
-        brief['notion_properties'] = {
-            'Title': brief.get('headline', ''),
-            'Brief': '\n'.join(brief.get('brief_lines', [])),
-            'Content_Type': brief.get('content_type', 'news'),
-            'Urgency': brief.get('urgency_level', 'medium'),
-            'Status': 'Idea'
-        }
-        
-        return brief
+        return dict(response, polished=True)
     
     async def _compare_trends(self, data: Dict[str, Any], 
                             context: AgentContext) -> Dict[str, Any]:
-        """Compare multiple trends to identify the best opportunity"""
+        """Compare multiple trends to identify the best opportunity
+        
+        Candidates are deduplicated and pruned locally to a shortlist, packed
+        into compact prompts under a token budget, compared chunk by chunk in
+        parallel and merged in one final round. The final round is held to
+        the same budget: while the finalists don't fit, another nomination
+        round runs over them, so there are usually two sequential LLM round
+        trips and more only for very large inputs.
+        """
         trends = data.get('trends', [])
+        top_k = max(1, int(data.get('top_k', self.compare_top_k)))
+        shortlist_size = max(top_k, int(data.get('shortlist_size', self.compare_shortlist)))
+        token_budget = int(data.get('token_budget', self.compare_token_budget))
+        
+        started = time.perf_counter()
+        ranker = TrendRanker(k=shortlist_size)
+        ranker.extend(self.deduplicator.cluster(trends))
+        shortlist = [compact_trend(t, ref=f"t{i}") for i, t in enumerate(ranker.top())]
+        chunks = pack_by_budget(shortlist, token_budget, self.compare_chunk_size)
+        local_ms = (time.perf_counter() - started) * 1000
+        
+        metadata = {
+            'candidates': len(trends),
+            'shortlisted': len(shortlist),
+            'chunks': len(chunks),
+            'map_rounds': 0,
+            'llm_calls': 0,
+            'prompt_tokens_estimate': 0,
+            'local_ms': round(local_ms, 2)
+        }
+        
+        finalists = shortlist
+        while len(chunks) > 1:
+            # Map: each chunk nominates its best trends concurrently
+            nominated = await self._nominate_chunks(chunks, top_k, metadata)
+            metadata['map_rounds'] += 1
+            progressed = len(nominated) < len(finalists)
+            finalists = nominated
+            if not progressed or len(pack_by_budget(finalists, token_budget, len(finalists))) == 1:
+                break
+            chunks = pack_by_budget(finalists, token_budget, self.compare_chunk_size)
+        
+        # The reduce prompt gets the same budget as each chunk; if nominations
+        # stopped shrinking the pool, keep the best-ranked finalists that fit
+        if finalists:
+            finalists = pack_by_budget(finalists, token_budget, len(finalists))[0]
+        
+        # Reduce: one full comparison over the finalists
+        response = await self._compare_finalists(finalists, top_k, metadata)
+        response['compare_metadata'] = dict(metadata, finalists=len(finalists))
+        return response
+    
+    async def _nominate_chunks(self, chunks: List[List[Dict[str, Any]]], top_k: int,
+                               metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Nominate from every chunk concurrently, in chunk order"""
+        semaphore = asyncio.Semaphore(self.compare_concurrency)
+        
+        async def nominate(chunk: List[Dict[str, Any]]) -> List[str]:
+            async with semaphore:
+                return await self._nominate_trends(chunk, top_k, metadata)
         
+        nominations = await asyncio.gather(*(nominate(c) for c in chunks), return_exceptions=True)
+        
+        finalists = []
+        for chunk, refs in zip(chunks, nominations):
+            if isinstance(refs, BaseException):
+                logger.warning(f"Chunk comparison failed, keeping its local top {top_k}: {refs}")
+                refs = [t['ref'] for t in chunk[:top_k]]
+            by_ref = {t['ref']: t for t in chunk}
+            finalists.extend(by_ref[r] for r in refs if r in by_ref)
+        return finalists
+    
+    async def _nominate_trends(self, chunk: List[Dict[str, Any]], top_k: int,
+                               metadata: Dict[str, Any]) -> List[str]:
+        """Map step: pick the strongest trends of one chunk, returning their refs"""
+        nomination_prompt = f"""<trend_screening>
+<trends>
+{compact_json(chunk)}
+</trends>
+
+<task>
+Score each trend 0-100 for a content team serving IT/security professionals,
+weighing audience relevance, engagement potential, competition, complexity,
+visual potential and timeliness. Select the {top_k} strongest.
+</task>
+
+<output_format>
+{{"selected": [{{"ref": "t0", "score": 87}}]}}
+</output_format>
+</trend_screening>"""
+        
+        metadata['llm_calls'] += 1
+        metadata['prompt_tokens_estimate'] += estimate_tokens(nomination_prompt)
+        response = await self.call_anthropic(
+            system_prompt="You are a data-driven content strategist screening trends.",
+            user_prompt=nomination_prompt,
+            temperature=0.2,
+            max_tokens=500
+        )
+        return [s['ref'] for s in response.get('selected', [])[:top_k] if 'ref' in s]
+    
+    async def _compare_finalists(self, finalists: List[Dict[str, Any]], top_k: int,
+                                 metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce step: full comparison of the finalists"""
         comparison_prompt = f"""<trend_comparison>
 <trends_to_compare>
-{json.dumps(trends, indent=2)}
+{compact_json(finalists)}
 </trends_to_compare>
 
 <comparison_criteria>
@@ -311,7 +707,7 @@ Additional requirements:
 </comparison_criteria>
 
 <output_requirements>
-For each trend, provide:
+For each of the {top_k} strongest trends, provide:
 - Overall score (0-100)
 - Scores for each criterion (0-10)
 - Key advantages
@@ -324,21 +720,43 @@ Then provide:
 </output_requirements>
 </trend_comparison>"""
         
-        response = await self.call_anthropic(
+        metadata['llm_calls'] += 1
+        metadata['prompt_tokens_estimate'] += estimate_tokens(comparison_prompt)
+        return await self.call_anthropic(
             system_prompt="You are a data-driven content strategist comparing trends for maximum impact.",
             user_prompt=comparison_prompt,
             temperature=0.6,
             max_tokens=3000
         )
-        
-        return response
     
     async def _predict_virality(self, data: Dict[str, Any], 
                               context: AgentContext) -> Dict[str, Any]:
-        """Predict viral potential of content idea"""
+        """Predict viral potential of content idea
+        
+        Both tiers answer with the same fields; whatever the local model
+        can't estimate is left empty rather than omitted.
+        """
         content_idea = data.get('content_idea', {})
         platform = data.get('platform', 'general')
         
+        # Clear non-contenders are answered locally, before any prompt is built
+        idea_text = self._idea_text(content_idea)
+        routing = self.virality_cascade.score(idea_text, platform)
+        if not routing['escalate']:
+            margin = self.virality_cascade.threshold - self.virality_cascade.band - routing['local_score']
+            return dict(
+                copy.deepcopy(VIRALITY_RESPONSE_FIELDS),
+                virality_score=round(routing['local_score']),
+                confidence_level='high' if margin >= 20 else 'medium' if margin >= 10 else 'low',
+                improvement_suggestions=[
+                    "Scored below the escalation band by the local model; rework the angle before investing in it"
+                ],
+                expected_metrics=dict(VIRALITY_RESPONSE_FIELDS['expected_metrics'], share_likelihood='low'),
+                tier='local',
+                local_score=routing['local_score'],
+                cascade=self.virality_cascade.stats()
+            )
+        
         virality_prompt = f"""<virality_prediction>
 <content_idea>
 {json.dumps(content_idea, indent=2)}
@@ -365,30 +783,129 @@ Consider that in tech/security content:
 </historical_patterns>
 
 <output_format>
-{
+{{
   "virality_score": 0-100,
   "confidence_level": "high|medium|low",
   "key_strengths": ["strength1", "strength2"],
   "improvement_suggestions": ["suggestion1", "suggestion2"],
   "optimal_posting_time": "time recommendation",
-  "expected_metrics": {
+  "expected_metrics": {{
     "views_range": [min, max],
     "engagement_rate": "X%",
     "share_likelihood": "high|medium|low"
-  },
+  }},
   "risk_factors": ["risk1", "risk2"]
-}
+}}
 </output_format>
 </virality_prediction>"""
         
-        response = await self.call_anthropic(
+        started = time.perf_counter()
+        response = await self._semantic_cached_call(
+            self.virality_cache,
+            idea_text,
+            partition=platform,
             system_prompt="You are a viral content prediction expert with deep knowledge of social media algorithms.",
             user_prompt=virality_prompt,
             temperature=0.7,
             max_tokens=2000
         )
         
-        return response
+        # Fresh Claude scores double as training labels for the local model
+        if not response['semantic_cache']['hit']:
+            try:
+                llm_score = float(response.get('virality_score'))
+            except (TypeError, ValueError):
+                llm_score = None
+            self.virality_cascade.record_llm(
+                idea_text, platform, routing['local_score'], llm_score,
+                llm_seconds=time.perf_counter() - started
+            )
+        return {
+            **copy.deepcopy(VIRALITY_RESPONSE_FIELDS),
+            **response,
+            'tier': 'llm',
+            'local_score': routing['local_score'],
+            'cascade': self.virality_cascade.stats()
+        }
+    
+    async def _record_virality_outcome(self, data: Dict[str, Any], 
+                                     context: AgentContext) -> Dict[str, Any]:
+        """Train the local virality model on an idea's observed performance"""
+        try:
+            observed_score = float(data['observed_score'])
+        except (KeyError, TypeError, ValueError):
+            return {'recorded': False, 'error': "record_virality_outcome needs a numeric 'observed_score' (0-100)"}
+        if not 0.0 <= observed_score <= 100.0:
+            return {'recorded': False, 'error': f"observed_score must be between 0 and 100, got {observed_score}"}
+        self.virality_cascade.record_outcome(
+            self._idea_text(data.get('content_idea', {})),
+            data.get('platform', 'general'),
+            observed_score
+        )
+        return {'recorded': True, 'cascade': self.virality_cascade.stats()}
+    
+    @staticmethod
+    def _idea_text(content_idea: Any) -> str:
+        if isinstance(content_idea, dict):
+            return ' '.join(str(v) for v in content_idea.values())
+        return str(content_idea)
+    
+    async def _semantic_cached_call(self, cache: SemanticCache, cache_text: str,
+                                    partition: str = '', **call_kwargs) -> Dict[str, Any]:
+        """call_anthropic, answered from ``cache`` when a similar request was seen"""
+        hit = cache.lookup(cache_text, partition)
+        if hit is not None:
+            cached, similarity = hit
+            logger.info(f"Semantic cache hit in {cache.name} (similarity {similarity:.3f})")
+            return dict(cached, semantic_cache={'hit': True, 'similarity': round(similarity, 3), **cache.stats()})
+        
+        started = time.perf_counter()
+        response = await self.call_anthropic(**call_kwargs)
+        cache.store(cache_text, response, partition, llm_seconds=time.perf_counter() - started)
+        return dict(response, semantic_cache={'hit': False, **cache.stats()})
+    
+    def _require_batch_jobs(self):
+        if self.batch_jobs is None:
+            raise ValueError(
+                "Batch analysis is not configured: set ANTHROPIC_API_KEY, "
+                "or TREND_BATCH_BACKEND=local for stub replies in tests"
+            )
+    
+    async def _submit_analysis_batch(self, data: Dict[str, Any], 
+                                   context: AgentContext) -> Dict[str, Any]:
+        """Queue analyze_trend over many trends as an offline batch job"""
+        trends = data.get('trends', [])
+        if not trends:
+            raise ValueError("submit_analysis_batch needs a non-empty 'trends' list")
+        self._require_batch_jobs()
+        
+        tasks = [{
+            'task_id': str(trend.get('id') or i),
+            'system_prompt': ANALYSIS_SYSTEM_PROMPT,
+            'user_prompt': self._analysis_prompt(trend),
+            'temperature': 0.5,
+            'max_tokens': 2000,
+            'meta': {'title': trend.get('title', ''), 'trend_id': trend.get('id')}
+        } for i, trend in enumerate(trends)]
+        return await self.batch_jobs.submit(tasks, kind='analysis')
+    
+    async def _poll_analysis_batch(self, data: Dict[str, Any], 
+                                 context: AgentContext) -> Dict[str, Any]:
+        """Progress of a batch job, with its results once it has ended"""
+        self._require_batch_jobs()
+        job = await self.batch_jobs.poll(data['job_id'])
+        if job['status'] == 'ended':
+            await self.archive.maybe_flush()
+            if data.get('include_results', True):
+                job['results'] = self.batch_jobs.results(data['job_id'], data.get('task_ids'))
+        job['batch_stats'] = self.batch_jobs.stats()
+        return job
+    
+    async def _query_archive(self, data: Dict[str, Any], 
+                           context: AgentContext) -> Dict[str, Any]:
+        """Query archived items or briefs, e.g. what trended last month"""
+        await asyncio.to_thread(self.archive.flush)
+        return await asyncio.to_thread(self.archive.query_records, data)
     
     async def _process_trend_discovery(self, claude_response: Dict[str, Any], 
                                      original_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -412,12 +929,37 @@ Consider that in tech/security content:
             "discovery_metadata": {
                 "sources_checked": len(self.rss_sources),
                 "timestamp": datetime.now(timezone.utc).isoformat(),
-                "cache_status": "miss"
+                "cache_status": "miss",
+                "feed_cache": self.feed_cache.stats(),
+                "trends_planner": self.trends_planner.stats(),
+                "api_quota": self.quota.stats(),
+                "executor": self.stage_pool.stats(),
+                "event_loop": self.loop_monitor.stats()
             }
         }
     
     def _load_rss_sources(self) -> List[Dict[str, str]]:
-        """Load RSS feed sources"""
+        """Load RSS feed sources, extended with any RSS sources in the registry"""
+        sources = self._default_rss_sources()
+        known = {s['name'] for s in sources}
+        
+        try:
+            registered = self.source_registry.all_sources()
+        except Exception as e:
+            logger.warning(f"Source registry unavailable, using defaults: {e}")
+            return sources
+        
+        for source in registered:
+            if source.get('type') == 'rss' and source.get('enabled', True) and source['name'] not in known:
+                sources.append({
+                    "name": source['name'],
+                    "url": source['url'],
+                    "category": source.get('category', 'general')
+                })
+        return sources
+    
+    def _default_rss_sources(self) -> List[Dict[str, str]]:
+        """Built-in RSS feed sources"""
         return [
             {
                 "name": "Krebs on Security",
@@ -446,44 +988,70 @@ Consider that in tech/security content:
         """Implementation of fetch_rss_feeds tool"""
         results = []
         
-        for source_name in sources:
-            source = next((s for s in self.rss_sources if s['name'] == source_name), None)
-            if not source:
-                continue
-                
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(source['url'], timeout=30) as response:
-                        content = await response.text()
-                        feed = feedparser.parse(content)
-                        
-                        for entry in feed.entries[:limit]:
-                            results.append({
-                                'title': entry.get('title', ''),
-                                'link': entry.get('link', ''),
-                                'summary': entry.get('summary', ''),
-                                'published': entry.get('published', ''),
-                                'source': source_name,
-                                'category': source['category']
-                            })
-            except Exception as e:
-                logger.error(f"Error fetching {source_name}: {e}")
+        async with aiohttp.ClientSession() as session:
+            for source_name in sources:
+                source = next((s for s in self.rss_sources if s['name'] == source_name), None)
+                if not source:
+                    continue
                 
+                reservation = self.quota.reserve(source_name)
+                if not reservation.granted:
+                    logger.warning(f"API quota exceeded, skipping {source_name} "
+                                   f"(refill in {reservation.retry_after:.0f}s)")
+                    continue
+                    
+                try:
+                    # Conditional GET: unchanged feeds are served from the parsed cache
+                    entries = await self.feed_cache.fetch_entries(session, source['url'])
+                    
+                    for entry in entries[:limit]:
+                        results.append({
+                            'title': entry.get('title', ''),
+                            'link': entry.get('link', ''),
+                            'summary': entry.get('summary', ''),
+                            'published': entry.get('published', ''),
+                            'source': source_name,
+                            'category': source['category']
+                        })
+                except Exception as e:
+                    logger.error(f"Error fetching {source_name}: {e}")
+        
+        self.archive.append_items(results)
+        await self.archive.maybe_flush()
+        self.speculator.observe(results)
         return results
     
     async def _tool_get_google_trends(self, keywords: List[str], 
                                     timeframe: str = 'now 1-d') -> Dict[str, Any]:
         """Implementation of get_google_trends tool"""
         try:
-            pytrends = TrendReq(hl='en-US', tz=360)
-            pytrends.build_payload(keywords, timeframe=timeframe)
+            interest = await self.trends_planner.fetch(
+                keywords,
+                timeframe,
+                include_related=True,
+                source='Google Trends'
+            )
             
-            interest_df = pytrends.interest_over_time()
-            related_queries = pytrends.related_queries()
+            series = self.series_store.record(
+                timeframe, {k: (ts, values) for k, (ts, values, _) in interest.items()}
+            ) if interest else {}
+            momentum = self.series_store.momentum(list(interest), timeframe, series)
             
+            # Compact per-keyword summary instead of the full DataFrame
             return {
-                'interest_over_time': interest_df.to_dict() if not interest_df.empty else {},
-                'related_queries': related_queries
+                'interest_over_time': {
+                    keyword: {
+                        'recent': [round(v, 1) for v in points[-12:].tolist()],
+                        'mean': round(float(points.mean()), 2),
+                        **momentum.get(keyword, {})
+                    }
+                    for keyword, (_, points, _) in interest.items()
+                },
+                'related_queries': {
+                    keyword: related
+                    for keyword, (_, _, related) in interest.items()
+                    if related
+                }
             }
         except Exception as e:
             logger.error(f"Error fetching Google Trends: {e}")
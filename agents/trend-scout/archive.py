@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Trend Archive Module for Trend Scout Agent
+Append-only Parquet archive of ingested items, briefs and analyses, partitioned by hour
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ranking import item_timestamp
+from seen_index import entry_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Outside the application directory, which is read-only in the container image
+DEFAULT_ARCHIVE_DIR = '/var/lib/trend-scout/archive'
+
+_TIMESTAMP = pa.timestamp('s', tz='UTC')
+
+SCHEMAS = {
+    'items': pa.schema([
+        ('archived_at', _TIMESTAMP),
+        ('published_at', _TIMESTAMP),
+        ('fingerprint', pa.string()),
+        ('source', pa.string()),
+        ('source_name', pa.string()),
+        ('title', pa.string()),
+        ('link', pa.string()),
+        ('summary', pa.string()),
+        ('keyword', pa.string()),
+        ('interest_score', pa.float64()),
+        ('momentum', pa.float64()),
+        ('cluster_size', pa.int32())
+    ]),
+    'briefs': pa.schema([
+        ('archived_at', _TIMESTAMP),
+        ('brief_id', pa.string()),
+        ('title', pa.string()),
+        ('source', pa.string()),
+        ('relevance_score', pa.float64()),
+        ('keywords', pa.list_(pa.string())),
+        ('summary', pa.list_(pa.string())),
+        ('payload', pa.string())  # full brief as JSON for anything not broken out
+    ]),
+    'analyses': pa.schema([
+        ('archived_at', _TIMESTAMP),
+        ('job_id', pa.string()),
+        ('task_id', pa.string()),
+        ('title', pa.string()),
+        ('relevance_score', pa.float64()),
+        ('recommendation', pa.string()),
+        ('error', pa.string()),
+        ('payload', pa.string())
+    ])
+}
+
+# Filter operators accepted by query(); evaluated against Parquet row-group
+# statistics first, so non-matching row groups are never decoded
+_OPERATORS = {
+    '==': lambda f, v: f == v,
+    '!=': lambda f, v: f != v,
+    '<': lambda f, v: f < v,
+    '<=': lambda f, v: f <= v,
+    '>': lambda f, v: f > v,
+    '>=': lambda f, v: f >= v,
+    'in': lambda f, v: f.isin(v),
+    'contains': lambda f, v: pc.match_substring(f, v, ignore_case=True)
+}
+
+
+def _hour_floor(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    # ISO strings without an offset are UTC, like everything else archived
+    return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class TrendArchive:
+    """Columnar history of everything the agent has ingested and briefed
+
+    Rows are buffered in memory and flushed as immutable Parquet files under
+    ``{root}/{table}/date=YYYY-MM-DD/hour=HH/`` once a table holds
+    ``flush_rows`` rows or the oldest buffered rows are ``flush_seconds``
+    old. Nothing is ever rewritten except by ``compact``, which merges an
+    hour's small files into one; the maintenance task started by
+    ``ensure_started`` flushes and compacts off the event loop.
+    ``query`` only opens the hourly partitions overlapping the requested
+    window, reads only the requested columns and pushes filters down to
+    row-group statistics.
+    """
+
+    def __init__(self, root_dir: str, flush_rows: int = 5000, flush_seconds: float = 300,
+                 compact_interval: float = 3600, row_group_size: int = 10000):
+        self.root_dir = root_dir
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.compact_interval = compact_interval
+        self.row_group_size = row_group_size
+
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {table: [] for table in SCHEMAS}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._last_compaction = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self.partitions_compacted = 0
+
+        self.rows_written = {table: 0 for table in SCHEMAS}
+        self.files_written = 0
+        self.last_query: Dict[str, Any] = {}
+
+    # Writing
+
+    def append_items(self, items: List[Dict[str, Any]], now: Optional[float] = None):
+        archived_at = datetime.fromtimestamp(now or time.time(), tz=timezone.utc)
+        rows = []
+        for item in items:
+            published = item_timestamp(item)
+            rows.append({
+                'archived_at': archived_at,
+                'published_at': datetime.fromtimestamp(published, tz=timezone.utc) if published else None,
+                'fingerprint': entry_fingerprint(item),
+                'source': item.get('source'),
+                'source_name': item.get('source_name'),
+                'title': item.get('title'),
+                'link': item.get('link'),
+                'summary': item.get('summary') or item.get('description'),
+                'keyword': item.get('keyword'),
+                'interest_score': item.get('interest_score'),
+                'momentum': item.get('momentum'),
+                'cluster_size': item.get('cluster_size')
+            })
+        self._buffer('items', rows)
+
+    def append_briefs(self, briefs: List[Dict[str, Any]], now: Optional[float] = None):
+        archived_at = datetime.fromtimestamp(now or time.time(), tz=timezone.utc)
+        rows = [{
+            'archived_at': archived_at,
+            'brief_id': brief.get('id'),
+            'title': brief.get('title') or brief.get('headline'),
+            'source': brief.get('source'),
+            'relevance_score': brief.get('relevance_score'),
+            'keywords': brief.get('keywords') or brief.get('hashtags') or [],
+            'summary': brief.get('summary') or brief.get('brief_lines') or [],
+            'payload': json.dumps(brief, default=str)
+        } for brief in briefs]
+        self._buffer('briefs', rows)
+
+    def append_analyses(self, job_id: str, records: List[Dict[str, Any]], now: Optional[float] = None):
+        archived_at = datetime.fromtimestamp(now or time.time(), tz=timezone.utc)
+        rows = []
+        for record in records:
+            result = record.get('result') or {}
+            score = result.get('relevance_score')
+            rows.append({
+                'archived_at': archived_at,
+                'job_id': job_id,
+                'task_id': record['task_id'],
+                'title': record.get('meta', {}).get('title'),
+                'relevance_score': float(score) if isinstance(score, (int, float)) else None,
+                'recommendation': result.get('recommendation'),
+                'error': record.get('error'),
+                'payload': json.dumps(result, default=str)
+            })
+        self._buffer('analyses', rows)
+
+    def _buffer(self, table: str, rows: List[Dict[str, Any]]):
+        with self._lock:
+            self._buffers[table].extend(rows)
+
+    def flush_due(self) -> bool:
+        with self._lock:
+            buffered = [len(rows) for rows in self._buffers.values()]
+        if any(count >= self.flush_rows for count in buffered):
+            return True
+        return any(buffered) and time.monotonic() - self._last_flush >= self.flush_seconds
+
+    async def maybe_flush(self) -> int:
+        """Flush in a worker thread if a size or age threshold has been reached"""
+        if not self.flush_due():
+            return 0
+        return await asyncio.to_thread(self.flush)
+
+    def _partition_dir(self, table: str, hour: datetime) -> str:
+        return os.path.join(self.root_dir, table, f"date={hour:%Y-%m-%d}", f"hour={hour:%H}")
+
+    def flush(self, table: Optional[str] = None) -> int:
+        """Write buffered rows as new Parquet files, one per hourly partition"""
+        written = 0
+        if table is None:
+            self._last_flush = time.monotonic()
+        for name in ([table] if table else list(SCHEMAS)):
+            with self._lock:
+                rows, self._buffers[name] = self._buffers[name], []
+            if not rows:
+                continue
+
+            by_hour: Dict[datetime, List[Dict[str, Any]]] = {}
+            for row in rows:
+                by_hour.setdefault(_hour_floor(row['archived_at']), []).append(row)
+
+            for hour, hour_rows in by_hour.items():
+                directory = self._partition_dir(name, hour)
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet")
+
+                # Write under a temporary name so readers never see partial files
+                pq.write_table(
+                    pa.Table.from_pylist(hour_rows, schema=SCHEMAS[name]),
+                    path + '.tmp',
+                    row_group_size=self.row_group_size,
+                    compression='zstd'
+                )
+                os.replace(path + '.tmp', path)
+
+                self.files_written += 1
+                written += len(hour_rows)
+            self.rows_written[name] += len(rows)
+
+        return written
+
+    def compact(self, table: str, older_than_hours: int = 2) -> int:
+        """Merge each closed hour's part files into one; returns partitions compacted"""
+        cutoff = _hour_floor(datetime.now(timezone.utc)) - timedelta(hours=older_than_hours)
+        compacted = 0
+        for hour, directory in self._partitions(table, None, cutoff):
+            parts = sorted(f for f in os.listdir(directory) if f.endswith('.parquet'))
+            if len(parts) < 2:
+                continue
+
+            paths = [os.path.join(directory, f) for f in parts]
+            target = os.path.join(directory, f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}-compacted.parquet")
+            try:
+                merged = ds.dataset(paths, schema=SCHEMAS[table], format='parquet').to_table()
+                pq.write_table(merged, target + '.tmp', row_group_size=self.row_group_size, compression='zstd')
+                os.replace(target + '.tmp', target)
+                for path in paths:
+                    os.remove(path)
+            except OSError as e:
+                # Another process sharing the directory may be compacting the same hour
+                logger.warning(f"Compaction of {directory} skipped: {e}")
+                continue
+            compacted += 1
+
+        if compacted:
+            logger.info(f"Compacted {compacted} hourly partitions of {table}")
+        self.partitions_compacted += compacted
+        return compacted
+
+    # Maintenance
+
+    def ensure_started(self):
+        """Start the flush/compaction task on the running loop if it is not already running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._maintain())
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(min(self.flush_seconds, 60))
+            try:
+                await self.maybe_flush()
+                if time.monotonic() - self._last_compaction >= self.compact_interval:
+                    self._last_compaction = time.monotonic()
+                    for table in SCHEMAS:
+                        await asyncio.to_thread(self.compact, table)
+            except Exception as e:
+                logger.error(f"Archive maintenance failed: {e}")
+
+    async def stop(self):
+        """Stop maintenance and write out whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    # Reading
+
+    def _partitions(self, table: str, start: Optional[datetime],
+                    end: Optional[datetime]) -> List[Tuple[datetime, str]]:
+        """Hourly partition directories overlapping [start, end)"""
+        base = os.path.join(self.root_dir, table)
+        if not os.path.isdir(base):
+            return []
+
+        partitions = []
+        for date_dir in sorted(os.listdir(base)):
+            if not date_dir.startswith('date='):
+                continue
+            day = datetime.strptime(date_dir[5:], '%Y-%m-%d').replace(tzinfo=timezone.utc)
+            if (start and day + timedelta(days=1) <= _hour_floor(start)) or (end and day >= end):
+                continue
+            for hour_dir in sorted(os.listdir(os.path.join(base, date_dir))):
+                hour = day + timedelta(hours=int(hour_dir[5:]))
+                if (start and hour < _hour_floor(start)) or (end and hour >= end):
+                    continue
+                partitions.append((hour, os.path.join(base, date_dir, hour_dir)))
+        return partitions
+
+    def query(self, table: str, start: Any = None, end: Any = None,
+              columns: Optional[List[str]] = None,
+              filters: Optional[List[Tuple[str, str, Any]]] = None,
+              limit: Optional[int] = None) -> pa.Table:
+        """Scan archived rows archived in [start, end)
+
+        ``filters`` is a list of ``(column, op, value)`` ANDed together, with
+        ``op`` one of ==, !=, <, <=, >, >=, in, contains. Only the
+        partitions in the window, and only ``columns``, are read.
+        """
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown archive table: {table}")
+
+        started = time.perf_counter()
+        start = _as_datetime(start) if start is not None else None
+        end = _as_datetime(end) if end is not None else None
+
+        partitions = self._partitions(table, start, end)
+        paths = [
+            os.path.join(directory, f)
+            for _, directory in partitions
+            for f in sorted(os.listdir(directory)) if f.endswith('.parquet')
+        ]
+        schema = SCHEMAS[table]
+        columns = columns or schema.names
+        if not paths:
+            return schema.empty_table().select(columns)
+
+        expression = None
+        conditions = [(c, op, v) for c, op, v in (filters or [])]
+        if start is not None:
+            conditions.append(('archived_at', '>=', start))
+        if end is not None:
+            conditions.append(('archived_at', '<', end))
+        for column, op, value in conditions:
+            if op not in _OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if column not in schema.names:
+                raise ValueError(f"Unknown column for {table}: {column}")
+            if op != 'in' and schema.field(column).type == _TIMESTAMP:
+                value = pa.scalar(_as_datetime(value), type=_TIMESTAMP)
+            condition = _OPERATORS[op](ds.field(column), value)
+            expression = condition if expression is None else expression & condition
+
+        dataset = ds.dataset(paths, schema=schema, format='parquet')
+        if limit:
+            result = dataset.head(limit, columns=columns, filter=expression)
+        else:
+            result = dataset.to_table(columns=columns, filter=expression)
+
+        self.last_query = {
+            'table': table,
+            'partitions_scanned': len(partitions),
+            'files_scanned': len(paths),
+            'rows_returned': result.num_rows,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+        return result
+
+    def query_records(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a query described by a request payload and return JSON-safe rows
+
+        ``spec`` holds ``table`` and optionally ``start``, ``end`` (ISO
+        strings or epoch seconds), ``columns``, ``filters`` as
+        ``[column, op, value]`` lists and ``limit`` (default 1000).
+        """
+        result = self.query(
+            spec.get('table', 'briefs'),
+            start=spec.get('start'),
+            end=spec.get('end'),
+            columns=spec.get('columns'),
+            filters=[tuple(f) for f in spec.get('filters', [])],
+            limit=int(spec.get('limit', 1000))
+        )
+        rows = result.to_pylist()
+        for row in rows:
+            for key, value in row.items():
+                if isinstance(value, datetime):
+                    row[key] = value.isoformat()
+        return {'rows': rows, 'scan': self.last_query}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'root_dir': self.root_dir,
+            'rows_written': dict(self.rows_written),
+            'rows_buffered': {table: len(rows) for table, rows in self._buffers.items()},
+            'files_written': self.files_written,
+            'partitions_compacted': self.partitions_compacted,
+            'last_query': self.last_query
+        }
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Batch Jobs Module for Trend Scout Agent
+Offline LLM jobs packed into bulk submissions, polled and stored in bulk
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Dict, List, Any, Awaitable, Callable, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class AnthropicBatchBackend:
+    """Message Batches API: discounted, asynchronous, off the interactive rate limit"""
+
+    name = 'anthropic'
+
+    def __init__(self, client, model: str = "claude-3-sonnet-20240229"):
+        self.client = client
+        self.model = model
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> str:
+        batch = await self.client.messages.batches.create(requests=[{
+            'custom_id': r['custom_id'],
+            'params': {
+                'model': self.model,
+                'max_tokens': r['max_tokens'],
+                'temperature': r['temperature'],
+                'system': r['system_prompt'],
+                'messages': [{'role': 'user', 'content': r['user_prompt']}]
+            }
+        } for r in requests])
+        return batch.id
+
+    async def is_done(self, submission_id: str) -> bool:
+        batch = await self.client.messages.batches.retrieve(submission_id)
+        return batch.processing_status == 'ended'
+
+    async def results(self, submission_id: str) -> Dict[str, Any]:
+        """custom_id -> Message, or an error string"""
+        results = {}
+        async for entry in await self.client.messages.batches.results(submission_id):
+            if entry.result.type == 'succeeded':
+                results[entry.custom_id] = entry.result.message
+            else:
+                results[entry.custom_id] = f"batch request {entry.result.type}"
+        return results
+
+
+class LocalBatchBackend:
+    """In-process stand-in with the same contract, for tests and local runs
+
+    ``handler`` receives each request dict and returns the reply text; the
+    default returns a fixed JSON stub, so this backend is only used when
+    explicitly configured. Requests run on the submitting replica, and each
+    finished submission is written to Redis (``{prefix}:{submission_id}``)
+    so any replica can poll and collect it.
+    """
+
+    name = 'local'
+
+    def __init__(self, redis_client: redis.Redis,
+                 handler: Optional[Callable[[Dict[str, Any]], Awaitable[str]]] = None,
+                 concurrency: int = 4, ttl_seconds: int = 7 * 86400,
+                 prefix: str = "trend_batch:local"):
+        self.redis_client = redis_client
+        self.handler = handler or self._stub
+        self.concurrency = concurrency
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._running: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    async def _stub(request: Dict[str, Any]) -> str:
+        return json.dumps({'backend': 'local', 'custom_id': request['custom_id']})
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> str:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        submission_id = f"local_{uuid.uuid4().hex[:12]}"
+
+        async def run_one(request: Dict[str, Any]):
+            async with semaphore:
+                try:
+                    return request['custom_id'], {'text': await self.handler(request)}
+                except Exception as e:
+                    return request['custom_id'], {'error': f"batch request errored: {e}"}
+
+        async def run_all():
+            replies = dict(await asyncio.gather(*(run_one(r) for r in requests)))
+            self.redis_client.setex(f"{self.prefix}:{submission_id}", self.ttl_seconds, json.dumps(replies))
+
+        task = asyncio.create_task(run_all())
+        self._running[submission_id] = task
+        task.add_done_callback(lambda _: self._running.pop(submission_id, None))
+        return submission_id
+
+    async def is_done(self, submission_id: str) -> bool:
+        return bool(self.redis_client.exists(f"{self.prefix}:{submission_id}"))
+
+    async def results(self, submission_id: str) -> Dict[str, Any]:
+        replies = json.loads(self.redis_client.get(f"{self.prefix}:{submission_id}"))
+        # Shaped like a Message so results parse the same way
+        return {
+            custom_id: reply['error'] if 'error' in reply
+            else SimpleNamespace(content=[SimpleNamespace(text=reply['text'])])
+            for custom_id, reply in replies.items()
+        }
+
+
+class BatchJobManager:
+    """Tracks offline jobs across bulk backend submissions
+
+    A job's tasks are split into submissions of ``submission_size`` requests.
+    The job's definition lives in Redis (``{prefix}:{job_id}``) and its
+    progress in a hash (``{prefix}:{job_id}:progress``) updated with atomic
+    increments, so any replica can poll it. A replica collects a finished
+    submission only after claiming it (``SET ... NX``); the results are
+    parsed, written with a single pipeline into ``{prefix}:{job_id}:results``
+    and handed to ``on_results`` (e.g. the archive) as one list, exactly once.
+    """
+
+    def __init__(self, redis_client: redis.Redis, backend, parse: Callable[[Any], Dict[str, Any]],
+                 on_results: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+                 submission_size: int = 100, ttl_seconds: int = 7 * 86400,
+                 prefix: str = "trend_batch", claim_seconds: int = 600):
+        self.redis_client = redis_client
+        self.backend = backend
+        self.parse = parse
+        self.on_results = on_results
+        self.submission_size = submission_size
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.claim_seconds = claim_seconds
+
+        self.jobs_submitted = 0
+        self.tasks_submitted = 0
+        self.tasks_completed = 0
+        self.tasks_failed = 0
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.get(self._key(job_id))
+        pipe.hgetall(f"{self._key(job_id)}:progress")
+        data, progress = pipe.execute()
+        if not data:
+            return None
+        job = json.loads(data)
+        job['completed'] = int(progress.get('completed', 0))
+        job['failed'] = int(progress.get('failed', 0))
+        for submission in job['submissions']:
+            submission['done'] = f"done:{submission['id']}" in progress
+        job['finished_at'] = float(progress['finished_at']) if 'finished_at' in progress else None
+        job['status'] = 'ended' if all(s['done'] for s in job['submissions']) else 'in_progress'
+        return job
+
+    def _save(self, job: Dict[str, Any]):
+        self.redis_client.setex(self._key(job['job_id']), self.ttl_seconds, json.dumps(job))
+
+    async def submit(self, tasks: List[Dict[str, Any]], kind: str = 'analysis') -> Dict[str, Any]:
+        """Submit tasks (``task_id``, prompts, ``temperature``, ``max_tokens``, ``meta``)
+
+        ``task_id`` values must be unique within the job. Backends only see a
+        generated ``custom_id`` (``t<index>``), since batch APIs restrict
+        custom ids to ``[a-zA-Z0-9_-]{1,64}``; results are reported under the
+        original ``task_id``.
+        """
+        job_id = f"{kind}_{uuid.uuid4().hex[:12]}"
+        meta = {}
+        task_ids = {}
+        requests = []
+        for i, task in enumerate(tasks):
+            task_id = str(task.get('task_id') or i)
+            if task_id in meta:
+                raise ValueError(f"Duplicate task_id in batch job: {task_id}")
+            meta[task_id] = task.get('meta', {})
+            custom_id = f"t{i}"
+            task_ids[custom_id] = task_id
+            requests.append({
+                'custom_id': custom_id,
+                'system_prompt': task['system_prompt'],
+                'user_prompt': task['user_prompt'],
+                'temperature': task.get('temperature', 0.5),
+                'max_tokens': task.get('max_tokens', 2000)
+            })
+
+        def definition(submissions: List[Dict[str, Any]]) -> Dict[str, Any]:
+            # Only the immutable definition is stored here; progress is in its own hash
+            return {
+                'job_id': job_id,
+                'kind': kind,
+                'backend': self.backend.name,
+                'total': sum(s['size'] for s in submissions),
+                'submissions': submissions,
+                'task_ids': task_ids,
+                'meta': meta,
+                'created_at': time.time()
+            }
+
+        submissions = []
+        for start in range(0, len(requests), self.submission_size):
+            chunk = requests[start:start + self.submission_size]
+            try:
+                submission_id = await self.backend.submit(chunk)
+            except Exception as e:
+                # Submissions already sent are still billed and will finish;
+                # keep them pollable under this job
+                if submissions:
+                    self._save(definition(submissions))
+                    logger.error(f"Batch job {job_id}: submission failed with {start} of "
+                                 f"{len(requests)} tasks already sent; those remain pollable: {e}")
+                raise
+            submissions.append({'id': submission_id, 'size': len(chunk)})
+
+        self._save(definition(submissions))
+        job = self._load(job_id)
+
+        self.jobs_submitted += 1
+        self.tasks_submitted += len(requests)
+        logger.info(f"Batch job {job_id}: {len(requests)} tasks in {len(submissions)} submissions")
+        return self._summary(job)
+
+    async def poll(self, job_id: str) -> Dict[str, Any]:
+        """Collect any finished submissions and return the job's progress"""
+        job = self._load(job_id)
+        if job is None:
+            raise ValueError(f"Unknown batch job: {job_id}")
+        if job['status'] == 'ended':
+            return self._summary(job)
+
+        for submission in job['submissions']:
+            if submission['done'] or not await self.backend.is_done(submission['id']):
+                continue
+            # Only one poller, on any replica, collects each submission
+            claim_key = f"{self._key(job_id)}:collect:{submission['id']}"
+            if not self.redis_client.set(claim_key, '1', nx=True, ex=self.claim_seconds):
+                continue
+            try:
+                self._store(job, submission['id'], await self.backend.results(submission['id']))
+            except Exception:
+                # Let another poll retry the collection
+                self.redis_client.delete(claim_key)
+                raise
+
+        job = self._load(job_id)
+        if job['status'] == 'ended' and job['finished_at'] is None:
+            progress_key = f"{self._key(job_id)}:progress"
+            self.redis_client.hsetnx(progress_key, 'finished_at', time.time())
+            job = self._load(job_id)
+        return self._summary(job)
+
+    def _store(self, job: Dict[str, Any], submission_id: str, raw_results: Dict[str, Any]):
+        records = []
+        for custom_id, raw in raw_results.items():
+            task_id = job['task_ids'].get(custom_id, custom_id)
+            if isinstance(raw, str):
+                record = {'task_id': task_id, 'error': raw}
+            else:
+                record = {'task_id': task_id, 'result': self.parse(raw)}
+            record['meta'] = job['meta'].get(task_id, {})
+            records.append(record)
+        failed = sum(1 for r in records if 'error' in r)
+
+        key = self._key(job['job_id'])
+        pipe = self.redis_client.pipeline(transaction=True)
+        if records:
+            pipe.hset(f"{key}:results", mapping={r['task_id']: json.dumps(r, default=str) for r in records})
+        pipe.hincrby(f"{key}:progress", 'completed', len(records) - failed)
+        pipe.hincrby(f"{key}:progress", 'failed', failed)
+        pipe.hset(f"{key}:progress", f"done:{submission_id}", 1)
+        pipe.expire(f"{key}:results", self.ttl_seconds)
+        pipe.expire(f"{key}:progress", self.ttl_seconds)
+        pipe.execute()
+
+        self.tasks_completed += len(records) - failed
+        self.tasks_failed += failed
+        if self.on_results:
+            self.on_results(job['job_id'], records)
+
+    def results(self, job_id: str, task_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        results_key = f"{self._key(job_id)}:results"
+        if task_ids:
+            raw = [r for r in self.redis_client.hmget(results_key, task_ids) if r]
+        else:
+            raw = list(self.redis_client.hgetall(results_key).values())
+        return [json.loads(r) for r in raw]
+
+    def _summary(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'job_id': job['job_id'],
+            'kind': job['kind'],
+            'backend': job['backend'],
+            'status': job['status'],
+            'total': job['total'],
+            'completed': job['completed'],
+            'failed': job['failed'],
+            'submissions': len(job['submissions']),
+            'submissions_done': sum(1 for s in job['submissions'] if s['done']),
+            'elapsed_seconds': round((job['finished_at'] or time.time()) - job['created_at'], 1)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': self.backend.name,
+            'jobs_submitted': self.jobs_submitted,
+            'tasks_submitted': self.tasks_submitted,
+            'tasks_completed': self.tasks_completed,
+            'tasks_failed': self.tasks_failed
+        }
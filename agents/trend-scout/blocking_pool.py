@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Blocking Stage Pool Module for Trend Scout Agent
+Runs synchronous parsing and pytrends stages off the event loop
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+
+stage_duration_histogram = meter.create_histogram(
+    name="trend_blocking_stage_duration_seconds",
+    description="Wall time of blocking stages run on the executor pool",
+    unit="seconds"
+)
+loop_lag_histogram = meter.create_histogram(
+    name="trend_event_loop_lag_seconds",
+    description="Delay between scheduled and actual wake-up of the lag probe",
+    unit="seconds"
+)
+
+
+class BlockingStagePool:
+    """Bounded executor pool for blocking stages
+
+    At most ``max_workers`` stages run at once and at most ``max_queue`` more
+    wait for a worker; further callers are back-pressured until a slot frees.
+    Cancelling the awaiting coroutine (or hitting ``timeout``) cancels the
+    stage if it has not started yet, otherwise its result is discarded. A
+    worker thread can't be interrupted, so a slot is only freed when the
+    executor is actually done with the stage, not when the caller gives up.
+    """
+
+    def __init__(self, kind: str = 'thread', max_workers: int = 4, max_queue: int = 32):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(max_workers + max_queue)
+
+        # Per-process statistics
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.abandoned = 0  # given up on by the caller but still holding a worker
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix='trend-stage'
+                )
+        return self._executor
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` on the pool and await its result
+
+        With a process pool ``func`` and its arguments must be picklable,
+        i.e. module-level functions with plain data arguments.
+        """
+        stage = getattr(func, '__name__', 'stage')
+        loop = asyncio.get_running_loop()
+
+        await self._slots.acquire()
+        try:
+            stage_future = self._get_executor().submit(functools.partial(func, *args, **kwargs))
+        except Exception:
+            self._slots.release()
+            raise
+        self.in_flight += 1
+        start_time = time.perf_counter()
+
+        def finished(done_future):
+            self.in_flight -= 1
+            stage_duration_histogram.record(time.perf_counter() - start_time, {"stage": stage})
+            if done_future.cancelled():
+                self.cancelled += 1
+            elif done_future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self._slots.release()
+
+        def release(done_future):
+            # Runs on the worker thread (or here, if cancelled before starting)
+            try:
+                loop.call_soon_threadsafe(finished, done_future)
+            except RuntimeError:
+                pass  # loop already closed
+
+        stage_future.add_done_callback(release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(stage_future), timeout=timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if not stage_future.cancel():
+                self.abandoned += 1
+            raise
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the underlying executor, cancelling queued stages"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool configuration and outcome counters"""
+        return {
+            'kind': self.kind,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': self.in_flight,
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'failed': self.failed,
+            'abandoned': self.abandoned
+        }
+
+
+class EventLoopLagMonitor:
+    """Measures event-loop responsiveness
+
+    A probe coroutine sleeps for ``interval`` seconds and records how late it
+    wakes up. Any blocking call on the loop shows up directly as lag.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    def ensure_started(self):
+        """Start the probe on the running loop if it is not already running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._probe())
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled - self.interval)
+
+            self.samples += 1
+            self.total_lag += lag
+            self.max_lag = max(self.max_lag, lag)
+            loop_lag_histogram.record(lag)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return mean and max observed loop lag in milliseconds"""
+        return {
+            'samples': self.samples,
+            'mean_lag_ms': round(self.total_lag / self.samples * 1000, 3) if self.samples else 0.0,
+            'max_lag_ms': round(self.max_lag * 1000, 3)
+        }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Clustering Module for Trend Scout Agent
+MinHash signatures with an LSH index to collapse the same story across sources
+"""
+
+import hashlib
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, List, Any, Set
+
+import numpy as np
+
+from seen_index import entry_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the universal hash family; keeps a*h+b within int64
+_PRIME = (1 << 31) - 1
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'from', 'are', 'was', 'were',
+    'has', 'have', 'had', 'its', 'into', 'over', 'after', 'about', 'new', 'how',
+    'what', 'why', 'who', 'will', 'can', 'not', 'but', 'you', 'your', 'our',
+    'their', 'they', 'than', 'more', 'says', 'said', 'via', 'out', 'all'
+}
+
+
+def strip_tags(text: str) -> str:
+    return _TAG_RE.sub(' ', text)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content tokens, without markup, stopwords or short words"""
+    return [
+        t for t in _TOKEN_RE.findall(strip_tags(text).lower())
+        if len(t) > 2 and t not in _STOPWORDS
+    ]
+
+
+def shingles(text: str) -> Set[str]:
+    """Normalised unigram + bigram shingles of a title/summary"""
+    tokens = tokenize(text)
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+class NearDuplicateClusterer:
+    """Clusters near-duplicate trend items in roughly linear time
+
+    Each item's title and summary are shingled and reduced to a MinHash
+    signature. Signatures are split into ``bands`` bands; items sharing any
+    band bucket are candidate pairs, confirmed when their estimated Jaccard
+    similarity reaches ``threshold``. Only candidates are compared, so the
+    cost grows with the number of items rather than the number of pairs.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.int64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of the text's shingle set"""
+        tokens = shingles(text)
+        if not tokens:
+            return np.full(self.num_perm, _PRIME, dtype=np.int64)
+
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(t.encode('utf-8'), digest_size=4).digest(), 'big')
+             for t in tokens),
+            dtype=np.int64,
+            count=len(tokens)
+        )
+        # (num_perm, n_tokens) permuted hashes, minimised per permutation
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1)
+
+    def cluster(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Collapse near-duplicates, returning one representative per cluster
+
+        Representatives are annotated with ``cluster_size``, the distinct
+        ``cluster_sources`` that carried the story, and the sorted
+        ``cluster_fingerprints`` of every member entry.
+        """
+        if len(items) < 2:
+            return [
+                dict(item, cluster_size=1, cluster_sources=[item['source']] if item.get('source') else [],
+                     cluster_fingerprints=[entry_fingerprint(item)])
+                for item in items
+            ]
+
+        signatures = np.vstack([
+            self.signature(f"{item.get('title', '')} {item.get('summary') or item.get('description', '')}")
+            for item in items
+        ])
+        # Items with no usable text never join a cluster
+        empty = (signatures == _PRIME).all(axis=1)
+
+        union_find = _UnionFind(len(items))
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = defaultdict(list)
+            band_rows = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for idx, row in enumerate(band_rows):
+                if not empty[idx]:
+                    buckets[row.tobytes()].append(idx)
+
+            for members in buckets.values():
+                first = members[0]
+                for other in members[1:]:
+                    if union_find.find(first) == union_find.find(other):
+                        continue
+                    similarity = float(np.mean(signatures[first] == signatures[other]))
+                    if similarity >= self.threshold:
+                        union_find.union(first, other)
+
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for idx in range(len(items)):
+            clusters[union_find.find(idx)].append(idx)
+
+        representatives = []
+        for members in clusters.values():
+            # The most detailed write-up stands in for the cluster
+            best = max(members, key=lambda i: len(items[i].get('summary') or items[i].get('description') or ''))
+            sources = sorted({items[i].get('source') for i in members if items[i].get('source')})
+            representatives.append(dict(
+                items[best],
+                cluster_size=len(members),
+                cluster_sources=sources,
+                cluster_fingerprints=sorted(entry_fingerprint(items[i]) for i in members)
+            ))
+
+        if len(representatives) < len(items):
+            logger.info(f"Collapsed {len(items)} items into {len(representatives)} story clusters")
+
+        return representatives
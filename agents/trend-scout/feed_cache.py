@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Feed Validator Cache Module for Trend Scout Agent
+Conditional-GET caching of RSS feeds using ETag/Last-Modified validators
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Union
+
+import aiohttp
+import feedparser
+import redis
+from opentelemetry import metrics
+
+from blocking_pool import BlockingStagePool
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+
+feed_fetch_counter = meter.create_counter(
+    name="trend_feed_fetches_total",
+    description="RSS feed fetches by cache outcome (hit=304, miss=200)",
+    unit="requests"
+)
+feed_bytes_saved_counter = meter.create_counter(
+    name="trend_feed_bytes_saved_total",
+    description="Feed body bytes not downloaded thanks to 304 responses",
+    unit="bytes"
+)
+
+# Upper bound on entries kept per feed; callers slice further as needed
+MAX_CACHED_ENTRIES = 50
+
+
+def parse_feed_entries(content: Union[str, bytes], limit: int = MAX_CACHED_ENTRIES) -> List[Dict[str, Any]]:
+    """Parse a feed body into plain, JSON-serialisable entry dicts
+
+    Raw bytes are preferred so feedparser can honour the XML encoding declaration.
+    """
+    feed = feedparser.parse(content)
+
+    entries = []
+    for entry in feed.entries[:limit]:
+        published_parsed = entry.get('published_parsed')
+        entries.append({
+            'id': entry.get('id', ''),
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'summary': entry.get('summary', ''),
+            'published': entry.get('published', ''),
+            'published_parsed': list(published_parsed) if published_parsed else None
+        })
+
+    return entries
+
+
+class FeedValidatorCache:
+    """HTTP validator cache for RSS feeds
+
+    Stores the ETag/Last-Modified validators and the parsed entries for each
+    feed URL in Redis, sends conditional requests and serves 304 responses
+    from the parsed cache so unchanged feeds are never downloaded or parsed.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl_seconds: int = 7 * 86400,
+                 stage_pool: Optional[BlockingStagePool] = None):
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.stage_pool = stage_pool
+
+        # Per-process statistics, reported alongside agent responses
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    def _cache_key(self, url: str) -> str:
+        return f"feed_cache:{hashlib.sha1(url.encode('utf-8')).hexdigest()}"
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        """Load cached validators and entries for a feed URL"""
+        try:
+            cached = self.redis_client.get(self._cache_key(url))
+            return json.loads(cached) if cached else None
+        except (redis.RedisError, json.JSONDecodeError) as e:
+            logger.warning(f"Feed cache read failed for {url}: {e}")
+            return None
+
+    def _store(self, url: str, etag: Optional[str], last_modified: Optional[str],
+               entries: List[Dict[str, Any]], body_size: int):
+        """Persist validators and parsed entries for a feed URL"""
+        record = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'entries': entries,
+            'body_size': body_size,
+            'fetched_at': datetime.utcnow().isoformat()
+        }
+        try:
+            self.redis_client.setex(self._cache_key(url), self.ttl_seconds, json.dumps(record))
+        except redis.RedisError as e:
+            logger.warning(f"Feed cache write failed for {url}: {e}")
+
+    def _touch(self, url: str):
+        try:
+            self.redis_client.expire(self._cache_key(url), self.ttl_seconds)
+        except redis.RedisError as e:
+            logger.warning(f"Feed cache TTL refresh failed for {url}: {e}")
+
+    def _conditional_headers(self, cached: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    async def fetch_entries(self, session: aiohttp.ClientSession, url: str,
+                            timeout: int = 30) -> List[Dict[str, Any]]:
+        """Fetch feed entries, revalidating against the cached copy
+
+        Raises aiohttp errors to the caller, matching the uncached fetch path.
+        """
+        cached = self._load(url)
+        headers = self._conditional_headers(cached)
+
+        try:
+            async with session.get(url, headers=headers, timeout=timeout) as response:
+                if response.status == 304 and cached is not None:
+                    self.hits += 1
+                    self.bytes_saved += cached.get('body_size', 0)
+                    feed_fetch_counter.add(1, {"outcome": "hit"})
+                    feed_bytes_saved_counter.add(cached.get('body_size', 0))
+                    # Refresh the TTL so frequently revalidated feeds stay cached
+                    self._touch(url)
+                    return cached['entries']
+
+                status = response.status
+                body = await response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except Exception:
+            self.errors += 1
+            feed_fetch_counter.add(1, {"outcome": "error"})
+            raise
+
+        self.misses += 1
+        self.bytes_downloaded += len(body)
+        feed_fetch_counter.add(1, {"outcome": "miss"})
+
+        # feedparser is CPU-bound; keep it off the event loop when a pool is configured
+        if self.stage_pool is not None:
+            entries = await self.stage_pool.run(parse_feed_entries, body)
+        else:
+            entries = parse_feed_entries(body)
+
+        # Only cache when the server gave us something to revalidate against
+        if status == 200 and (etag or last_modified):
+            self._store(url, etag, last_modified, entries, len(body))
+
+        return entries
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit ratio and bandwidth statistics"""
+        total = self.hits + self.misses
+        return {
+            'requests': total,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            'bytes_downloaded': self.bytes_downloaded,
+            'bytes_saved': self.bytes_saved
+        }
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Google Trends Stage Module for Trend Scout Agent
+Synchronous pytrends calls, kept at module level so they can run on an executor pool
+"""
+
+import json
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+from pytrends.request import TrendReq
+
+logger = logging.getLogger(__name__)
+
+# pytrends rejects payloads with more than 5 keywords
+MAX_PAYLOAD_KEYWORDS = 5
+
+# Level the anchor keyword's mean interest is rescaled to
+ANCHOR_LEVEL = 50.0
+
+# One pytrends session per process; TrendReq keeps payload state between
+# calls, so requests on the shared session are serialised
+_client: Optional[TrendReq] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> TrendReq:
+    global _client
+    if _client is None:
+        _client = TrendReq(hl='en-US', tz=360)
+    return _client
+
+
+def fetch_interest_over_time(keywords: List[str], timeframe: str = 'now 1-d',
+                             include_related: bool = False) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """Fetch interest over time (and optionally related queries) for up to 5 keywords
+
+    Returns the pytrends interest DataFrame and the related-queries dict (or None).
+    Blocks on network I/O and DataFrame construction; call it through
+    ``BlockingStagePool.run`` from async code.
+    """
+    with _client_lock:
+        pytrends = _get_client()
+        pytrends.build_payload(keywords, timeframe=timeframe)
+
+        interest_df = pytrends.interest_over_time()
+        related_queries = pytrends.related_queries() if include_related else None
+
+    return interest_df, related_queries
+
+
+def fetch_interest_series(keywords: List[str], timeframe: str = 'now 1-d',
+                          include_related: bool = False
+                          ) -> Tuple[np.ndarray, Dict[str, np.ndarray], Optional[Dict[str, Any]]]:
+    """Fetch interest over time as plain arrays instead of a DataFrame
+
+    Returns epoch-second timestamps, one float32 interest array per keyword
+    and the related queries. The DataFrame is converted inside the worker so
+    the event loop only ever sees compact numpy arrays.
+    """
+    interest_df, related_queries = fetch_interest_over_time(keywords, timeframe, include_related)
+
+    if interest_df.empty:
+        return np.zeros(0, dtype=np.int64), {}, related_queries
+
+    timestamps = interest_df.index.asi8 // 10**9
+    values = {
+        keyword: interest_df[keyword].to_numpy(dtype=np.float32)
+        for keyword in keywords
+        if keyword in interest_df.columns
+    }
+    return timestamps, values, related_queries
+
+
+def _related_records(related: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """JSON-safe top/rising related queries for one keyword"""
+    if not related:
+        return None
+    return {
+        kind: json.loads(frame.to_json(orient='records')) if frame is not None else []
+        for kind, frame in related.items()
+    }
+
+
+def fetch_anchored_batches(chunks: List[List[str]], timeframe: str, anchor: str,
+                           include_related: bool = False
+                           ) -> Dict[str, Tuple[np.ndarray, np.ndarray, Optional[Dict[str, Any]]]]:
+    """Fetch several keyword payloads on the shared session, on one anchor scale
+
+    pytrends scales every payload to its own 0-100 range, so each chunk
+    carries ``anchor`` and is rescaled until the anchor averages
+    ``ANCHOR_LEVEL``. Keywords from different chunks (and different
+    calls) then share one scale, clipped to 0-100 so values stay
+    percentages of peak (keywords far above the anchor saturate). Returns ``{keyword: (timestamps, values,
+    related)}``; keywords with no data are omitted.
+    """
+    results: Dict[str, Tuple[np.ndarray, np.ndarray, Optional[Dict[str, Any]]]] = {}
+
+    for chunk in chunks:
+        timestamps, values, related = fetch_interest_series(chunk, timeframe, include_related)
+        if not values:
+            continue
+
+        anchor_values = values.get(anchor)
+        anchor_mean = float(anchor_values.mean()) if anchor_values is not None else 0.0
+        if anchor_mean >= 1.0:
+            scale = ANCHOR_LEVEL / anchor_mean
+        else:
+            # Anchor drowned out by the chunk's keywords; keep the raw scale
+            logger.warning(f"Anchor '{anchor}' has no signal for {chunk}, chunk left unscaled")
+            scale = 1.0
+
+        for keyword, points in values.items():
+            if keyword == anchor and keyword in results:
+                continue
+            results[keyword] = (
+                timestamps,
+                np.clip(points * np.float32(scale), 0.0, 100.0),
+                _related_records((related or {}).get(keyword))
+            )
+
+    return results
+
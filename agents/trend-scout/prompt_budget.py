@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Prompt Budget Module for Trend Scout Agent
+Token estimates and budget-aware packing of trend payloads into prompts
+"""
+
+import json
+import logging
+from typing import Dict, List, Any, Optional
+
+from summarizer import ExtractiveSummarizer, clip
+
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token for English text and compact JSON
+CHARS_PER_TOKEN = 4
+
+_summarizer = ExtractiveSummarizer()
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or spaces; a third the size of indent=2"""
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+def compact_trend(trend: Dict[str, Any], ref: Optional[str] = None,
+                  text_chars: int = 200) -> Dict[str, Any]:
+    """Only the fields a model needs to judge a trend, with long text summarized"""
+    text = trend.get('description') or trend.get('summary') or ''
+    compact = {
+        'title': clip(trend.get('title', ''), 160),
+        'source': trend.get('source')
+    }
+    if ref is not None:
+        compact = {'ref': ref, **compact}
+    if text:
+        compact['text'] = _summarizer.key_sentence(text, max_chars=text_chars) or clip(text, text_chars)
+    for key in ('metrics', 'cluster_size', 'interest_score', 'momentum', 'category'):
+        if trend.get(key) not in (None, {}, []):
+            compact[key] = trend[key]
+    return compact
+
+
+def pack_by_budget(items: List[Dict[str, Any]], budget_tokens: int,
+                   max_items: int) -> List[List[Dict[str, Any]]]:
+    """Greedily group items so each group's compact JSON fits the token budget
+
+    An item larger than the budget on its own still gets a group of one.
+    """
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    used = 0
+    for item in items:
+        cost = estimate_tokens(compact_json(item))
+        if current and (used + cost > budget_tokens or len(current) >= max_items):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
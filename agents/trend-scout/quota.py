@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Distributed API Quota Module for Trend Scout Agent
+Redis token buckets shared by all replicas, with per-source budgets
+"""
+
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+import redis
+from opentelemetry import metrics
+from opentelemetry.metrics import Observation
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+
+quota_reservation_counter = meter.create_counter(
+    name="trend_api_quota_reservations_total",
+    description="API quota reservations by scope and outcome",
+    unit="reservations"
+)
+
+# Every live quota reports through the same two gauges, labelled by its key
+# prefix, so separate budgets (fetches, speculation) can be told apart
+_quotas: "weakref.WeakSet[DistributedQuota]" = weakref.WeakSet()
+
+
+def _observe_remaining(options):
+    for quota in list(_quotas):
+        for scope, (remaining, _) in list(quota._snapshot.items()):
+            yield Observation(remaining, {"quota": quota.key_prefix, "scope": scope})
+
+
+def _observe_refill(options):
+    for quota in list(_quotas):
+        for scope, (_, wait) in list(quota._snapshot.items()):
+            yield Observation(wait, {"quota": quota.key_prefix, "scope": scope})
+
+
+meter.create_observable_gauge(
+    name="trend_api_quota_remaining",
+    callbacks=[_observe_remaining],
+    description="Remaining API quota tokens per quota and scope",
+    unit="calls"
+)
+meter.create_observable_gauge(
+    name="trend_api_quota_refill_seconds",
+    callbacks=[_observe_refill],
+    description="Seconds until the next call would be granted per quota and scope",
+    unit="seconds"
+)
+
+# Refills and debits every bucket in KEYS atomically. A reservation is granted
+# only if every bucket (global and per-source) can cover the cost. Redis TIME
+# is used as the clock so replicas with skewed clocks agree on refill.
+# ARGV: cost, then capacity and refill rate (tokens/sec) for each key.
+RESERVE_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local tokens = {}
+local granted = 1
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    tokens[i] = level
+    if level < cost then
+        granted = 0
+    end
+end
+
+local result = {granted}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    if granted == 1 then
+        tokens[i] = tokens[i] - cost
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens[i]), 'ts', tostring(now))
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) * 2)
+    local wait = 0
+    if tokens[i] < cost then
+        wait = (cost - tokens[i]) / rate
+    end
+    table.insert(result, tostring(tokens[i]))
+    table.insert(result, tostring(wait))
+end
+return result
+"""
+
+
+@dataclass
+class QuotaReservation:
+    """Outcome of a quota reservation"""
+    granted: bool
+    remaining: float
+    retry_after: float
+    scope: str
+
+
+class DistributedQuota:
+    """Token-bucket API quota shared across replicas
+
+    A global bucket of ``capacity`` calls refills evenly over
+    ``window_seconds``; sources may carry their own smaller budget over the
+    same window. ``reserve`` debits both atomically before the call is made.
+    If Redis is unreachable the quota falls back to a per-process bucket
+    with the same refill.
+    """
+
+    def __init__(self, redis_client: redis.Redis, capacity: int,
+                 window_seconds: int = 3600, key_prefix: str = "api_quota"):
+        self.redis_client = redis_client
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.key_prefix = key_prefix
+        self._reserve = redis_client.register_script(RESERVE_SCRIPT)
+
+        # Last observed bucket levels, exported through the gauge callbacks
+        self._snapshot: Dict[str, Tuple[float, float]] = {}
+        # Per-process bucket used while Redis is unreachable, same refill rate
+        self._local_tokens = float(capacity)
+        self._local_ts = time.monotonic()
+        _quotas.add(self)
+
+    def _key(self, scope: str) -> str:
+        return f"{self.key_prefix}:{scope}"
+
+    def reserve(self, source: Optional[str] = None, source_budget: Optional[int] = None,
+                cost: int = 1) -> QuotaReservation:
+        """Atomically reserve ``cost`` calls from the global and source buckets"""
+        scopes: List[Tuple[str, int]] = [('global', self.capacity)]
+        if source and source_budget:
+            scopes.append((f"source:{source}", source_budget))
+
+        keys = [self._key(scope) for scope, _ in scopes]
+        args: List[Any] = [cost]
+        for _, capacity in scopes:
+            args.extend([capacity, capacity / self.window_seconds])
+
+        try:
+            result = self._reserve(keys=keys, args=args)
+        except redis.RedisError as e:
+            logger.warning(f"Distributed quota unavailable, using local bucket: {e}")
+            return self._reserve_local(cost)
+
+        granted = bool(int(result[0]))
+        reservation = None
+        for i, (scope, _) in enumerate(scopes):
+            remaining = float(result[1 + 2 * i])
+            retry_after = float(result[2 + 2 * i])
+            self._snapshot[scope] = (remaining, retry_after)
+
+            # Report the tightest bucket to the caller
+            if reservation is None or retry_after > reservation.retry_after:
+                reservation = QuotaReservation(granted, remaining, retry_after, scope)
+
+        quota_reservation_counter.add(1, {
+            "quota": self.key_prefix,
+            "scope": reservation.scope,
+            "outcome": "granted" if granted else "denied"
+        })
+        return reservation
+
+    def _reserve_local(self, cost: int) -> QuotaReservation:
+        rate = self.capacity / self.window_seconds
+        now = time.monotonic()
+        self._local_tokens = min(self.capacity, self._local_tokens + (now - self._local_ts) * rate)
+        self._local_ts = now
+        if self._local_tokens < cost:
+            return QuotaReservation(False, self._local_tokens, (cost - self._local_tokens) / rate, 'local')
+        self._local_tokens -= cost
+        return QuotaReservation(True, self._local_tokens, 0.0, 'local')
+
+    def remaining(self) -> int:
+        """Last known remaining global quota"""
+        remaining, _ = self._snapshot.get('global', (self.capacity, 0.0))
+        return int(remaining)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'capacity': self.capacity,
+            'window_seconds': self.window_seconds,
+            'scopes': {
+                scope: {'remaining': round(remaining, 2), 'refill_seconds': round(wait, 2)}
+                for scope, (remaining, wait) in self._snapshot.items()
+            }
+        }
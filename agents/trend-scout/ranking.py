@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Trend Ranking Module for Trend Scout Agent
+Streaming top-K selection of trend items with time-decayed scoring
+"""
+
+import calendar
+import heapq
+import itertools
+import logging
+import math
+import time
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from dedup import shingles
+from term_stats import BurstDetector
+
+logger = logging.getLogger(__name__)
+
+
+def item_timestamp(item: Dict[str, Any]) -> Optional[float]:
+    """Publication time of an item in epoch seconds, if it carries one
+
+    Feed entries keep feedparser's ``published_parsed`` (a UTC struct_time,
+    serialised as a list once cached).
+    """
+    published = item.get('published_parsed') or item.get('published')
+    if isinstance(published, (list, tuple)) and len(published) >= 6:
+        return float(calendar.timegm(tuple(published[:6])))
+    if isinstance(published, (int, float)):
+        return float(published)
+    return None
+
+
+class TrendRanker:
+    """Scores trend items as they arrive and keeps only the best K
+
+    The score multiplies independent signals so no single one dominates:
+
+    - recency: exponential decay on the item's age (``half_life`` seconds);
+      items without a timestamp (search interest) count as current
+    - source weight: per-source multiplier, 1.0 by default
+    - coverage: ``1 + log(cluster_size)`` for stories carried by several sources
+    - burst: ``1 + log1p(best burst score)`` over the item's title terms
+    - interest: ``1 + interest_score / 100 + max(momentum, 0)`` for search trends
+
+    A min-heap of size K holds the current leaders, so pushing N items costs
+    O(N log K) and the full list is never sorted.
+    """
+
+    def __init__(self, k: int = 5, half_life: float = 6 * 3600,
+                 source_weights: Optional[Dict[str, float]] = None,
+                 burst_detector: Optional[BurstDetector] = None,
+                 now: Optional[float] = None):
+        self.k = k
+        self._decay = math.log(2) / half_life
+        self.source_weights = source_weights or {}
+        self.burst_detector = burst_detector
+        self.now = now or time.time()
+
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._counter = itertools.count()  # tie-breaker; dicts don't compare
+        self.seen = 0
+
+    def score(self, item: Dict[str, Any]) -> float:
+        published = item_timestamp(item)
+        age = max(0.0, self.now - published) if published is not None else 0.0
+        recency = math.exp(-self._decay * age)
+
+        weight = self.source_weights.get(
+            item.get('source_name') or item.get('source'), 1.0
+        )
+        coverage = 1.0 + math.log(max(1, item.get('cluster_size', 1)))
+
+        burst = 1.0
+        if self.burst_detector is not None:
+            rising = self.burst_detector.top_rising(
+                k=1, candidates=shingles(item.get('title', '')), now=self.now
+            )
+            if rising:
+                burst += math.log1p(rising[0][1])
+
+        interest = 1.0 + item.get('interest_score', 0.0) / 100.0 + max(0.0, item.get('momentum', 0.0))
+
+        return weight * recency * coverage * burst * interest
+
+    def push(self, item: Dict[str, Any]) -> float:
+        """Score one item and keep it if it ranks in the current top K"""
+        score = self.score(item)
+        self.seen += 1
+
+        entry = (score, next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+        return score
+
+    def extend(self, items: Iterable[Dict[str, Any]]):
+        for item in items:
+            self.push(item)
+
+    def top(self) -> List[Dict[str, Any]]:
+        """Current leaders, best first, annotated with ``rank_score``"""
+        return [
+            dict(item, rank_score=round(score, 4))
+            for score, _, item in sorted(self._heap, key=lambda e: (-e[0], e[1]))
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'items_scored': self.seen,
+            'kept': len(self._heap),
+            'min_kept_score': round(self._heap[0][0], 4) if self._heap else None
+        }
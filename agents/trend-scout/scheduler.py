@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Adaptive Polling Scheduler Module for Trend Scout Agent
+Source registry, consistent-hash sharding across replicas and adaptive feed polling
+"""
+
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import random
+import time
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+import redis
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+
+poll_counter = meter.create_counter(
+    name="trend_source_polls_total",
+    description="Scheduled source polls by outcome",
+    unit="polls"
+)
+poll_interval_histogram = meter.create_histogram(
+    name="trend_source_poll_interval_seconds",
+    description="Learned poll interval assigned after each poll",
+    unit="seconds"
+)
+
+
+# Atomically lease due sources: a source is claimed only if it is still due,
+# and its score is pushed to the lease expiry so no other replica takes it
+CLAIM_DUE_SCRIPT = """
+local claimed = {}
+for i = 3, #ARGV do
+    local score = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if score and tonumber(score) <= tonumber(ARGV[1]) then
+        redis.call('ZADD', KEYS[1], ARGV[2], ARGV[i])
+        table.insert(claimed, ARGV[i])
+    end
+end
+return claimed
+"""
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+
+class ConsistentHashRing:
+    """Consistent hash ring mapping source names to replica ids"""
+
+    def __init__(self, nodes: List[str], vnodes: int = 64):
+        self.nodes = sorted(set(nodes))
+        ring = sorted(
+            (_hash64(f"{node}#{i}"), node)
+            for node in self.nodes
+            for i in range(vnodes)
+        )
+        self._hashes = [h for h, _ in ring]
+        self._owners = [node for _, node in ring]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        idx = bisect.bisect(self._hashes, _hash64(key)) % len(self._hashes)
+        return self._owners[idx]
+
+
+class SourceRegistry:
+    """Redis-backed registry of trend sources and their polling state
+
+    Source configs live in one hash, learned polling state in another and
+    the next poll time of every source in a sorted set used as a due queue.
+    """
+
+    CONFIG_KEY = "trend_sources:config"
+    STATE_KEY = "trend_sources:state"
+    DUE_KEY = "trend_sources:due"
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis_client = redis_client
+        self._claim_due = redis_client.register_script(CLAIM_DUE_SCRIPT)
+
+    def register(self, sources: List[Dict[str, Any]]):
+        """Add or update sources; new sources become due immediately"""
+        if not sources:
+            return
+        pipe = self.redis_client.pipeline(transaction=False)
+        now = time.time()
+        for source in sources:
+            pipe.hset(self.CONFIG_KEY, source['name'], json.dumps(source))
+            if source.get('enabled', True):
+                pipe.zadd(self.DUE_KEY, {source['name']: now}, nx=True)
+            else:
+                pipe.zrem(self.DUE_KEY, source['name'])
+        pipe.execute()
+
+    def unregister(self, name: str):
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hdel(self.CONFIG_KEY, name)
+        pipe.hdel(self.STATE_KEY, name)
+        pipe.zrem(self.DUE_KEY, name)
+        pipe.execute()
+
+    def all_sources(self) -> List[Dict[str, Any]]:
+        return [json.loads(v) for v in self.redis_client.hvals(self.CONFIG_KEY)]
+
+    def get_sources(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not names:
+            return {}
+        values = self.redis_client.hmget(self.CONFIG_KEY, names)
+        return {name: json.loads(v) for name, v in zip(names, values) if v}
+
+    def due(self, now: float, limit: int = 1000,
+            owned: Optional[Callable[[str], bool]] = None, page_size: int = 1000) -> List[str]:
+        """Due sources, oldest first, up to ``limit``
+
+        With ``owned``, sources are filtered before the limit is applied,
+        paging through the due queue so a replica still finds its own
+        sources when many others are due ahead of them.
+        """
+        if owned is None:
+            return self.redis_client.zrangebyscore(self.DUE_KEY, '-inf', now, start=0, num=limit)
+
+        names: List[str] = []
+        offset = 0
+        while len(names) < limit:
+            page = self.redis_client.zrangebyscore(self.DUE_KEY, '-inf', now, start=offset, num=page_size)
+            names.extend(name for name in page if owned(name))
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return names[:limit]
+
+    def claim(self, names: List[str], now: float, lease_seconds: float) -> List[str]:
+        """Lease due sources for polling; returns the names actually claimed
+
+        If the claiming replica dies mid-poll the lease expires and the source
+        becomes due again.
+        """
+        if not names:
+            return []
+        return self._claim_due(keys=[self.DUE_KEY], args=[now, now + lease_seconds, *names])
+
+    def release(self, name: str):
+        """Drop a lease early, making the source due again right away"""
+        self.redis_client.zadd(self.DUE_KEY, {name: time.time()}, xx=True)
+
+    def get_state(self, name: str) -> Dict[str, Any]:
+        value = self.redis_client.hget(self.STATE_KEY, name)
+        return json.loads(value) if value else {}
+
+    def save_state(self, name: str, state: Dict[str, Any], next_poll_at: float):
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hset(self.STATE_KEY, name, json.dumps(state))
+        pipe.zadd(self.DUE_KEY, {name: next_poll_at})
+        pipe.execute()
+
+
+class IngestedItemStore:
+    """Recent ingested trend items, read by brief generation
+
+    Items are stored in a sorted set scored by ingestion time and trimmed by
+    both age and count, so reads never touch the upstream feeds.
+    """
+
+    KEY = "trend_items:recent"
+
+    def __init__(self, redis_client: redis.Redis, retention_seconds: int = 48 * 3600,
+                 max_items: int = 50000):
+        self.redis_client = redis_client
+        self.retention_seconds = retention_seconds
+        self.max_items = max_items
+
+    def add(self, items: List[Dict[str, Any]]):
+        if not items:
+            return
+        now = time.time()
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zadd(self.KEY, {json.dumps(item, default=str, sort_keys=True): now for item in items})
+        pipe.zremrangebyscore(self.KEY, '-inf', now - self.retention_seconds)
+        pipe.zremrangebyrank(self.KEY, 0, -self.max_items - 1)
+        pipe.execute()
+
+    def recent(self, window_seconds: int, sources: Optional[List[str]] = None,
+               limit: int = 1000) -> List[Dict[str, Any]]:
+        """Return items ingested within the window, newest first"""
+        members = self.redis_client.zrevrangebyscore(
+            self.KEY, '+inf', time.time() - window_seconds, start=0, num=limit
+        )
+        items = [json.loads(m) for m in members]
+        if sources:
+            items = [item for item in items if item.get('source') in sources]
+        return items
+
+
+class AdaptivePollScheduler:
+    """Polls registered sources at a learned per-source frequency
+
+    Each source's rate of new entries is tracked as an exponential moving
+    average and its poll interval set so that a poll finds roughly
+    ``target_new_per_poll`` new entries, clamped to [min, max]. Sources are
+    sharded across live replicas with a consistent hash ring, and the global
+    ``concurrency_budget`` is split evenly between the live replicas.
+    """
+
+    REPLICAS_KEY = "trend_scheduler:replicas"
+
+    def __init__(self,
+                 registry: SourceRegistry,
+                 store: IngestedItemStore,
+                 poll_fn: Callable[[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]],
+                 replica_id: str,
+                 min_interval: int = 60,
+                 max_interval: int = 6 * 3600,
+                 default_interval: int = 900,
+                 target_new_per_poll: float = 2.0,
+                 smoothing: float = 0.3,
+                 concurrency_budget: int = 64,
+                 heartbeat_ttl: int = 30,
+                 poll_lease_seconds: int = 300,
+                 tick_seconds: float = 1.0):
+        self.registry = registry
+        self.redis_client = registry.redis_client
+        self.store = store
+        self.poll_fn = poll_fn
+        self.replica_id = replica_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.target_new_per_poll = target_new_per_poll
+        self.smoothing = smoothing
+        self.concurrency_budget = concurrency_budget
+        self.heartbeat_ttl = heartbeat_ttl
+        self.poll_lease_seconds = poll_lease_seconds
+        self.tick_seconds = tick_seconds
+
+        self.ring = ConsistentHashRing([replica_id])
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.polls = 0
+        self.errors = 0
+
+    @property
+    def local_budget(self) -> int:
+        return max(1, self.concurrency_budget // max(1, len(self.ring.nodes)))
+
+    def _heartbeat(self):
+        """Record this replica as live and rebuild the ring from live replicas"""
+        now = time.time()
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zadd(self.REPLICAS_KEY, {self.replica_id: now})
+        pipe.zremrangebyscore(self.REPLICAS_KEY, '-inf', now - self.heartbeat_ttl)
+        pipe.zrange(self.REPLICAS_KEY, 0, -1)
+        live = pipe.execute()[-1]
+
+        if sorted(live) != self.ring.nodes:
+            logger.info(f"Scheduler ring membership changed: {live}")
+            self.ring = ConsistentHashRing(live or [self.replica_id])
+
+    def _next_interval(self, source: Dict[str, Any], state: Dict[str, Any],
+                       new_count: int, now: float) -> float:
+        """Update the learned entry rate and derive the next poll interval"""
+        if source.get('poll_interval'):
+            return float(source['poll_interval'])
+
+        interval = state.get('interval', self.default_interval)
+        elapsed = max(1.0, now - state['last_polled']) if state.get('last_polled') else interval
+        observed_rate = new_count / elapsed
+
+        rate = state.get('rate')
+        rate = observed_rate if rate is None else (
+            self.smoothing * observed_rate + (1 - self.smoothing) * rate
+        )
+        state['rate'] = rate
+
+        if rate > 0:
+            interval = self.target_new_per_poll / rate
+        else:
+            # Nothing new seen yet: back off geometrically
+            interval = interval * 2
+
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    async def _poll(self, name: str, source: Dict[str, Any]):
+        rescheduled = False
+        try:
+            state = self.registry.get_state(name)
+            now = time.time()
+            outcome = "success"
+
+            try:
+                items = await self.poll_fn(source)
+                self.store.add(items)
+                new_count = len(items)
+            except Exception as e:
+                logger.error(f"Scheduled poll of {name} failed: {e}")
+                self.errors += 1
+                outcome = "error"
+                new_count = 0
+
+            interval = self._next_interval(source, state, new_count, now)
+            state.update({
+                'interval': interval,
+                'last_polled': now,
+                'last_new': new_count
+            })
+            # Jitter spreads sources with equal intervals across ticks
+            next_poll_at = now + interval * random.uniform(0.9, 1.1)
+            self.registry.save_state(name, state, next_poll_at)
+            rescheduled = True
+
+            self.polls += 1
+            poll_counter.add(1, {"outcome": outcome})
+            poll_interval_histogram.record(interval)
+        except redis.RedisError as e:
+            logger.error(f"Could not record scheduled poll of {name}: {e}")
+            self.errors += 1
+            poll_counter.add(1, {"outcome": "error"})
+        finally:
+            # A poll that didn't reschedule its source (Redis error, or
+            # cancelled on stop) hands the source back instead of holding the lease
+            if not rescheduled:
+                try:
+                    self.registry.release(name)
+                except redis.RedisError as e:
+                    logger.warning(f"Could not release lease on {name}, it expires on its own: {e}")
+
+    def _launch_due(self):
+        """Start polls for due sources owned by this replica, within budget"""
+        capacity = self.local_budget - len(self._in_flight)
+        if capacity <= 0:
+            return
+
+        now = time.time()
+        due = self.registry.due(
+            now, limit=capacity,
+            owned=lambda name: name not in self._in_flight and self.ring.owner(name) == self.replica_id
+        )
+        # The lease guards against double polling while ring membership settles
+        claimed = self.registry.claim(due, now, self.poll_lease_seconds)
+        sources = self.registry.get_sources(claimed)
+
+        # Drop queue entries whose source was unregistered since being queued
+        for name in set(claimed) - set(sources):
+            self.redis_client.zrem(self.registry.DUE_KEY, name)
+
+        for name, source in sources.items():
+            task = asyncio.get_running_loop().create_task(self._poll(name, source))
+            self._in_flight[name] = task
+            task.add_done_callback(lambda _, n=name: self._in_flight.pop(n, None))
+
+    async def run(self):
+        """Scheduler loop; runs until cancelled"""
+        logger.info(f"Adaptive poll scheduler started on replica {self.replica_id}")
+        last_heartbeat = 0.0
+        while True:
+            try:
+                if time.time() - last_heartbeat >= self.heartbeat_ttl / 3:
+                    self._heartbeat()
+                    last_heartbeat = time.time()
+                self._launch_due()
+            except redis.RedisError as e:
+                logger.warning(f"Scheduler tick failed: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight.values(), return_exceptions=True)
+        self.redis_client.zrem(self.REPLICAS_KEY, self.replica_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'replica_id': self.replica_id,
+            'live_replicas': len(self.ring.nodes),
+            'local_budget': self.local_budget,
+            'in_flight': len(self._in_flight),
+            'polls': self.polls,
+            'errors': self.errors
+        }
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Seen-Entry Index Module for Trend Scout Agent
+Per-feed fingerprint sets in Redis for incremental feed ingestion
+"""
+
+import hashlib
+import logging
+import time
+from typing import Dict, List, Any
+
+import redis
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+
+new_entries_counter = meter.create_counter(
+    name="trend_feed_new_entries_total",
+    description="Feed entries not seen before, per source",
+    unit="entries"
+)
+
+
+def entry_fingerprint(entry: Dict[str, Any]) -> str:
+    """Stable fingerprint for a feed entry
+
+    Prefers the GUID, then the link, and only falls back to title + summary
+    for feeds that publish neither.
+    """
+    identity = entry.get('id') or entry.get('link')
+    if not identity:
+        identity = f"{entry.get('title', '')}\n{entry.get('summary', '')}"
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]
+
+
+class SeenEntryIndex:
+    """Time-bounded set of already ingested entries per feed
+
+    Each feed has a Redis sorted set of fingerprints scored by first-seen
+    time. Entries older than ``ttl_seconds`` are trimmed on every poll so the
+    set stays proportional to the feed's recent volume.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl_seconds: int = 7 * 86400):
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+
+        # New-vs-seen counts from the most recent poll of each source
+        self.last_poll: Dict[str, Dict[str, int]] = {}
+
+    def _key(self, source: str) -> str:
+        return f"seen_entries:{source}"
+
+    def filter_new(self, source: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return only entries not seen before for ``source`` and mark them seen
+
+        ZADD NX per fingerprint makes the check-and-mark atomic, so when
+        several replicas poll the same feed each entry is new for exactly one.
+        """
+        if not entries:
+            self.last_poll[source] = {'polled': 0, 'new': 0}
+            return []
+
+        key = self._key(source)
+        now = time.time()
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zremrangebyscore(key, '-inf', now - self.ttl_seconds)
+        for entry in entries:
+            pipe.zadd(key, {entry_fingerprint(entry): now}, nx=True)
+        pipe.expire(key, self.ttl_seconds)
+
+        try:
+            results = pipe.execute()
+        except redis.RedisError as e:
+            # Without the index we cannot tell what is new; treat everything as new
+            logger.warning(f"Seen-entry index unavailable for {source}: {e}")
+            self.last_poll[source] = {'polled': len(entries), 'new': len(entries)}
+            return entries
+
+        added = results[1:-1]
+        new_entries = [entry for entry, was_added in zip(entries, added) if was_added]
+
+        self.last_poll[source] = {'polled': len(entries), 'new': len(new_entries)}
+        new_entries_counter.add(len(new_entries), {"source": source})
+
+        return new_entries
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return new-entries-per-poll for each source"""
+        return dict(self.last_poll)
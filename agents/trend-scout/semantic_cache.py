@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Semantic Cache Module for Trend Scout Agent
+Hashing-vectorizer embeddings in an in-memory LSH index, for near-duplicate LLM requests
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+from dedup import shingles
+
+logger = logging.getLogger(__name__)
+
+
+class HashingVectorizer:
+    """Stateless text embedding: signed feature hashing of unigrams and bigrams
+
+    No vocabulary to fit or persist; two texts that share most of their
+    content words land close in cosine distance regardless of word order.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def transform(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in shingles(text):
+            digest = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+            sign = 1.0 if digest & 1 else -1.0
+            # Bigrams carry phrasing; weight them below unigrams so rewording hurts less
+            vector[(digest >> 1) % self.dim] += sign * (0.5 if ' ' in token else 1.0)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """Approximate-match cache of LLM responses keyed by request text
+
+    Embeddings live in a fixed-size matrix; ``num_tables`` random-hyperplane
+    (SimHash) tables of ``bits`` bits each index them, so a lookup scores
+    only the handful of candidates sharing a bucket. A hit needs cosine
+    similarity of at least ``threshold`` and the same ``partition`` (e.g.
+    target platform). Entries expire after ``ttl_seconds`` and the least
+    recently used entry is evicted when full.
+    """
+
+    def __init__(self, name: str, capacity: int = 2048, threshold: float = 0.9,
+                 ttl_seconds: int = 6 * 3600, dim: int = 1024,
+                 num_tables: int = 16, bits: int = 8, seed: int = 7):
+        self.name = name
+        self.capacity = capacity
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.vectorizer = HashingVectorizer(dim)
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((num_tables, bits, dim)).astype(np.float32)
+        self._powers = 1 << np.arange(bits)
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in range(num_tables)]
+
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._lru: OrderedDict = OrderedDict()  # slot -> None, oldest first
+        self._free = list(range(capacity - 1, -1, -1))
+
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self.llm_seconds_saved = 0.0
+
+    def _buckets(self, vector: np.ndarray) -> List[int]:
+        # (tables, bits) sign pattern -> one integer bucket per table
+        signs = (self._planes @ vector) > 0
+        return (signs * self._powers).sum(axis=1).tolist()
+
+    def _remove(self, slot: int):
+        entry = self._entries.pop(slot)
+        for table, bucket in zip(self._tables, entry['buckets']):
+            members = table.get(bucket)
+            if members is not None:
+                members.discard(slot)
+                if not members:
+                    del table[bucket]
+        self._lru.pop(slot, None)
+        self._free.append(slot)
+
+    def lookup(self, text: str, partition: str = '') -> Optional[Tuple[Any, float]]:
+        """Cached value for the most similar stored request, with its similarity"""
+        self.lookups += 1
+        vector = self.vectorizer.transform(text)
+        if not vector.any():
+            return None
+
+        candidates: Set[int] = set()
+        for table, bucket in zip(self._tables, self._buckets(vector)):
+            candidates |= table.get(bucket, set())
+
+        now = time.time()
+        expired = [s for s in candidates if now - self._entries[s]['stored_at'] > self.ttl_seconds]
+        for slot in expired:
+            self._remove(slot)
+        candidates = [
+            s for s in candidates
+            if s in self._entries and self._entries[s]['partition'] == partition
+        ]
+        if not candidates:
+            return None
+
+        similarities = self._vectors[candidates] @ vector
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.threshold:
+            return None
+
+        slot = candidates[best]
+        entry = self._entries[slot]
+        self._lru.move_to_end(slot)
+        self.hits += 1
+        self.llm_seconds_saved += entry['llm_seconds']
+        return entry['value'], similarity
+
+    def store(self, text: str, value: Any, partition: str = '', llm_seconds: float = 0.0):
+        vector = self.vectorizer.transform(text)
+        if not vector.any():
+            return
+
+        if not self._free:
+            oldest = next(iter(self._lru))
+            self._remove(oldest)
+            self.evictions += 1
+
+        slot = self._free.pop()
+        buckets = self._buckets(vector)
+        self._vectors[slot] = vector
+        self._entries[slot] = {
+            'value': value,
+            'partition': partition,
+            'buckets': buckets,
+            'stored_at': time.time(),
+            'llm_seconds': llm_seconds
+        }
+        for table, bucket in zip(self._tables, buckets):
+            table.setdefault(bucket, set()).add(slot)
+        self._lru[slot] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'hit_rate': round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+            'evictions': self.evictions,
+            'llm_seconds_saved': round(self.llm_seconds_saved, 2),
+            'threshold': self.threshold
+        }
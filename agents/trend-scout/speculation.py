@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Speculation Module for Trend Scout Agent
+Background pre-generation of briefs for the fastest-rising stories
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Awaitable, Callable, Optional
+
+import redis
+
+from dedup import NearDuplicateClusterer, shingles
+from quota import DistributedQuota
+from ranking import TrendRanker
+from scheduler import IngestedItemStore
+from seen_index import entry_fingerprint
+from term_stats import BurstDetector
+
+logger = logging.getLogger(__name__)
+
+
+class BriefSpeculator:
+    """Keeps polished briefs ready for the stories most likely to be asked for
+
+    Stories are pooled in memory (``max_candidates``, oldest dropped first)
+    from everything the agent sees and, when an ``item_store`` is given, from
+    the items the polling scheduler ingested in the last ``window_seconds``.
+    Every observed item also feeds a ``BurstDetector``. Each
+    ``interval_seconds`` the pool is clustered, stories without a bursting
+    term are dropped, and the rest are ranked by burst, momentum, recency and
+    coverage; the top ``top_n`` without a fresh brief get one.
+
+    Briefs are stored in Redis for ``freshness_seconds`` under the
+    fingerprint of every entry in the story's cluster, per audience, so any
+    replica can serve them and a request that clusters the story differently
+    still finds it through any shared entry. Each generation debits
+    ``quota``, which is kept apart from the fetch quota so speculation never
+    starves RSS and Trends calls; a denied reservation ends the round.
+    """
+
+    def __init__(self, redis_client: redis.Redis, quota: DistributedQuota,
+                 deduplicator: NearDuplicateClusterer, audience: str,
+                 item_store: Optional[IngestedItemStore] = None,
+                 burst_detector: Optional[BurstDetector] = None,
+                 top_n: int = 3, freshness_seconds: int = 1800,
+                 interval_seconds: int = 300, window_seconds: int = 6 * 3600,
+                 max_candidates: int = 500, prefix: str = "speculative_brief"):
+        self.redis_client = redis_client
+        self.quota = quota
+        self.deduplicator = deduplicator
+        self.item_store = item_store
+        self.burst_detector = burst_detector or BurstDetector()
+        self.audience = audience
+        self.top_n = top_n
+        self.freshness_seconds = freshness_seconds
+        self.interval_seconds = interval_seconds
+        self.window_seconds = window_seconds
+        self.max_candidates = max_candidates
+        self.prefix = prefix
+
+        self._candidates: OrderedDict = OrderedDict()  # fingerprint -> item
+        self._task: Optional[asyncio.Task] = None
+
+        self.rounds = 0
+        self.not_rising = 0
+        self.generated = 0
+        self.generation_failures = 0
+        self.budget_denied = 0
+        self.hits = 0
+        self.misses = 0
+        self.llm_seconds = 0.0
+
+    def _keys(self, story: Dict[str, Any], audience: str) -> List[str]:
+        """One key per entry fingerprint in the story's cluster, sorted"""
+        audience_id = hashlib.sha1(audience.lower().encode('utf-8')).hexdigest()[:8]
+        fingerprints = story.get('cluster_fingerprints') or [entry_fingerprint(story)]
+        return [f"{self.prefix}:{fingerprint}:{audience_id}" for fingerprint in fingerprints]
+
+    def observe(self, items: List[Dict[str, Any]]):
+        """Add freshly seen stories to the candidate pool and burst counters"""
+        self.burst_detector.observe(items)
+        for item in items:
+            if not item.get('title'):
+                continue
+            fingerprint = entry_fingerprint(item)
+            self._candidates.pop(fingerprint, None)
+            self._candidates[fingerprint] = item
+        while len(self._candidates) > self.max_candidates:
+            self._candidates.popitem(last=False)
+
+    def lookup(self, story: Dict[str, Any], audience: str) -> Optional[Dict[str, Any]]:
+        """A fresh speculative brief for this story and audience, if one exists"""
+        data = next((d for d in self.redis_client.mget(self._keys(story, audience)) if d), None)
+        if not data:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry = json.loads(data)
+        return dict(entry['brief'], speculative={
+            'age_seconds': round(time.time() - entry['generated_at'], 1)
+        })
+
+    async def run_once(self, generate: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> int:
+        """One speculation round; returns the number of briefs generated"""
+        self.rounds += 1
+        if self.item_store is not None:
+            try:
+                self.observe(self.item_store.recent(self.window_seconds, limit=self.max_candidates))
+            except redis.RedisError as e:
+                logger.warning(f"Ingested items unavailable for speculation: {e}")
+        if not self._candidates:
+            return 0
+
+        # Only stories with a term mentioned well above its baseline are rising
+        now = time.time()
+        ranker = TrendRanker(k=self.top_n, burst_detector=self.burst_detector, now=now)
+        for story in self.deduplicator.cluster(list(self._candidates.values())):
+            if self.burst_detector.top_rising(k=1, candidates=shingles(story.get('title', '')), now=now):
+                ranker.push(story)
+            else:
+                self.not_rising += 1
+
+        generated = 0
+        for story in ranker.top():
+            keys = self._keys(story, self.audience)
+            if self.redis_client.exists(*keys):
+                continue
+            # Claim the story so other replicas don't generate it too
+            claim_key = f"{keys[0]}:claim"
+            if not self.redis_client.set(claim_key, '1', nx=True, ex=self.freshness_seconds):
+                continue
+
+            reservation = self.quota.reserve()
+            if not reservation.granted:
+                self.redis_client.delete(claim_key)
+                self.budget_denied += 1
+                logger.info(f"Speculation budget exhausted, retry in {reservation.retry_after:.0f}s")
+                break
+
+            started = time.perf_counter()
+            try:
+                brief = await generate(story)
+            except Exception as e:
+                self.redis_client.delete(claim_key)
+                self.generation_failures += 1
+                logger.warning(f"Speculative brief for '{story.get('title')}' failed: {e}")
+                continue
+            finally:
+                self.llm_seconds += time.perf_counter() - started
+
+            entry = json.dumps({'brief': brief, 'generated_at': time.time()}, default=str)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.setex(key, self.freshness_seconds, entry)
+            pipe.execute()
+            generated += 1
+
+        self.generated += generated
+        return generated
+
+    def ensure_started(self, generate: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        """Start the speculation loop on the running loop if it is not already running"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop(generate))
+
+    async def _loop(self, generate: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        while True:
+            try:
+                await self.run_once(generate)
+            except Exception as e:
+                logger.error(f"Speculation round failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'candidates': len(self._candidates),
+            'rounds': self.rounds,
+            'not_rising': self.not_rising,
+            'generated': self.generated,
+            'generation_failures': self.generation_failures,
+            'budget_denied': self.budget_denied,
+            'hits': self.hits,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'llm_seconds_spent': round(self.llm_seconds, 2),
+            'quota': self.quota.stats()
+        }
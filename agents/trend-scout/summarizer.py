@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Extractive Summarizer Module for Trend Scout Agent
+TF-IDF sentence graph with TextRank centrality, computed locally with numpy
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dedup import strip_tags, tokenize
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=["\'A-Z0-9])')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split plain or HTML text into sentences"""
+    text = _SPACE_RE.sub(' ', strip_tags(text or '')).strip()
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+
+
+def clip(text: str, max_chars: int) -> str:
+    """Shorten text to ``max_chars`` at a word boundary, marking the cut"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars - 3].rsplit(' ', 1)[0].rstrip(',;:-')
+    return cut + "..."
+
+
+class ExtractiveSummarizer:
+    """Picks the most central sentences of one or more documents
+
+    Sentences become L2-normalised TF-IDF rows; their cosine similarity
+    matrix is the edge weights of a graph ranked with PageRank (TextRank).
+    A small lead bonus favours opening sentences, which is where news
+    summaries put the point. Everything is a handful of matrix operations,
+    so a brief's worth of text is summarised in about a millisecond.
+    """
+
+    def __init__(self, damping: float = 0.85, iterations: int = 30,
+                 lead_bonus: float = 0.3, min_tokens: int = 4):
+        self.damping = damping
+        self.iterations = iterations
+        self.lead_bonus = lead_bonus
+        self.min_tokens = min_tokens
+
+    def _matrix(self, token_lists: List[List[str]]) -> Tuple[np.ndarray, Dict[str, int]]:
+        vocabulary: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+        counts = np.zeros((len(token_lists), len(vocabulary)))
+        np.add.at(counts, (rows, cols), 1.0)
+
+        document_freq = (counts > 0).sum(axis=0)
+        idf = np.log((1 + len(token_lists)) / (1 + document_freq)) + 1.0
+        tfidf = np.log1p(counts) * idf
+        norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+        return tfidf / np.where(norms == 0, 1.0, norms), vocabulary
+
+    def rank(self, sentences: List[str], positions: Optional[List[int]] = None) -> np.ndarray:
+        """Centrality score per sentence; ``positions`` is each sentence's index in its document"""
+        n = len(sentences)
+        if n == 0:
+            return np.zeros(0)
+        token_lists = [tokenize(s) for s in sentences]
+        if n == 1:
+            return np.ones(1)
+
+        tfidf, _ = self._matrix(token_lists)
+        similarity = tfidf @ tfidf.T
+        np.fill_diagonal(similarity, 0.0)
+
+        # Row-stochastic transitions; isolated sentences jump uniformly
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        transition = np.where(out_weight > 0, similarity / np.where(out_weight == 0, 1.0, out_weight), 1.0 / n)
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.iterations):
+            updated = (1 - self.damping) / n + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < 1e-6:
+                scores = updated
+                break
+            scores = updated
+
+        positions = np.asarray(positions if positions is not None else range(n), dtype=np.float64)
+        scores = scores * (1.0 + self.lead_bonus / (1.0 + positions))
+
+        # Fragments ("Read more.", bylines) rarely carry the point
+        lengths = np.array([len(t) for t in token_lists])
+        scores[lengths < self.min_tokens] *= 0.1
+        return scores
+
+    def summarize(self, texts: List[str], max_sentences: int = 2) -> List[str]:
+        """Top sentences across ``texts``, in score order, without repeats"""
+        sentences: List[str] = []
+        positions: List[int] = []
+        seen = set()
+        for text in texts:
+            for position, sentence in enumerate(split_sentences(text)):
+                if sentence.lower() in seen:
+                    continue
+                seen.add(sentence.lower())
+                sentences.append(sentence)
+                positions.append(position)
+
+        if not sentences:
+            return []
+
+        scores = self.rank(sentences, positions)
+        k = min(max_sentences, len(sentences))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [sentences[i] for i in top[np.argsort(-scores[top])]]
+
+    def key_sentence(self, text: str, max_chars: int = 83) -> str:
+        """Most central sentence of ``text``, clipped to ``max_chars``"""
+        best = self.summarize([text], max_sentences=1)
+        return clip(best[0], max_chars) if best else ''
+
+    def key_terms(self, texts: List[str], k: int = 5) -> List[str]:
+        """Highest-weighted TF-IDF unigrams across ``texts``"""
+        token_lists = [tokenize(t) for t in texts if t]
+        if not any(token_lists):
+            return []
+        tfidf, vocabulary = self._matrix(token_lists)
+        weights = tfidf.sum(axis=0)
+        terms = list(vocabulary)
+        k = min(k, len(terms))
+        top = np.argpartition(-weights, k - 1)[:k]
+        return [terms[i] for i in top[np.argsort(-weights[top])]]
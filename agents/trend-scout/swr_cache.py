@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Stale-While-Revalidate Cache Module for Trend Scout Agent
+Period-bucketed Redis cache that serves the last result while one replica refreshes
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Dict, Any, Awaitable, Callable, Optional, Set
+
+import redis
+from opentelemetry import metrics
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(__name__)
+
+swr_lookup_counter = meter.create_counter(
+    name="trend_swr_cache_lookups_total",
+    description="Stale-while-revalidate cache lookups by outcome",
+    unit="lookups"
+)
+swr_refresh_histogram = meter.create_histogram(
+    name="trend_swr_refresh_seconds",
+    description="Duration of cache refreshes",
+    unit="s"
+)
+
+# Delete the lock only if we still hold it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class StaleWhileRevalidateCache:
+    """Serves a period-bucketed value without a thundering herd at rollover
+
+    The latest value is stored once under ``{key}`` with the period bucket it
+    is valid for, and kept for ``stale_ttl`` seconds. Lookups then go:
+
+    - fresh (bucket is current): served; within ``refresh_ahead`` seconds of
+      the period ending, one replica starts computing the next bucket early
+    - stale (older bucket): served immediately while one replica, holding a
+      Redis lock, refreshes in the background
+    - missing: the lock holder computes inline; other callers wait for its
+      result (up to ``lock_ttl``) instead of computing their own
+    """
+
+    def __init__(self, redis_client: redis.Redis, key: str,
+                 period_seconds: int = 3600, stale_ttl: int = 6 * 3600,
+                 refresh_ahead: int = 120, lock_ttl: int = 120):
+        self.redis_client = redis_client
+        self.key = key
+        self.lock_key = f"{key}:lock"
+        self.period_seconds = period_seconds
+        self.stale_ttl = stale_ttl
+        self.refresh_ahead = refresh_ahead
+        self.lock_ttl = lock_ttl
+        self._release = redis_client.register_script(RELEASE_SCRIPT)
+
+        # Keep references so background refreshes aren't garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.outcomes = {'fresh': 0, 'stale': 0, 'miss': 0, 'waited': 0}
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.last_refresh_seconds = 0.0
+        self.total_refresh_seconds = 0.0
+
+    def _bucket(self, now: float) -> int:
+        return int(now // self.period_seconds)
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        data = self.redis_client.get(self.key)
+        return json.loads(data) if data else None
+
+    def _acquire(self) -> Optional[str]:
+        token = uuid.uuid4().hex
+        if self.redis_client.set(self.lock_key, token, nx=True, ex=self.lock_ttl):
+            return token
+        return None
+
+    async def _refresh(self, compute: Callable[[], Awaitable[Any]], bucket: int, token: str) -> Any:
+        started = time.perf_counter()
+        try:
+            value = await compute()
+            self.redis_client.setex(self.key, self.stale_ttl, json.dumps({
+                'bucket': bucket,
+                'computed_at': time.time(),
+                'value': value
+            }, default=str))
+            return value
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.refreshes += 1
+            self.last_refresh_seconds = elapsed
+            self.total_refresh_seconds += elapsed
+            swr_refresh_histogram.record(elapsed, {"key": self.key})
+            self._release(keys=[self.lock_key], args=[token])
+
+    def _refresh_in_background(self, compute: Callable[[], Awaitable[Any]], bucket: int):
+        token = self._acquire()
+        if token is None:
+            return  # another replica is already refreshing
+
+        async def run():
+            try:
+                await self._refresh(compute, bucket, token)
+            except Exception as e:
+                logger.error(f"Background refresh of {self.key} failed: {e}")
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _record(self, outcome: str):
+        self.outcomes[outcome] += 1
+        swr_lookup_counter.add(1, {"key": self.key, "outcome": outcome})
+
+    async def get(self, compute: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        """Return ``{'value', 'status', 'age_seconds'}``, computing only when needed"""
+        now = time.time()
+        bucket = self._bucket(now)
+        envelope = self._load()
+
+        if envelope is not None:
+            age = round(now - envelope['computed_at'], 1)
+            if envelope['bucket'] >= bucket:
+                # Refresh ahead of rollover so the next period starts warm
+                next_boundary = (bucket + 1) * self.period_seconds
+                if envelope['bucket'] == bucket and next_boundary - now <= self.refresh_ahead:
+                    self._refresh_in_background(compute, bucket + 1)
+                self._record('fresh')
+                return {'value': envelope['value'], 'status': 'fresh', 'age_seconds': age}
+
+            self._refresh_in_background(compute, bucket)
+            self._record('stale')
+            return {'value': envelope['value'], 'status': 'stale', 'age_seconds': age}
+
+        token = self._acquire()
+        if token is not None:
+            self._record('miss')
+            value = await self._refresh(compute, bucket, token)
+            return {'value': value, 'status': 'miss', 'age_seconds': 0.0}
+
+        # Someone else is computing; wait for their result rather than piling on
+        deadline = time.monotonic() + self.lock_ttl
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.25)
+            envelope = self._load()
+            if envelope is not None:
+                self._record('waited')
+                return {
+                    'value': envelope['value'],
+                    'status': 'waited',
+                    'age_seconds': round(time.time() - envelope['computed_at'], 1)
+                }
+            if not self.redis_client.exists(self.lock_key):
+                break  # holder gave up without a result
+
+        self._record('miss')
+        return {'value': await compute(), 'status': 'miss', 'age_seconds': 0.0}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.outcomes,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+            'last_refresh_seconds': round(self.last_refresh_seconds, 3),
+            'mean_refresh_seconds': round(self.total_refresh_seconds / self.refreshes, 3) if self.refreshes else 0.0,
+            'refreshes_in_flight': len(self._tasks)
+        }
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Term Statistics Module for Trend Scout Agent
+Time-decayed term/bigram counters with incremental burst scoring
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+from dedup import shingles
+from seen_index import entry_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class BurstDetector:
+    """Streaming burst detection over trend terms and bigrams
+
+    Every term keeps two exponentially decayed counters in flat arrays: a
+    short-window one (current rate) and a long-window one (baseline). The
+    burst score is the ratio of the two rates with additive smoothing, so a
+    term scores high when it is mentioned far more now than usual. Counters
+    are decayed lazily on update and at query time, which makes both
+    ``observe`` and ``top_rising`` proportional to the work actually done.
+    """
+
+    def __init__(self,
+                 short_half_life: float = 3600,
+                 long_half_life: float = 86400,
+                 min_support: float = 2.0,
+                 prior_per_day: float = 1.0,
+                 max_terms: int = 100000,
+                 seen_capacity: int = 50000):
+        self._decay_short = math.log(2) / short_half_life
+        self._decay_long = math.log(2) / long_half_life
+        self.min_support = min_support
+        self._prior_rate = prior_per_day / 86400
+        self.max_terms = max_terms
+
+        self._index: Dict[str, int] = {}
+        self._terms: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._short = np.zeros(1024)
+        self._long = np.zeros(1024)
+        self._updated = np.zeros(1024)
+
+        # Fingerprints of recently observed items, so re-polled items count once
+        self._seen: OrderedDict = OrderedDict()
+        self._seen_capacity = seen_capacity
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _grow(self):
+        size = len(self._short) * 2
+        for name in ('_short', '_long', '_updated'):
+            array = getattr(self, name)
+            grown = np.zeros(size)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _slot(self, term: str) -> int:
+        slot = self._index.get(term)
+        if slot is not None:
+            return slot
+
+        if self._free:
+            slot = self._free.pop()
+            self._terms[slot] = term
+        else:
+            slot = len(self._terms)
+            if slot >= len(self._short):
+                self._grow()
+            self._terms.append(term)
+
+        self._short[slot] = self._long[slot] = 0.0
+        self._updated[slot] = 0.0
+        self._index[term] = slot
+        return slot
+
+    def _is_new(self, item: Dict[str, Any]) -> bool:
+        fingerprint = entry_fingerprint(item)
+        if fingerprint in self._seen:
+            return False
+        self._seen[fingerprint] = True
+        if len(self._seen) > self._seen_capacity:
+            self._seen.popitem(last=False)
+        return True
+
+    def observe(self, items: List[Dict[str, Any]], now: Optional[float] = None) -> int:
+        """Fold newly arrived items into the counters; returns items counted"""
+        now = now or time.time()
+
+        terms: List[str] = []
+        counted = 0
+        for item in items:
+            if not self._is_new(item):
+                continue
+            counted += 1
+            terms.extend(shingles(f"{item.get('title', '')} {item.get('summary', '')}"))
+
+        if not terms:
+            return counted
+
+        # Make room before assigning slots; max_terms is a soft cap
+        if len(self._index) + len(terms) > self.max_terms:
+            self.prune(now)
+
+        slots, counts = np.unique([self._slot(t) for t in terms], return_counts=True)
+        elapsed = now - self._updated[slots]
+        self._short[slots] = self._short[slots] * np.exp(-self._decay_short * elapsed) + counts
+        self._long[slots] = self._long[slots] * np.exp(-self._decay_long * elapsed) + counts
+        self._updated[slots] = now
+
+        return counted
+
+    def _current(self, slots: np.ndarray, now: float) -> Tuple[np.ndarray, np.ndarray]:
+        elapsed = now - self._updated[slots]
+        short = self._short[slots] * np.exp(-self._decay_short * elapsed)
+        long = self._long[slots] * np.exp(-self._decay_long * elapsed)
+        return short, long
+
+    def top_rising(self, k: int = 10, candidates: Optional[Set[str]] = None,
+                   min_support: Optional[float] = None,
+                   now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Top-K terms by burst score, optionally restricted to ``candidates``"""
+        now = now or time.time()
+        min_support = self.min_support if min_support is None else min_support
+
+        if candidates is None:
+            slots = np.fromiter(self._index.values(), dtype=np.int64, count=len(self._index))
+        else:
+            slots = np.fromiter(
+                (self._index[t] for t in candidates if t in self._index), dtype=np.int64
+            )
+        if slots.size == 0:
+            return []
+
+        short, long = self._current(slots, now)
+        # Counter value ~ rate / decay constant, so multiply back to get rates
+        current_rate = short * self._decay_short
+        baseline_rate = long * self._decay_long
+        scores = (current_rate + self._prior_rate) / (baseline_rate + self._prior_rate)
+        scores[short < min_support] = 0.0
+
+        k = min(k, slots.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (self._terms[slots[i]], round(float(scores[i]), 3))
+            for i in top if scores[i] > 0
+        ]
+
+    def prune(self, now: float, floor: float = 0.5):
+        """Drop terms whose baseline has decayed away; evict the weakest if still full"""
+        if not self._index:
+            return
+
+        slots = np.fromiter(self._index.values(), dtype=np.int64, count=len(self._index))
+        _, long = self._current(slots, now)
+
+        stale = slots[long < floor]
+        if len(self._index) - stale.size >= self.max_terms:
+            # Still full: evict the weakest tenth of the baseline
+            stale = slots[np.argsort(long)[:max(stale.size, self.max_terms // 10)]]
+
+        for slot in stale.tolist():
+            del self._index[self._terms[slot]]
+            self._terms[slot] = None
+            self._free.append(slot)
+
+        logger.info(f"Pruned {stale.size} terms from burst detector, {len(self._index)} remain")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'terms_tracked': len(self._index),
+            'items_remembered': len(self._seen)
+        }
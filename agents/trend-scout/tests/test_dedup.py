@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from dedup import NearDuplicateClusterer, shingles, tokenize
+from seen_index import entry_fingerprint
+
+STORY = "OpenAI releases new reasoning model that beats benchmarks in math and coding tasks"
+
+
+def jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def estimate(clusterer, a, b):
+    return float(np.mean(clusterer.signature(a) == clusterer.signature(b)))
+
+
+def test_tokenize_drops_markup_stopwords_and_short_words():
+    assert tokenize("<p>The <b>GPU</b> shortage is over, says AI CEO</p>") == ['gpu', 'shortage', 'ceo']
+    assert shingles("GPU shortage ends") == {'gpu', 'shortage', 'ends', 'gpu shortage', 'shortage ends'}
+
+
+def test_signature_is_deterministic():
+    a = NearDuplicateClusterer(seed=7).signature(STORY)
+    b = NearDuplicateClusterer(seed=7).signature(STORY)
+
+    assert a.shape == (64,)
+    assert np.array_equal(a, b)
+    assert estimate(NearDuplicateClusterer(), STORY, STORY) == 1.0
+
+
+def test_similarity_tracks_jaccard():
+    clusterer = NearDuplicateClusterer(num_perm=512, bands=64)
+    pairs = [
+        (STORY, STORY.replace('coding', 'programming')),
+        (STORY, "OpenAI releases new reasoning model, tops math benchmarks"),
+        (STORY, "Federal Reserve holds interest rates steady amid inflation worries")
+    ]
+
+    for a, b in pairs:
+        assert estimate(clusterer, a, b) == pytest.approx(jaccard(a, b), abs=0.1)
+    assert estimate(clusterer, *pairs[2]) < 0.05
+
+
+def test_empty_text_signature():
+    clusterer = NearDuplicateClusterer()
+
+    assert (clusterer.signature("<br/> the and of") == clusterer.signature("")).all()
+
+
+def test_invalid_banding():
+    with pytest.raises(ValueError):
+        NearDuplicateClusterer(num_perm=64, bands=10)
+
+
+def test_cluster_collapses_near_duplicates():
+    items = [
+        {'title': STORY, 'summary': 'Reasoning model', 'source': 'techcrunch', 'link': 'https://a/1'},
+        {'title': STORY.replace('coding', 'programming'), 'summary': 'The new reasoning model',
+         'source': 'verge', 'link': 'https://b/2'},
+        {'title': STORY, 'summary': '', 'source': 'techcrunch', 'link': 'https://a/3'},
+        {'title': 'Federal Reserve holds interest rates steady amid inflation worries', 'source': 'reuters',
+         'link': 'https://c/4'}
+    ]
+
+    clusters = NearDuplicateClusterer().cluster(items)
+
+    assert len(clusters) == 2
+    story = next(c for c in clusters if c['cluster_size'] == 3)
+    assert story['link'] == 'https://b/2'
+    assert story['cluster_sources'] == ['techcrunch', 'verge']
+    assert story['cluster_fingerprints'] == sorted(entry_fingerprint(i) for i in items[:3])
+    other = next(c for c in clusters if c['cluster_size'] == 1)
+    assert other['cluster_fingerprints'] == [entry_fingerprint(items[3])]
+
+
+def test_items_without_text_stay_apart():
+    items = [{'title': '', 'link': 'https://a/1'}, {'title': 'the and', 'link': 'https://a/2'}]
+
+    clusters = NearDuplicateClusterer().cluster(items)
+
+    assert sorted(c['cluster_size'] for c in clusters) == [1, 1]
+
+
+def test_single_item():
+    item = {'title': STORY, 'source': 'verge', 'link': 'https://b/2'}
+
+    assert NearDuplicateClusterer().cluster([item]) == [
+        dict(item, cluster_size=1, cluster_sources=['verge'], cluster_fingerprints=[entry_fingerprint(item)])
+    ]
+    assert NearDuplicateClusterer().cluster([]) == []
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Keyword Planner Module for Trend Scout Agent
+Batches Google Trends keywords into anchored payloads and caches results per keyword
+"""
+
+import json
+import logging
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import redis
+
+from blocking_pool import BlockingStagePool
+from google_trends import MAX_PAYLOAD_KEYWORDS, fetch_anchored_batches
+from quota import DistributedQuota
+
+logger = logging.getLogger(__name__)
+
+# How long a keyword's interest stays fresh, by timeframe resolution.
+# Short windows move minute to minute; multi-month windows change daily.
+TIMEFRAME_TTLS = {
+    'now 1-H': 300,
+    'now 4-H': 600,
+    'now 1-d': 1800,
+    'now 7-d': 2 * 3600,
+    'today 1-m': 6 * 3600,
+    'today 3-m': 12 * 3600,
+    'today 12-m': 86400,
+    'today 5-y': 86400
+}
+DEFAULT_TTL = 3600
+
+KeywordInterest = Tuple[np.ndarray, np.ndarray, Optional[Dict[str, Any]]]
+
+
+class TrendsKeywordPlanner:
+    """Minimises upstream Google Trends calls for arbitrary keyword sets
+
+    Cached keywords are served from Redis (``trends_cache:{timeframe}:{keyword}``);
+    the rest are split into payloads of ``MAX_PAYLOAD_KEYWORDS - 1`` keywords
+    plus a shared ``anchor`` so every chunk is rescaled onto the same
+    scale. All chunks of a request run in one stage on the worker's shared
+    pytrends session, and quota is reserved once for exactly the calls made.
+    """
+
+    def __init__(self, redis_client: redis.Redis, stage_pool: BlockingStagePool,
+                 quota: Optional[DistributedQuota] = None, anchor: str = 'technology',
+                 stage_timeout: Optional[float] = None):
+        self.redis_client = redis_client
+        self.stage_pool = stage_pool
+        self.quota = quota
+        self.anchor = anchor
+        self.stage_timeout = stage_timeout
+
+        self.requests = 0
+        self.keywords_requested = 0
+        self.cache_hits = 0
+        self.upstream_calls = 0
+        self.calls_saved = 0
+        self.quota_denied = 0
+
+    def _key(self, keyword: str, timeframe: str) -> str:
+        return f"trends_cache:{timeframe}:{keyword.lower()}"
+
+    def plan(self, keywords: List[str]) -> List[List[str]]:
+        """Split keywords into valid payloads, each carrying the anchor"""
+        others = [k for k in keywords if k.lower() != self.anchor.lower()]
+        size = MAX_PAYLOAD_KEYWORDS - 1
+        chunks = [others[i:i + size] + [self.anchor] for i in range(0, len(others), size)]
+        if not chunks and keywords:
+            # Only the anchor itself was asked for
+            chunks = [[self.anchor]]
+        return chunks
+
+    def _load(self, keywords: List[str], timeframe: str,
+              include_related: bool) -> Dict[str, KeywordInterest]:
+        try:
+            raw = self.redis_client.mget([self._key(k, timeframe) for k in keywords])
+        except redis.RedisError as e:
+            logger.warning(f"Trends cache unavailable: {e}")
+            return {}
+
+        cached = {}
+        for keyword, data in zip(keywords, raw):
+            if not data:
+                continue
+            record = json.loads(data)
+            # Entries stored without related queries can't serve requests that need them
+            if include_related and record.get('related') is None:
+                continue
+            cached[keyword] = (
+                np.asarray(record['timestamps'], dtype=np.int64),
+                np.asarray(record['values'], dtype=np.float32),
+                record.get('related')
+            )
+        return cached
+
+    def _store(self, results: Dict[str, KeywordInterest], timeframe: str):
+        ttl = TIMEFRAME_TTLS.get(timeframe, DEFAULT_TTL)
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for keyword, (timestamps, values, related) in results.items():
+                pipe.setex(self._key(keyword, timeframe), ttl, json.dumps({
+                    'timestamps': timestamps.tolist(),
+                    'values': [round(v, 3) for v in values.tolist()],
+                    'related': related,
+                    'anchor': self.anchor,
+                    'fetched_at': time.time()
+                }))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Failed to cache trends results: {e}")
+
+    async def fetch(self, keywords: List[str], timeframe: str = 'now 1-d',
+                    include_related: bool = False, source: Optional[str] = None,
+                    source_budget: Optional[int] = None) -> Dict[str, KeywordInterest]:
+        """Interest series for each keyword as ``{keyword: (timestamps, values, related)}``
+
+        Keywords missing from the result had no data upstream, or could not
+        be fetched because the quota was exhausted.
+        """
+        # Case-insensitive dedup, keeping the caller's spelling and order
+        deduped: Dict[str, str] = {}
+        for keyword in keywords:
+            deduped.setdefault(keyword.lower(), keyword)
+        unique = list(deduped.values())
+        self.requests += 1
+        self.keywords_requested += len(unique)
+
+        results = self._load(unique, timeframe, include_related)
+        self.cache_hits += len(results)
+
+        missing = [k for k in unique if k not in results]
+        if not missing:
+            self.calls_saved += -(-len(unique) // MAX_PAYLOAD_KEYWORDS)
+            return results
+
+        chunks = self.plan(missing)
+        if self.quota is not None:
+            reservation = self.quota.reserve(source, source_budget, cost=len(chunks))
+            if not reservation.granted:
+                self.quota_denied += 1
+                logger.warning(
+                    f"API quota exceeded for {source or 'Google Trends'} ({reservation.scope}), "
+                    f"serving {len(results)}/{len(unique)} keywords from cache"
+                )
+                return results
+
+        fetched = await self.stage_pool.run(
+            fetch_anchored_batches,
+            chunks,
+            timeframe,
+            self.anchor,
+            include_related,
+            timeout=self.stage_timeout
+        )
+        self.upstream_calls += len(chunks)
+        self.calls_saved += max(0, -(-len(unique) // MAX_PAYLOAD_KEYWORDS) - len(chunks))
+
+        # The anchor rides along in every chunk; only keep it if it was asked
+        # for, under the caller's spelling
+        fetched = {deduped[k.lower()]: v for k, v in fetched.items() if k.lower() in deduped}
+        self._store(fetched, timeframe)
+
+        results.update(fetched)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'keywords_requested': self.keywords_requested,
+            'cache_hits': self.cache_hits,
+            'cache_hit_ratio': round(self.cache_hits / self.keywords_requested, 3) if self.keywords_requested else 0.0,
+            'upstream_calls': self.upstream_calls,
+            'calls_saved': self.calls_saved,
+            'quota_denied': self.quota_denied,
+            'anchor': self.anchor
+        }
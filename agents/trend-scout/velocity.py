@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Trend Velocity Module for Trend Scout Agent
+Per-keyword interest ring buffers persisted to Redis, with vectorized momentum
+"""
+
+import logging
+import struct
+import warnings
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Header: capacity, number of points stored
+_HEADER = struct.Struct('<II')
+
+
+class KeywordSeries:
+    """Fixed-capacity ring buffer of (timestamp, interest) points"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity, dtype=np.float32)
+        self.head = 0  # next write position
+        self.size = 0
+
+    @property
+    def last_timestamp(self) -> int:
+        return int(self.timestamps[(self.head - 1) % self.capacity]) if self.size else 0
+
+    def append(self, timestamps: np.ndarray, values: np.ndarray) -> int:
+        """Append points newer than the last stored one; returns points added"""
+        newer = timestamps > self.last_timestamp
+        timestamps, values = timestamps[newer][-self.capacity:], values[newer][-self.capacity:]
+        count = len(timestamps)
+        if not count:
+            return 0
+
+        positions = (self.head + np.arange(count)) % self.capacity
+        self.timestamps[positions] = timestamps
+        self.values[positions] = values
+        self.head = (self.head + count) % self.capacity
+        self.size = min(self.capacity, self.size + count)
+        return count
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Points in chronological order"""
+        if self.size < self.capacity:
+            return self.timestamps[:self.size], self.values[:self.size]
+        order = np.roll(np.arange(self.capacity), -self.head)
+        return self.timestamps[order], self.values[order]
+
+    def to_bytes(self) -> bytes:
+        timestamps, values = self.ordered()
+        return _HEADER.pack(self.capacity, self.size) + timestamps.tobytes() + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int) -> 'KeywordSeries':
+        stored_capacity, size = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        timestamps = np.frombuffer(data, dtype=np.int64, count=size, offset=offset)
+        values = np.frombuffer(data, dtype=np.float32, count=size, offset=offset + size * 8)
+
+        series = cls(capacity)
+        series.append(timestamps, values)
+        return series
+
+
+class KeywordSeriesStore:
+    """Interest history per (timeframe, keyword), stored in Redis as packed arrays
+
+    Series are kept in binary form (int64 timestamps + float32 values) under
+    ``trend_series:{timeframe}:{keyword}`` and read/written with one pipelined
+    round trip per batch of keywords. Values are anchor-rescaled interest,
+    clipped to 0-100. Appends are optimistic transactions (WATCH/MULTI), so
+    replicas recording the same keywords concurrently never drop points.
+    """
+
+    def __init__(self, redis_client: redis.Redis, capacity: int = 336,
+                 ttl_seconds: int = 30 * 86400):
+        # Series are binary: redis_client must be created with decode_responses=False
+        self.redis_client = redis_client
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, keyword: str, timeframe: str) -> str:
+        return f"trend_series:{timeframe}:{keyword.lower()}"
+
+    def load(self, keywords: List[str], timeframe: str) -> Dict[str, KeywordSeries]:
+        if not keywords:
+            return {}
+        return self._decode(keywords, self.redis_client.mget([self._key(k, timeframe) for k in keywords]))
+
+    def _decode(self, keywords: List[str], raw: List[Optional[bytes]]) -> Dict[str, KeywordSeries]:
+        return {
+            keyword: KeywordSeries.from_bytes(data, self.capacity) if data else KeywordSeries(self.capacity)
+            for keyword, data in zip(keywords, raw)
+        }
+
+    def record(self, timeframe: str,
+               points: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Dict[str, KeywordSeries]:
+        """Append freshly fetched ``{keyword: (timestamps, values)}`` and persist the series"""
+        if not points:
+            return {}
+        keywords = list(points)
+        keys = [self._key(k, timeframe) for k in keywords]
+
+        def append(pipe: redis.client.Pipeline) -> Dict[str, KeywordSeries]:
+            # Read under WATCH; a concurrent write makes EXEC fail and this rerun
+            series = self._decode(keywords, pipe.mget(keys))
+            pipe.multi()
+            for keyword, key in zip(keywords, keys):
+                timestamps, values = points[keyword]
+                if series[keyword].append(timestamps, values):
+                    pipe.setex(key, self.ttl_seconds, series[keyword].to_bytes())
+            return series
+
+        return self.redis_client.transaction(append, *keys, value_from_callable=True)
+
+    def momentum(self, keywords: List[str], timeframe: str,
+                 series: Optional[Dict[str, KeywordSeries]] = None,
+                 window: int = 6) -> Dict[str, Dict[str, float]]:
+        """Growth rate, acceleration, z-score and combined momentum per keyword"""
+        series = series if series is not None else self.load(keywords, timeframe)
+        return compute_momentum({k: series[k].ordered()[1] for k in keywords if k in series}, window)
+
+
+def compute_momentum(histories: Dict[str, np.ndarray], window: int = 6) -> Dict[str, Dict[str, float]]:
+    """Vectorized momentum statistics over a batch of interest histories
+
+    Histories are right-aligned into one NaN-padded matrix so every statistic
+    is computed for all keywords at once:
+
+    - growth_rate: mean of the last ``window`` points vs the window before
+    - acceleration: change in mean first difference between those windows,
+      normalised by the earlier level
+    - z_score: latest point against the rest of the history
+    - momentum: growth_rate + 0.25 * z_score + acceleration
+    """
+    keywords = [k for k, h in histories.items() if len(h)]
+    if not keywords:
+        return {}
+
+    length = max(2 * window + 1, max(len(histories[k]) for k in keywords))
+    matrix = np.full((len(keywords), length), np.nan, dtype=np.float64)
+    for row, keyword in enumerate(keywords):
+        history = histories[keyword][-length:]
+        matrix[row, length - len(history):] = history
+
+    with warnings.catch_warnings():
+        # All-NaN windows for short histories are expected and yield NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+
+        recent = np.nanmean(matrix[:, -window:], axis=1)
+        previous = np.nanmean(matrix[:, -2 * window:-window], axis=1)
+        growth_rate = (recent - previous) / (previous + 1.0)
+
+        deltas = np.diff(matrix, axis=1)
+        velocity_recent = np.nanmean(deltas[:, -window:], axis=1)
+        velocity_previous = np.nanmean(deltas[:, -2 * window:-window], axis=1)
+        acceleration = (velocity_recent - velocity_previous) / (previous + 1.0)
+
+        history = matrix[:, :-1]
+        z_score = (matrix[:, -1] - np.nanmean(history, axis=1)) / (np.nanstd(history, axis=1) + 1e-6)
+
+    growth_rate, acceleration, z_score = (
+        np.nan_to_num(a, nan=0.0, posinf=0.0, neginf=0.0)
+        for a in (growth_rate, acceleration, z_score)
+    )
+    momentum = growth_rate + 0.25 * z_score + acceleration
+
+    return {
+        keyword: {
+            'latest': float(np.nan_to_num(matrix[row, -1])),
+            'growth_rate': round(float(growth_rate[row]), 4),
+            'acceleration': round(float(acceleration[row]), 4),
+            'z_score': round(float(z_score[row]), 4),
+            'momentum': round(float(momentum[row]), 4)
+        }
+        for row, keyword in enumerate(keywords)
+    }
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Virality Model Module for Trend Scout Agent
+Online linear scorer for content ideas, used as the cheap first tier before Claude
+"""
+
+import logging
+import re
+import time
+from typing import Dict, Any, Optional
+
+import numpy as np
+import redis
+
+from semantic_cache import HashingVectorizer
+
+logger = logging.getLogger(__name__)
+
+PLATFORMS = ['general', 'linkedin', 'twitter', 'tiktok', 'instagram', 'youtube']
+
+# Patterns the editorial team has seen move engagement in tech/security content
+_PATTERNS = [
+    re.compile(r'\bhow (to|you)\b'),
+    re.compile(r'\b(protect|secure|defend|stop)\b'),
+    re.compile(r'\b(breach|leak|hack|hacked|ransomware|zero.day|exploit)\b'),
+    re.compile(r'\b(myth|mistake|wrong|truth)\b'),
+    re.compile(r'\b(ai|llm|gpt|agent)s?\b'),
+    re.compile(r'\d'),
+    re.compile(r'\?')
+]
+
+
+class ViralityModel:
+    """Predicts a 0-100 virality score from an idea's text and platform
+
+    Features are hashed unigrams/bigrams plus a few structural signals and
+    a platform one-hot. Weights are learned online with AdaGrad on squared
+    error against a sigmoid output, from two kinds of labels: Claude's
+    scores for escalated ideas (down-weighted) and observed outcomes, which
+    are counted separately in ``outcome_samples``.
+
+    Replicas share one model in Redis hashes (``{prefix}:weights``,
+    ``{prefix}:grad_sq``, ``{prefix}:meta``). Each ``save`` adds this
+    replica's weight and AdaGrad deltas since the last sync with
+    HINCRBYFLOAT, so concurrent updates from every replica are merged
+    rather than overwritten, and then reads back the merged model.
+    """
+
+    def __init__(self, redis_client: redis.Redis, prefix: str = "virality_model",
+                 dim: int = 1024, learning_rate: float = 0.1, save_every: int = 20):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.vectorizer = HashingVectorizer(dim)
+        self.learning_rate = learning_rate
+        self.save_every = save_every
+
+        self.size = dim + len(_PATTERNS) + 1 + len(PLATFORMS) + 1  # + length, platforms, bias
+        self.weights = np.zeros(self.size)
+        self._grad_sq = np.full(self.size, 1e-8)
+        self.samples = 0
+        self.outcome_samples = 0
+        self._unsaved = 0
+        self._unsaved_outcomes = 0
+        # Model as last synced with Redis; save() pushes the difference
+        self._synced_weights = self.weights.copy()
+        self._synced_grad_sq = self._grad_sq.copy()
+        self.load()
+
+    def features(self, text: str, platform: str = 'general') -> np.ndarray:
+        lowered = text.lower()
+        platform_onehot = np.zeros(len(PLATFORMS))
+        platform_onehot[PLATFORMS.index(platform) if platform in PLATFORMS else 0] = 1.0
+        return np.concatenate([
+            self.vectorizer.transform(text),
+            [1.0 if p.search(lowered) else 0.0 for p in _PATTERNS],
+            [min(len(text), 2000) / 2000],
+            platform_onehot,
+            [1.0]
+        ])
+
+    def predict(self, text: str, platform: str = 'general') -> float:
+        """Virality score in [0, 100]"""
+        z = float(self.features(text, platform) @ self.weights)
+        return float(100.0 / (1.0 + np.exp(-z)))
+
+    def update(self, text: str, platform: str, score: float, weight: float = 1.0,
+               outcome: bool = False):
+        """One AdaGrad step towards an observed (``outcome``) or teacher score"""
+        x = self.features(text, platform)
+        p = 1.0 / (1.0 + np.exp(-float(x @ self.weights)))
+        target = min(max(score, 0.0), 100.0) / 100.0
+
+        gradient = weight * (p - target) * p * (1 - p) * x
+        self._grad_sq += gradient ** 2
+        self.weights -= self.learning_rate * gradient / np.sqrt(self._grad_sq)
+        self.samples += 1
+        if outcome:
+            self.outcome_samples += 1
+            self._unsaved_outcomes += 1
+
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def load(self):
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hgetall(f"{self.prefix}:meta")
+            pipe.hgetall(f"{self.prefix}:weights")
+            pipe.hgetall(f"{self.prefix}:grad_sq")
+            meta, weights, grad_sq = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not load virality model: {e}")
+            return
+        self._apply(meta, weights, grad_sq)
+
+    def _apply(self, meta: Dict[str, str], weights: Dict[str, str], grad_sq: Dict[str, str]):
+        if not meta:
+            return
+        if int(meta.get('size', 0)) != self.size:
+            logger.warning("Stored virality model has a different feature layout, starting fresh")
+            return
+        self.weights = np.zeros(self.size)
+        self._grad_sq = np.full(self.size, 1e-8)
+        for index, value in weights.items():
+            self.weights[int(index)] = float(value)
+        for index, value in grad_sq.items():
+            self._grad_sq[int(index)] += float(value)
+        self.samples = int(meta.get('samples', 0))
+        self.outcome_samples = int(meta.get('outcome_samples', 0))
+        self._synced_weights = self.weights.copy()
+        self._synced_grad_sq = self._grad_sq.copy()
+
+    def save(self):
+        """Merge this replica's updates into the shared model and pull the result"""
+        weight_delta = self.weights - self._synced_weights
+        grad_delta = self._grad_sq - self._synced_grad_sq
+        changed = np.flatnonzero((weight_delta != 0) | (grad_delta != 0))
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for index in changed:
+                pipe.hincrbyfloat(f"{self.prefix}:weights", int(index), float(weight_delta[index]))
+                pipe.hincrbyfloat(f"{self.prefix}:grad_sq", int(index), float(grad_delta[index]))
+            pipe.hset(f"{self.prefix}:meta", mapping={'size': self.size, 'saved_at': time.time()})
+            pipe.hincrby(f"{self.prefix}:meta", 'samples', self._unsaved)
+            pipe.hincrby(f"{self.prefix}:meta", 'outcome_samples', self._unsaved_outcomes)
+            pipe.hgetall(f"{self.prefix}:meta")
+            pipe.hgetall(f"{self.prefix}:weights")
+            pipe.hgetall(f"{self.prefix}:grad_sq")
+            meta, weights, grad_sq = pipe.execute()[-3:]
+        except redis.RedisError as e:
+            logger.warning(f"Could not save virality model: {e}")
+            return
+        self._unsaved = 0
+        self._unsaved_outcomes = 0
+        self._apply(meta, weights, grad_sq)
+
+
+class ViralityCascade:
+    """Routes each idea to the local model or to the LLM tier
+
+    An idea is answered locally only when the model has learned from at
+    least ``min_samples`` observed outcomes and its score falls below
+    ``threshold - band``; contenders (inside the uncertainty band or above
+    the threshold) go to the LLM. Escalated results are fed back as teacher
+    labels and used to measure agreement between the tiers, but never count
+    towards warming the model up.
+    """
+
+    def __init__(self, model: ViralityModel, threshold: float = 50.0,
+                 band: float = 15.0, min_samples: int = 50, teacher_weight: float = 0.5):
+        self.model = model
+        self.threshold = threshold
+        self.band = band
+        self.min_samples = min_samples
+        self.teacher_weight = teacher_weight
+
+        self.decisions = 0
+        self.escalations = 0
+        self.comparisons = 0
+        self.agreements = 0
+        self.abs_error = 0.0
+        self.local_seconds = 0.0
+        self.llm_seconds = 0.0
+        self.llm_calls = 0  # escalations actually timed (semantic-cache hits aren't)
+
+    def score(self, text: str, platform: str) -> Dict[str, Any]:
+        """Local score and routing decision for one idea"""
+        started = time.perf_counter()
+        local_score = self.model.predict(text, platform)
+        self.local_seconds += time.perf_counter() - started
+        self.decisions += 1
+
+        warm = self.model.outcome_samples >= self.min_samples
+        escalate = not warm or local_score >= self.threshold - self.band
+        if escalate:
+            self.escalations += 1
+        return {'local_score': round(local_score, 1), 'escalate': escalate, 'model_warm': warm}
+
+    def record_llm(self, text: str, platform: str, local_score: float,
+                   llm_score: Optional[float], llm_seconds: float):
+        """Learn from the LLM's score and track how often the tiers agree"""
+        self.llm_seconds += llm_seconds
+        self.llm_calls += 1
+        if llm_score is None:
+            return
+        self.comparisons += 1
+        self.abs_error += abs(local_score - llm_score)
+        if (local_score >= self.threshold) == (llm_score >= self.threshold):
+            self.agreements += 1
+        self.model.update(text, platform, llm_score, weight=self.teacher_weight)
+
+    def record_outcome(self, text: str, platform: str, observed_score: float):
+        self.model.update(text, platform, observed_score, outcome=True)
+
+    def stats(self) -> Dict[str, Any]:
+        local_only = self.decisions - self.escalations
+        return {
+            'decisions': self.decisions,
+            'escalation_rate': round(self.escalations / self.decisions, 3) if self.decisions else 0.0,
+            'tier_agreement': round(self.agreements / self.comparisons, 3) if self.comparisons else None,
+            'mean_abs_error': round(self.abs_error / self.comparisons, 2) if self.comparisons else None,
+            'local_latency_us': round(self.local_seconds / self.decisions * 1e6, 1) if self.decisions else 0.0,
+            'llm_latency_ms': round(self.llm_seconds / self.llm_calls * 1000, 1) if self.llm_calls else 0.0,
+            'local_only': local_only,
+            'model_samples': self.model.samples,
+            'outcome_samples': self.model.outcome_samples
+        }
@@ -8,10 +8,12 @@ import asyncio
 import json
 import logging
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 
 import aiohttp
+import numpy as np
 import redis
 from opentelemetry import trace
 from opentelemetry.exporter.jaeger import JaegerExporter
@@ -20,6 +22,12 @@ from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from pydantic import BaseModel, Field, validator
 from bs4 import BeautifulSoup
 
+from alternative_index import RoyaltyFreeIndex
+from audio_features import AudioFeatureExtractor
+from chart_snapshot import ChartRows, ChartSnapshot
+from rights_cache import RightsCache
+from scoring import DEFAULT_WEIGHTS, CandidateColumns, score_contexts, top_k
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,6 +54,13 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+# Binary-safe connection for columnar chart snapshots
+binary_redis_client = redis.Redis(
+    host=os.getenv('REDIS_HOST', 'redis-cluster.grayghostai'),
+    port=int(os.getenv('REDIS_PORT', '6379')),
+    password=os.getenv('REDIS_PASSWORD')
+)
+
 class TrendingAudio(BaseModel):
     """Trending audio track information"""
     audio_id: str
@@ -58,6 +73,8 @@ class TrendingAudio(BaseModel):
     duration_seconds: int
     genre: Optional[str] = None
     mood: Optional[str] = None
+    preview_url: Optional[str] = None
+    features: Optional[Dict[str, Any]] = None  # tempo, energy, spectral, chroma, embedding
     discovered_at: datetime = Field(default_factory=datetime.utcnow)
 
 class AudioRights(BaseModel):
@@ -77,6 +94,7 @@ class AudioRecommendation(BaseModel):
     match_score: float = Field(..., ge=0.0, le=1.0)
     reasoning: str
     fallback_options: List[Dict[str, Any]] = Field(default_factory=list)
+    verification: Dict[str, Any] = Field(default_factory=dict)
 
 class TrendingAudioAgent:
     """Agent for discovering and verifying trending audio"""
@@ -94,21 +112,74 @@ class TrendingAudioAgent:
             'youtube_audio_library': 'https://www.youtube.com/audiolibrary'
         }
         
+        # Local royalty-free catalog index, if one has been built
+        self.alternative_index_dir = os.getenv(
+            'AUDIO_RF_INDEX_DIR',
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'royalty_free_index')
+        )
+        self.alternative_index: Optional[RoyaltyFreeIndex] = None
+        if os.path.exists(os.path.join(self.alternative_index_dir, 'meta.json')):
+            self.alternative_index = RoyaltyFreeIndex(self.alternative_index_dir)
+        
+        # Audio previews are analysed once per distinct file, off the event loop
+        self.feature_extractor = AudioFeatureExtractor(
+            redis_client,
+            max_workers=int(os.getenv('AUDIO_FEATURE_WORKERS', '2'))
+        )
+        
         # Cache configuration
         self.cache_ttl = int(os.getenv('AUDIO_CACHE_TTL', '3600'))  # 1 hour
         
+        # Rights verdicts are read and written in bulk
+        self.rights_cache = RightsCache(
+            redis_client,
+            ttl_seconds=int(os.getenv('AUDIO_RIGHTS_TTL', str(7 * 86400))),
+            negative_ttl=int(os.getenv('AUDIO_RIGHTS_NEGATIVE_TTL', '3600'))
+        )
+        
+        # Rights verification concurrency and latency limits
+        self.rights_concurrency = int(os.getenv('AUDIO_RIGHTS_CONCURRENCY', '10'))
+        self.check_timeout = float(os.getenv('AUDIO_CHECK_TIMEOUT', '3.0'))
+        self.recommend_budget = float(os.getenv('AUDIO_RECOMMEND_BUDGET', '2.0'))
+        
+        # Scoring weights for mood, trend, rights and feature match
+        self.score_weights = json.loads(os.getenv('AUDIO_SCORE_WEIGHTS', '{}'))
+        self._rights_semaphore = asyncio.Semaphore(self.rights_concurrency)
+        
+        # Verifications still running after a recommendation's budget ran out;
+        # they finish in the background and land in the cache
+        self._background_checks: set = set()
+        
+        # New chart entries are verified in the background as charts update
+        self._prewarm_queue: asyncio.Queue = asyncio.Queue()
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self.prewarm_stats = {'snapshots': 0, 'new_entries': 0, 'checked': 0, 'already_cached': 0}
+        
     @tracer.start_as_current_span("scrape_trending_audio")
     async def scrape_trending_audio(self, platform: str = 'tiktok', limit: int = 200) -> List[TrendingAudio]:
         """Scrape trending audio from platform"""
+        snapshot = await self.chart_snapshot(platform, limit)
+        return snapshot.rows()
+    
+    @tracer.start_as_current_span("chart_snapshot")
+    async def chart_snapshot(self, platform: str = 'tiktok', limit: int = 200) -> ChartSnapshot:
+        """Current chart for a platform as a columnar snapshot
+        
+        Charts are cached as one binary struct-of-arrays value; a cache hit
+        parses only the snapshot header, and ``TrendingAudio`` models are
+        built just for the rows a caller reads.
+        """
         logger.info(f"Scraping trending audio from {platform}")
         
         # Check cache first
-        cache_key = f"trending_audio:{platform}:{datetime.utcnow().strftime('%Y%m%d%H')}"
-        cached_data = redis_client.get(cache_key)
+        cache_key = f"trending_audio:{platform}:{datetime.utcnow().strftime('%Y%m%d%H')}:cols"
+        cached_data = binary_redis_client.get(cache_key)
         
         if cached_data:
             logger.info("Using cached trending audio data")
-            return [TrendingAudio(**item) for item in json.loads(cached_data)]
+            snapshot = ChartSnapshot(cached_data, TrendingAudio)
+            trace.get_current_span().set_attribute('chart.snapshot_bytes', snapshot.nbytes)
+            return snapshot
         
         # Scrape based on platform
         if platform == 'tiktok':
@@ -118,15 +189,68 @@ class TrendingAudioAgent:
         else:
             audio_list = await self._scrape_youtube_audio(limit)
         
+        await self._attach_features(audio_list)
+        snapshot = ChartSnapshot.from_models(audio_list, TrendingAudio)
+        
         # Cache results
         if audio_list:
-            redis_client.setex(
-                cache_key,
-                self.cache_ttl,
-                json.dumps([a.dict() for a in audio_list], default=str)
-            )
+            binary_redis_client.setex(cache_key, self.cache_ttl, snapshot.data)
+            self._queue_prewarm(platform, audio_list)
         
-        return audio_list
+        return snapshot
+    
+    async def _attach_features(self, audio_list: List[TrendingAudio]):
+        """Analyse preview audio and record features and true duration on each track"""
+        tracks = [(a.audio_id, a.preview_url) for a in audio_list if a.preview_url]
+        if not tracks:
+            return
+        try:
+            features = await self.feature_extractor.analyze(tracks)
+        except Exception as e:
+            logger.error(f"Audio feature extraction failed: {e}")
+            return
+        for audio in audio_list:
+            if audio.audio_id in features:
+                audio.features = features[audio.audio_id]
+                if audio.features['duration_seconds'] >= 1:
+                    audio.duration_seconds = int(round(audio.features['duration_seconds']))
+    
+    def _queue_prewarm(self, platform: str, audio_list: List[TrendingAudio]):
+        """Diff a new chart snapshot against the previous one and queue new entries"""
+        snapshot_key = f"trending_audio:{platform}:snapshot_ids"
+        ids = [a.audio_id for a in audio_list]
+        
+        # Swap in the new ID list atomically so concurrent scrapes each see
+        # the snapshot they replaced
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.get(snapshot_key)
+        pipe.setex(snapshot_key, timedelta(days=2), json.dumps(ids))
+        previous_data, _ = pipe.execute()
+        
+        previous = set(json.loads(previous_data)) if previous_data else set()
+        new_entries = [a for a in audio_list if a.audio_id not in previous]
+        self.prewarm_stats['snapshots'] += 1
+        if not new_entries:
+            return
+        
+        self.prewarm_stats['new_entries'] += len(new_entries)
+        logger.info(f"{len(new_entries)} new {platform} chart entries queued for rights pre-warming")
+        self._prewarm_queue.put_nowait(new_entries)
+        if self._prewarm_task is None or self._prewarm_task.done():
+            self._prewarm_task = asyncio.get_running_loop().create_task(self._prewarm_worker())
+    
+    async def _prewarm_worker(self):
+        """Verify queued chart entries so recommendations find their rights cached"""
+        while True:
+            entries = await self._prewarm_queue.get()
+            try:
+                _, stats = await self.verify_many(entries)
+                self.prewarm_stats['checked'] += stats['checked']
+                self.prewarm_stats['already_cached'] += stats['cached']
+            except Exception as e:
+                logger.error(f"Rights pre-warming failed: {e}")
+            finally:
+                self._prewarm_queue.task_done()
     
     async def _scrape_tiktok_sounds(self, limit: int) -> List[TrendingAudio]:
         """Scrape TikTok trending sounds"""
@@ -188,14 +312,81 @@ class TrendingAudioAgent:
     @tracer.start_as_current_span("verify_audio_rights")
     async def verify_audio_rights(self, audio: TrendingAudio) -> AudioRights:
         """Verify commercial usage rights for audio"""
-        logger.info(f"Verifying rights for audio: {audio.title}")
-        
-        # Check cache
-        cache_key = f"audio_rights:{audio.audio_id}"
-        cached_rights = redis_client.get(cache_key)
+        rights, _ = await self.verify_many([audio])
+        return rights[audio.audio_id]
+    
+    async def verify_many(self, tracks: Sequence[TrendingAudio], budget: Optional[float] = None,
+                          audio_ids: Optional[List[str]] = None) -> Tuple[Dict[str, AudioRights], Dict[str, Any]]:
+        """Rights for many tracks: one cache read, concurrent checks, one cache write
+        
+        With a ``budget`` (seconds), tracks still being checked when it runs
+        out are left out of the result; their checks finish in the background
+        and are cached together afterwards. ``tracks`` may be a lazy sequence
+        such as ``ChartRows``: given its ``audio_ids``, only tracks missing
+        from the cache are read from it.
+        """
+        round_trips = self.rights_cache.round_trips
+        if audio_ids is None:
+            audio_ids = [audio.audio_id for audio in tracks]
+        first_index: Dict[str, int] = {}
+        for index, audio_id in enumerate(audio_ids):
+            first_index.setdefault(audio_id, index)
+        
+        cached = self.rights_cache.get_many(list(first_index))
+        rights = {audio_id: AudioRights(**entry) for audio_id, entry in cached.items()}
+        
+        tasks = {
+            asyncio.ensure_future(self._check_bounded(tracks[index])): audio_id
+            for audio_id, index in first_index.items() if audio_id not in rights
+        }
+        done, pending = await asyncio.wait(tasks, timeout=budget) if tasks else (set(), set())
+        
+        verdicts = []
+        for task in done:
+            if task.exception() is not None:
+                logger.error(f"Rights verification failed for {tasks[task]}: {task.exception()}")
+                continue
+            result, negative = task.result()
+            rights[result.audio_id] = result
+            if negative is not None:
+                verdicts.append((result.dict(), negative))
+        self.rights_cache.put_many(verdicts)
+        
+        if pending:
+            background = asyncio.ensure_future(self._cache_when_done(pending))
+            self._background_checks.add(background)
+            background.add_done_callback(self._background_checks.discard)
+        
+        stats = {
+            'candidates': len(first_index),
+            'cached': len(cached),
+            'checked': len(done),
+            'pending': len(pending),
+            'redis_round_trips': self.rights_cache.round_trips - round_trips
+        }
+        trace.get_current_span().set_attribute('rights.redis_round_trips', stats['redis_round_trips'])
+        return rights, stats
+    
+    async def _cache_when_done(self, pending: set):
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        self.rights_cache.put_many([
+            (result.dict(), negative)
+            for result, negative in (r for r in results if not isinstance(r, BaseException))
+            if negative is not None
+        ])
+    
+    async def _check_bounded(self, audio: TrendingAudio) -> Tuple[AudioRights, Optional[bool]]:
+        async with self._rights_semaphore:
+            return await self._check_rights(audio)
+    
+    async def _check_rights(self, audio: TrendingAudio) -> Tuple[AudioRights, Optional[bool]]:
+        """Run the rights checks for one track
         
-        if cached_rights:
-            return AudioRights(**json.loads(cached_rights))
+        Returns the verdict and how to cache it: False for a normal entry,
+        True for a negative one (no licence found), None for not at all
+        (a check timed out).
+        """
+        logger.info(f"Verifying rights for audio: {audio.title}")
         
         # Check multiple sources for rights
         is_cleared = False
@@ -204,26 +395,42 @@ class TrendingAudioAgent:
         rights_holder = None
         license_cost = None
         
-        # 1. Check YouTube Content ID
-        youtube_check = await self._check_youtube_content_id(audio)
-        if youtube_check['status'] == 'blocked':
+        # The checks are independent, so run them together; the alternative
+        # search starts speculatively and is discarded if the track clears
+        checks = await asyncio.gather(
+            self._run_check(self._check_youtube_content_id(audio), 'youtube_content_id'),
+            self._run_check(self._check_commercial_licensing(audio), 'commercial_licensing'),
+            self._run_check(self._find_royalty_free_alternative(audio), 'royalty_free_alternative')
+        )
+        (youtube_done, youtube_check), (commercial_done, commercial_check), (alternative_done, alternative) = checks
+        timed_out = [
+            name for name, done in (('youtube', youtube_done), ('licensing', commercial_done))
+            if not done
+        ]
+        
+        # 1. YouTube Content ID
+        if youtube_check is None:
+            restrictions.append('youtube_unverified')
+        elif youtube_check['status'] == 'blocked':
             restrictions.append('youtube_blocked')
         elif youtube_check['status'] == 'monetized':
             restrictions.append('youtube_revenue_share')
         
-        # 2. Check commercial licensing databases
-        commercial_check = await self._check_commercial_licensing(audio)
-        if commercial_check['available']:
+        # 2. Commercial licensing databases
+        if commercial_check is None:
+            restrictions.append('licensing_unverified')
+        elif commercial_check['available']:
             is_cleared = True
             license_type = commercial_check['license_type']
             rights_holder = commercial_check['rights_holder']
             license_cost = commercial_check.get('cost', 0)
         
-        # 3. Find royalty-free alternative if not cleared
+        # 3. Royalty-free alternative if not cleared
         alternative_id = None
         if not is_cleared:
-            alternative = await self._find_royalty_free_alternative(audio)
-            if alternative:
+            if not alternative_done:
+                timed_out.append('alternative')
+            elif alternative:
                 alternative_id = alternative['audio_id']
         
         rights = AudioRights(
@@ -236,14 +443,24 @@ class TrendingAudioAgent:
             alternative_id=alternative_id
         )
         
-        # Cache results
-        redis_client.setex(
-            cache_key,
-            timedelta(days=7),
-            json.dumps(rights.dict(), default=str)
-        )
-        
-        return rights
+        # A verdict with timed-out checks is retried next time
+        if timed_out:
+            return rights, None
+        return rights, commercial_check.get('reason') == 'not_in_database'
+    
+    async def _run_check(self, check, name: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Await one rights check under the per-check timeout
+        
+        Returns whether it finished and its result, so a check that
+        legitimately found nothing is told apart from one that timed out.
+        """
+        try:
+            return True, await asyncio.wait_for(check, timeout=self.check_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Rights check {name} timed out after {self.check_timeout}s")
+        except Exception as e:
+            logger.error(f"Rights check {name} failed: {e}")
+        return False, None
     
     async def _check_youtube_content_id(self, audio: TrendingAudio) -> Dict[str, Any]:
         """Check YouTube Content ID system"""
@@ -277,7 +494,13 @@ class TrendingAudioAgent:
         }
     
     async def _find_royalty_free_alternative(self, audio: TrendingAudio) -> Optional[Dict[str, Any]]:
-        """Find royalty-free alternative with similar mood/genre"""
+        """Find royalty-free alternative with similar mood/genre
+        
+        Without a built catalog (see ``index_alternatives``) there is nothing
+        to match against, so no alternative is offered.
+        """
+        if self.alternative_index is None:
+            return None
         logger.info(f"Finding royalty-free alternative for {audio.title}")
         
         # Search by mood and genre
@@ -288,83 +511,137 @@ class TrendingAudioAgent:
             'energy': 'high' if audio.trend_score > 80 else 'medium'
         }
         
-        # In production, query royalty-free APIs
-        # Simulate finding alternative
-        alternatives = [
-            {
-                'audio_id': 'rf_upbeat_001',
-                'title': 'Upbeat Corporate',
-                'source': 'epidemic_sound',
-                'match_score': 0.85
-            },
-            {
-                'audio_id': 'rf_energetic_002',
-                'title': 'Energetic Pop',
-                'source': 'artlist',
-                'match_score': 0.78
-            }
+        # Measured features beat the trend-score guess
+        features = audio.features or {}
+        if features:
+            search_params['energy'] = features['energy']
+            search_params['tempo'] = features.get('tempo') or None
+        embedding = features.get('embedding')
+        
+        # Nearest catalog tracks, relaxing genre then mood if nothing matches
+        attempts = [
+            {'moods': [audio.mood] if audio.mood else None, 'genres': [audio.genre] if audio.genre else None},
+            {'moods': [audio.mood] if audio.mood else None},
+            {}
         ]
-        
-        return alternatives[0] if alternatives else None
+        for filters in attempts:
+            # NumPy search off the loop, so the per-check timeout applies to it
+            matches = await asyncio.to_thread(
+                self.alternative_index.search,
+                k=3,
+                energy=search_params['energy'],
+                tempo=search_params.get('tempo'),
+                duration=search_params['duration'],
+                embedding=embedding if embedding and len(embedding) == self.alternative_index.meta['embedding_dim'] else None,
+                max_duration=max(search_params['duration'] * 4, 60),
+                **filters
+            )
+            if matches:
+                return dict(matches[0], runner_up_ids=[m['audio_id'] for m in matches[1:]])
+        return None
+    
+    async def index_alternatives(self, tracks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rebuild the royalty-free catalog index from track metadata"""
+        self.alternative_index = await asyncio.to_thread(
+            RoyaltyFreeIndex.build, self.alternative_index_dir, tracks
+        )
+        return self.alternative_index.stats()
     
     @tracer.start_as_current_span("recommend_audio")
     async def recommend_audio(self, content_context: Dict[str, Any]) -> AudioRecommendation:
         """Recommend best audio for content based on trends and rights"""
-        logger.info("Generating audio recommendation")
+        recommendations = await self.recommend_audio_batch([content_context])
+        return recommendations[0]
+    
+    @tracer.start_as_current_span("recommend_audio_batch")
+    async def recommend_audio_batch(self, content_contexts: List[Dict[str, Any]],
+                                    weights: Optional[Dict[str, float]] = None,
+                                    limit: int = 50) -> List[AudioRecommendation]:
+        """Recommend audio for several content contexts from one shared candidate pool
+        
+        Charts for every platform the contexts ask for (``platforms``,
+        default tiktok) are fetched and verified once; all contexts are then
+        scored together over column arrays.
+        """
+        logger.info(f"Generating audio recommendations for {len(content_contexts)} contexts")
+        # Copies, so the caller's contexts don't gain a platforms key
+        content_contexts = [{'platforms': ['tiktok'], **context} for context in content_contexts]
+        score_weights = {**DEFAULT_WEIGHTS, **self.score_weights, **(weights or {})}
         
         # Get trending audio
-        trending = await self.scrape_trending_audio('tiktok', limit=50)
-        
-        # Filter by content mood/theme
-        content_mood = content_context.get('mood', 'neutral')
-        content_genre = content_context.get('genre', 'any')
+        platforms = sorted({p for c in content_contexts for p in c['platforms']})
+        charts = await asyncio.gather(*(self.chart_snapshot(p, limit=limit) for p in platforms))
+        trending = ChartRows(charts)
+        
+        # Verify rights for all tracks with bounded concurrency, keeping
+        # whatever has finished when the latency budget runs out
+        started = time.perf_counter()
+        rights_by_id, verification = await self.verify_many(
+            trending, budget=self.recommend_budget, audio_ids=trending.texts('audio_id')
+        )
         
-        # Score each audio option
-        scored_options = []
+        # Score every (context, track) pair at once, straight from the chart columns
+        scoring_started = time.perf_counter()
+        columns = CandidateColumns.from_chart(trending, rights_by_id)
+        scores = score_contexts(columns, content_contexts, score_weights)
+        leaders = [top_k(row, 4) for row in scores]
+        scoring_ms = (time.perf_counter() - scoring_started) * 1000
+        
+        verification = dict(
+            verification,
+            budget_exhausted=verification['pending'] > 0,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            scoring_ms=round(scoring_ms, 3),
+            rights_cache=self.rights_cache.stats()
+        )
         
-        for audio in trending:
-            # Check if audio matches content
-            mood_match = 1.0 if audio.mood == content_mood else 0.5
-            trend_weight = audio.trend_score / 100.0
+        recommendations = []
+        for context, row, best in zip(content_contexts, scores, leaders):
+            scored_options = [
+                {'audio': trending[i], 'rights': rights_by_id[trending[i].audio_id], 'score': float(row[i])}
+                for i in best
+            ]
             
-            # Verify rights
-            rights = await self.verify_audio_rights(audio)
-            rights_weight = 1.0 if rights.is_cleared else 0.3
+            if not scored_options:
+                # Nothing verified in time: best trending track, flagged as unverified
+                allowed = [columns.platform_codes[p] for p in context['platforms'] if p in columns.platform_codes]
+                candidates = np.flatnonzero(np.isin(columns.platform, allowed))
+                if not len(candidates):
+                    raise ValueError(f"No trending audio found for platforms {context['platforms']}")
+                audio = trending[int(candidates[np.argmax(columns.trend[candidates])])]
+                mood_match = 1.0 if audio.mood == context.get('mood', 'neutral') else 0.5
+                # Same base terms and scale as score_contexts, with uncleared rights
+                score = (score_weights['mood'] * mood_match + score_weights['trend'] * audio.trend_score / 100.0
+                         + score_weights['rights'] * 0.3)
+                scored_options.append({
+                    'audio': audio,
+                    'rights': AudioRights(audio_id=audio.audio_id, is_cleared=False, restrictions=['rights_unverified']),
+                    'score': score / (score_weights['mood'] + score_weights['trend'] + score_weights['rights'])
+                })
             
-            # Calculate final score
-            match_score = (mood_match * 0.3) + (trend_weight * 0.5) + (rights_weight * 0.2)
+            # Get best option
+            best_option = scored_options[0]
             
-            scored_options.append({
-                'audio': audio,
-                'rights': rights,
-                'score': match_score
-            })
-        
-        # Sort by score
-        scored_options.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Get best option
-        best_option = scored_options[0]
-        
-        # Prepare fallback options
-        fallbacks = []
-        for option in scored_options[1:4]:
-            if option['rights'].is_cleared or option['rights'].alternative_id:
-                fallbacks.append({
-                    'audio_id': option['audio'].audio_id,
-                    'title': option['audio'].title,
-                    'score': option['score']
-                })
-        
-        recommendation = AudioRecommendation(
-            primary_audio=best_option['audio'],
-            rights=best_option['rights'],
-            match_score=best_option['score'],
-            reasoning=self._generate_reasoning(best_option, content_context),
-            fallback_options=fallbacks
-        )
-        
-        return recommendation
+            # Prepare fallback options
+            fallbacks = []
+            for option in scored_options[1:4]:
+                if option['rights'].is_cleared or option['rights'].alternative_id:
+                    fallbacks.append({
+                        'audio_id': option['audio'].audio_id,
+                        'title': option['audio'].title,
+                        'score': option['score']
+                    })
+            
+            recommendations.append(AudioRecommendation(
+                primary_audio=best_option['audio'],
+                rights=best_option['rights'],
+                match_score=best_option['score'],
+                reasoning=self._generate_reasoning(best_option, context),
+                fallback_options=fallbacks,
+                verification=verification
+            ))
+        
+        return recommendations
     
     def _generate_reasoning(self, option: Dict[str, Any], context: Dict[str, Any]) -> str:
         """Generate reasoning for audio selection"""
@@ -442,19 +719,22 @@ class TrendingAudioAgent:
             platform = request.get('platform', 'tiktok')
             limit = request.get('limit', 200)
             
-            trending = await self.scrape_trending_audio(platform, limit)
+            snapshot = await self.chart_snapshot(platform, limit)
+            ranks = snapshot.column('rank')
+            trend_scores = snapshot.column('trend_score')
             
             return {
                 'status': 'success',
                 'platform': platform,
-                'audio_count': len(trending),
+                'audio_count': len(snapshot),
+                'rights_prewarm': dict(self.prewarm_stats, queued=self._prewarm_queue.qsize()),
                 'top_10': [
                     {
-                        'rank': a.rank,
-                        'title': a.title,
-                        'artist': a.artist,
-                        'trend_score': a.trend_score
-                    } for a in trending[:10]
+                        'rank': int(ranks[i]),
+                        'title': snapshot.text('title', i),
+                        'artist': snapshot.text('artist', i),
+                        'trend_score': float(trend_scores[i])
+                    } for i in range(min(10, len(snapshot)))
                 ]
             }
             
@@ -474,13 +754,15 @@ class TrendingAudioAgent:
             }
             
         elif action == 'recommend':
-            # Recommend audio for content
-            content_context = request.get('content_context', {})
-            recommendation = await self.recommend_audio(content_context)
-            
-            return {
-                'status': 'success',
-                'recommendation': {
+            # Recommend audio for one content context, or several in one pass
+            content_contexts = request.get('content_contexts') or [request.get('content_context', {})]
+            recommendations = await self.recommend_audio_batch(
+                content_contexts,
+                weights=request.get('weights'),
+                limit=request.get('limit', 50)
+            )
+            results = [
+                {
                     'audio_id': recommendation.primary_audio.audio_id,
                     'title': recommendation.primary_audio.title,
                     'artist': recommendation.primary_audio.artist,
@@ -488,9 +770,23 @@ class TrendingAudioAgent:
                     'is_cleared': recommendation.rights.is_cleared,
                     'match_score': recommendation.match_score,
                     'reasoning': recommendation.reasoning,
-                    'fallbacks': recommendation.fallback_options
-                }
-            }
+                    'fallbacks': recommendation.fallback_options,
+                    'verification': recommendation.verification
+                } for recommendation in recommendations
+            ]
+            
+            if 'content_contexts' in request:
+                return {'status': 'success', 'recommendations': results}
+            return {'status': 'success', 'recommendation': results[0]}
+            
+        elif action == 'index_alternatives':
+            # Rebuild the royalty-free catalog index
+            tracks = request.get('tracks')
+            if not tracks:
+                return {'status': 'error', 'message': 'No catalog tracks provided'}
+            
+            index_stats = await self.index_alternatives(tracks)
+            return {'status': 'success', 'index': index_stats}
             
         elif action == 'inject':
             # Inject audio into content
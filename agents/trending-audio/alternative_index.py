@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Alternative Index Module for Trending-Audio Agent
+Memory-mapped royalty-free catalog with filtered k-nearest-neighbour search
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numeric features, each scaled to roughly [0, 1] before indexing
+FEATURES = ['energy', 'tempo', 'duration']
+_SCALE = np.array([1.0, 1 / 200.0, 1 / 300.0], dtype=np.float32)
+
+# Rows scored per step, so a search never materialises the whole catalog
+CHUNK_ROWS = 65536
+
+ENERGY_LEVELS = {'low': 0.25, 'medium': 0.5, 'high': 0.8}
+
+
+class RoyaltyFreeIndex:
+    """Catalog of royalty-free tracks laid out as one .npy file per column
+
+    ``features.npy`` (N x 3, float32) holds scaled energy, tempo and
+    duration; ``embeddings.npy`` (N x E, float32, L2-normalised) optional
+    audio embeddings; ``mood.npy``/``genre.npy`` int16 codes into the
+    vocabularies in ``meta.json``; ``ids.npy``/``titles.npy``/``sources.npy``
+    fixed-width strings. Every array is opened with ``mmap_mode='r'``, so
+    opening is instant and the OS pages in only what a search touches.
+
+    ``root_dir`` is a symlink to the current versioned build directory; it is
+    resolved once on open, so every column comes from the same build.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.version_dir = os.path.realpath(root_dir)
+        with open(os.path.join(self.version_dir, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.moods: Dict[str, int] = {m: i for i, m in enumerate(self.meta['moods'])}
+        self.genres: Dict[str, int] = {g: i for i, g in enumerate(self.meta['genres'])}
+
+        def column(name: str) -> np.ndarray:
+            return np.load(os.path.join(self.version_dir, f"{name}.npy"), mmap_mode='r')
+
+        self.features = column('features')
+        self.mood = column('mood')
+        self.genre = column('genre')
+        self.ids = column('ids')
+        self.titles = column('titles')
+        self.sources = column('sources')
+        self.embeddings = column('embeddings') if self.meta['embedding_dim'] else None
+
+        self.searches = 0
+        self.total_search_seconds = 0.0
+
+    def __len__(self) -> int:
+        return self.meta['count']
+
+    @classmethod
+    def build(cls, root_dir: str, tracks: List[Dict[str, Any]]) -> 'RoyaltyFreeIndex':
+        """Write a new index from track dicts and swap it in atomically
+
+        Tracks carry ``audio_id``, ``title``, ``source``, ``mood``, ``genre``,
+        ``energy`` (0-1 or low/medium/high), ``tempo`` (BPM),
+        ``duration_seconds`` and optionally ``embedding`` (all tracks or none,
+        of one length).
+
+        The build goes to a new ``{root_dir}.v<id>`` directory and the
+        ``root_dir`` symlink is switched to it with ``os.replace``, so readers
+        always see one complete build. The previous build is kept for readers
+        still opening it; older ones are removed.
+        """
+        embedding_dims = {len(t.get('embedding') or []) for t in tracks}
+        if len(embedding_dims) > 1:
+            raise ValueError(
+                f"Tracks must all have embeddings of one length or none at all, got lengths {sorted(embedding_dims)}"
+            )
+
+        moods = sorted({t.get('mood') or 'unknown' for t in tracks})
+        genres = sorted({t.get('genre') or 'unknown' for t in tracks})
+        mood_codes = {m: i for i, m in enumerate(moods)}
+        genre_codes = {g: i for i, g in enumerate(genres)}
+
+        features = np.array([
+            [_energy_value(t.get('energy')), t.get('tempo') or 0.0, t.get('duration_seconds') or 0.0]
+            for t in tracks
+        ], dtype=np.float32).reshape(-1, len(FEATURES)) * _SCALE
+
+        embedding_dim = embedding_dims.pop() if embedding_dims else 0
+        columns = {
+            'features': features,
+            'mood': np.array([mood_codes[t.get('mood') or 'unknown'] for t in tracks], dtype=np.int16),
+            'genre': np.array([genre_codes[t.get('genre') or 'unknown'] for t in tracks], dtype=np.int16),
+            'ids': np.array([t['audio_id'] for t in tracks], dtype='U64'),
+            'titles': np.array([t.get('title', '') for t in tracks], dtype='U128'),
+            'sources': np.array([t.get('source', '') for t in tracks], dtype='U32')
+        }
+        if embedding_dim:
+            embeddings = np.array([t['embedding'] for t in tracks], dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            columns['embeddings'] = embeddings / np.where(norms > 0, norms, 1.0)
+
+        root_dir = os.path.abspath(root_dir)
+        version_dir = f"{root_dir}.v{time.time_ns():x}{uuid.uuid4().hex[:6]}"
+        os.makedirs(version_dir)
+        for name, array in columns.items():
+            np.save(os.path.join(version_dir, f"{name}.npy"), array)
+        with open(os.path.join(version_dir, 'meta.json'), 'w') as f:
+            json.dump({
+                'count': len(tracks),
+                'moods': moods,
+                'genres': genres,
+                'embedding_dim': embedding_dim,
+                'built_at': time.time()
+            }, f)
+
+        # An index from before versioned builds is a plain directory; move it
+        # aside once so the symlink can take its place
+        previous = os.path.realpath(root_dir) if os.path.islink(root_dir) else None
+        if previous is None and os.path.isdir(root_dir):
+            previous = f"{root_dir}.v0"
+            shutil.rmtree(previous, ignore_errors=True)
+            os.rename(root_dir, previous)
+
+        link = f"{root_dir}.link.{uuid.uuid4().hex[:8]}"
+        os.symlink(os.path.basename(version_dir), link)
+        os.replace(link, root_dir)
+
+        # Readers holding older builds keep their open mappings
+        parent, base = os.path.split(root_dir)
+        for name in os.listdir(parent):
+            path = os.path.join(parent, name)
+            if name.startswith(f"{base}.v") and path not in (version_dir, previous):
+                shutil.rmtree(path, ignore_errors=True)
+
+        logger.info(f"Built royalty-free index of {len(tracks)} tracks at {root_dir}")
+        return cls(root_dir)
+
+    def search(self, k: int = 5, energy: Any = None, tempo: Optional[float] = None,
+               duration: Optional[float] = None, embedding: Optional[Sequence[float]] = None,
+               moods: Optional[List[str]] = None, genres: Optional[List[str]] = None,
+               max_duration: Optional[float] = None,
+               embedding_weight: float = 1.0) -> List[Dict[str, Any]]:
+        """The ``k`` nearest tracks passing the filters, closest first
+
+        Distance is squared Euclidean over whichever of energy, tempo and
+        duration are given, plus ``embedding_weight * (1 - cosine)`` when an
+        embedding is given and the index has them. ``moods``/``genres`` are
+        hard filters; an unknown label matches nothing.
+        """
+        started = time.perf_counter()
+
+        query = np.array([_energy_value(energy) if energy is not None else 0.0,
+                          tempo or 0.0, duration or 0.0], dtype=np.float32) * _SCALE
+        weights = np.array([energy is not None, bool(tempo), bool(duration)], dtype=np.float32)
+
+        use_embedding = embedding is not None and self.embeddings is not None
+        if use_embedding:
+            # Out of place, so a caller's float32 array is left untouched
+            query_embedding = np.asarray(embedding, dtype=np.float32)
+            query_embedding = query_embedding / (np.linalg.norm(query_embedding) or 1.0)
+
+        mood_codes = np.array([self.moods.get(m, -1) for m in moods], dtype=np.int16) if moods else None
+        genre_codes = np.array([self.genres.get(g, -1) for g in genres], dtype=np.int16) if genres else None
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_distances = np.empty(0, dtype=np.float32)
+        for start in range(0, len(self), CHUNK_ROWS):
+            stop = min(start + CHUNK_ROWS, len(self))
+            mask = np.ones(stop - start, dtype=bool)
+            if mood_codes is not None:
+                mask &= np.isin(self.mood[start:stop], mood_codes)
+            if genre_codes is not None:
+                mask &= np.isin(self.genre[start:stop], genre_codes)
+            if max_duration is not None:
+                mask &= self.features[start:stop, 2] <= max_duration * _SCALE[2]
+            rows = np.flatnonzero(mask)
+            if not len(rows):
+                continue
+
+            # Gathering rows copies them; skip it when nothing was filtered out
+            features = self.features[start:stop]
+            if len(rows) < len(mask):
+                features = features[rows]
+            diff = features - query
+            distances = (diff * diff) @ weights
+            if use_embedding:
+                embeddings = self.embeddings[start:stop]
+                if len(rows) < len(mask):
+                    embeddings = embeddings[rows]
+                distances += embedding_weight * (1.0 - embeddings @ query_embedding)
+
+            # Keep a running top-k across chunks
+            rows = np.concatenate([best_rows, rows + start])
+            distances = np.concatenate([best_distances, distances])
+            if len(distances) > k:
+                keep = np.argpartition(distances, k)[:k]
+                rows, distances = rows[keep], distances[keep]
+            best_rows, best_distances = rows, distances
+
+        order = np.argsort(best_distances)
+        results = [{
+            'audio_id': str(self.ids[row]),
+            'title': str(self.titles[row]),
+            'source': str(self.sources[row]),
+            'mood': self.meta['moods'][self.mood[row]],
+            'genre': self.meta['genres'][self.genre[row]],
+            'energy': round(float(self.features[row, 0]), 3),
+            'tempo': round(float(self.features[row, 1] / _SCALE[1]), 1),
+            'duration_seconds': round(float(self.features[row, 2] / _SCALE[2]), 1),
+            'match_score': round(1.0 / (1.0 + float(distance)), 4)
+        } for row, distance in zip(best_rows[order], best_distances[order])]
+
+        self.searches += 1
+        self.total_search_seconds += time.perf_counter() - started
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'tracks': len(self),
+            'embedding_dim': self.meta['embedding_dim'],
+            'searches': self.searches,
+            'mean_search_ms': round(self.total_search_seconds / self.searches * 1000, 3) if self.searches else 0.0
+        }
+
+
+def _energy_value(energy: Any) -> float:
+    if isinstance(energy, str):
+        return ENERGY_LEVELS.get(energy, 0.5)
+    return float(energy) if energy is not None else 0.5
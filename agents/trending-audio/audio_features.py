@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Audio Features Module for Trending-Audio Agent
+Decodes audio previews and extracts tempo, energy, spectral and chroma features
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import shutil
+import subprocess
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+
+import aiohttp
+import numpy as np
+import redis
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 22050
+FRAME_SIZE = 2048
+HOP_SIZE = 512
+MAX_SECONDS = 60  # previews are short; never analyse more than this
+
+# Log-spaced bands (Hz) summarised in the embedding
+_BAND_EDGES = np.array([0, 150, 300, 600, 1200, 2400, 4800, 9600, SAMPLE_RATE / 2])
+
+
+def is_wav(data: bytes) -> bool:
+    return data[:4] == b'RIFF' and data[8:12] == b'WAVE'
+
+
+def decode_audio(data: bytes) -> np.ndarray:
+    """Mono float32 samples at SAMPLE_RATE
+
+    WAV is read with the standard library; anything else (mp3, m4a, ogg)
+    is decoded by an ``ffmpeg`` subprocess.
+    """
+    if is_wav(data):
+        with wave.open(io.BytesIO(data)) as wav:
+            width = wav.getsampwidth()
+            if width not in (1, 2, 4):
+                raise ValueError(f"Unsupported WAV sample width: {width}")
+            frames = wav.readframes(min(wav.getnframes(), wav.getframerate() * MAX_SECONDS))
+            samples = np.frombuffer(frames, dtype={1: np.uint8, 2: np.int16, 4: np.int32}[width]).astype(np.float32)
+            if width == 1:
+                samples = (samples - 128.0) / 128.0
+            else:
+                samples /= float(2 ** (8 * width - 1))
+            samples = samples.reshape(-1, wav.getnchannels()).mean(axis=1)
+            return _resample(samples, wav.getframerate())
+
+    result = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-i', 'pipe:0', '-t', str(MAX_SECONDS),
+         '-f', 'f32le', '-ac', '1', '-ar', str(SAMPLE_RATE), 'pipe:1'],
+        input=data, capture_output=True, check=True, timeout=30
+    )
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def _resample(samples: np.ndarray, rate: int) -> np.ndarray:
+    if rate == SAMPLE_RATE or not len(samples):
+        return samples
+    # Linear interpolation is plenty for tempo and band-energy features
+    positions = np.arange(0, len(samples) - 1, rate / SAMPLE_RATE)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def compute_features(samples: np.ndarray) -> Dict[str, Any]:
+    """Tempo, energy, spectral and chroma features of a mono signal
+
+    The signal is framed with stride tricks into one (frames x FRAME_SIZE)
+    view and transformed with a single batched rfft; every feature is then a
+    reduction over that spectrogram.
+    """
+    duration = len(samples) / SAMPLE_RATE
+    if len(samples) < FRAME_SIZE:
+        samples = np.pad(samples, (0, FRAME_SIZE - len(samples)))
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(FRAME_SIZE).astype(np.float32), axis=1))
+    power = spectrum ** 2
+    freqs = np.fft.rfftfreq(FRAME_SIZE, 1.0 / SAMPLE_RATE)
+
+    # Energy: RMS loudness mapped from [-60, 0] dBFS to [0, 1]
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    loudness_db = 20 * np.log10(np.mean(rms) + 1e-10)
+    energy = float(np.clip((loudness_db + 60) / 60, 0.0, 1.0))
+
+    # Spectral shape
+    total = spectrum.sum(axis=1) + 1e-10
+    centroid = (spectrum @ freqs) / total
+    bandwidth = np.sqrt(((freqs[None, :] - centroid[:, None]) ** 2 * spectrum).sum(axis=1) / total)
+    cumulative = np.cumsum(power, axis=1)
+    rolloff = freqs[np.argmax(cumulative >= 0.85 * cumulative[:, -1:], axis=1)]
+    flatness = np.exp(np.mean(np.log(power + 1e-10), axis=1)) / (np.mean(power, axis=1) + 1e-10)
+
+    # Tempo: autocorrelation of the onset (positive spectral flux) envelope
+    flux = np.maximum(np.diff(np.log1p(spectrum), axis=0), 0).sum(axis=1)
+    tempo = 0.0
+    # Too short, or a flat envelope (silence, a steady tone): no beat to find
+    if len(flux) > 8 and flux.any():
+        flux -= flux.mean()
+        n = 2 ** int(np.ceil(np.log2(2 * len(flux))))
+        autocorr = np.fft.irfft(np.abs(np.fft.rfft(flux, n)) ** 2)[:len(flux)]
+        frame_rate = SAMPLE_RATE / HOP_SIZE
+        lags = np.arange(len(autocorr))
+        valid = (lags >= frame_rate * 60 / 200) & (lags <= frame_rate * 60 / 60)
+        if valid.any():
+            # A log-normal prior around 120 BPM resolves octave ambiguity
+            candidates = 60 * frame_rate / lags[valid]
+            prior = np.exp(-0.5 * np.log2(candidates / 120.0) ** 2)
+            tempo = float(candidates[np.argmax(autocorr[valid] * prior)])
+
+    # Chroma: spectral power folded onto the 12 pitch classes
+    audible = freqs > 27.5
+    pitch_class = (np.round(12 * np.log2(freqs[audible] / 440.0)) + 9) % 12
+    chroma_map = np.zeros((audible.sum(), 12), dtype=np.float32)
+    chroma_map[np.arange(audible.sum()), pitch_class.astype(int)] = 1.0
+    chroma = (power[:, audible] @ chroma_map).mean(axis=0)
+    chroma = chroma / (chroma.max() + 1e-10)
+
+    band_index = np.clip(np.searchsorted(_BAND_EDGES, freqs, side='right') - 1, 0, len(_BAND_EDGES) - 2)
+    bands = np.log1p(np.bincount(band_index, weights=power.mean(axis=0), minlength=len(_BAND_EDGES) - 1))
+    bands = bands / (bands.max() + 1e-10)
+
+    embedding = np.concatenate([chroma, bands])
+    embedding = embedding / (np.linalg.norm(embedding) + 1e-10)
+
+    return {
+        'duration_seconds': round(duration, 2),
+        'tempo': round(tempo, 1),
+        'energy': round(energy, 4),
+        'spectral_centroid': round(float(centroid.mean()), 1),
+        'spectral_bandwidth': round(float(bandwidth.mean()), 1),
+        'spectral_rolloff': round(float(rolloff.mean()), 1),
+        'spectral_flatness': round(float(flatness.mean()), 5),
+        'chroma': [round(float(c), 4) for c in chroma],
+        'embedding': [round(float(e), 5) for e in embedding]
+    }
+
+
+def extract_features(data: bytes) -> Dict[str, Any]:
+    """Decode and analyse one preview; runs in a worker process"""
+    return compute_features(decode_audio(data))
+
+
+class AudioFeatureExtractor:
+    """Features for chart tracks, computed once per distinct audio file
+
+    Previews are downloaded concurrently and hashed; features are cached
+    under ``audio_features:{sha256}`` so re-uploads and cross-platform
+    duplicates share one analysis, and ``audio_features:track:{audio_id}``
+    remembers each track's hash so known tracks aren't downloaded again.
+    Decoding and FFTs run in a process pool to keep them off the event loop.
+    Without an ``ffmpeg`` binary only WAV previews can be decoded; other
+    files are skipped and counted as ``undecodable``.
+    """
+
+    def __init__(self, redis_client: redis.Redis, max_workers: int = 2,
+                 ttl_seconds: int = 30 * 86400, download_timeout: float = 10.0,
+                 max_concurrent_downloads: int = 8):
+        self.redis_client = redis_client
+        self.max_workers = max_workers
+        self.ttl_seconds = ttl_seconds
+        self.download_timeout = download_timeout
+        self._download_semaphore = asyncio.Semaphore(max_concurrent_downloads)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}  # content hash -> analysis
+
+        self.ffmpeg_available = shutil.which('ffmpeg') is not None
+        if not self.ffmpeg_available:
+            logger.error("ffmpeg not found on PATH: only WAV previews will be analysed")
+
+        self.analysed = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.undecodable = 0
+
+    def _pool_executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def analyze(self, tracks: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Features for ``(audio_id, preview_url)`` pairs, keyed by audio_id
+
+        Redis is touched in bulk only: one read for known tracks, one for
+        the downloaded files' hashes and one pipelined write at the end.
+        """
+        if not tracks:
+            return {}
+
+        # Tracks already analysed: two bulk reads, no downloads
+        hashes = self.redis_client.mget([f"audio_features:track:{audio_id}" for audio_id, _ in tracks])
+        known = {audio_id: h for (audio_id, _), h in zip(tracks, hashes) if h}
+        cached = self._load(set(known.values()))
+        features = {audio_id: cached[h] for audio_id, h in known.items() if h in cached}
+        self.cache_hits += len(features)
+
+        pending = [(audio_id, url) for audio_id, url in tracks if audio_id not in features]
+        if not pending:
+            return features
+
+        timeout = aiohttp.ClientTimeout(total=self.download_timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            downloads = await asyncio.gather(
+                *(self._download(session, url) for _, url in pending),
+                return_exceptions=True
+            )
+
+        track_hashes: Dict[str, str] = {}
+        files: Dict[str, bytes] = {}  # content hash -> data, one per distinct file
+        for (audio_id, _), result in zip(pending, downloads):
+            if isinstance(result, BaseException):
+                self.failures += 1
+                logger.warning(f"Preview download failed for {audio_id}: {result}")
+                continue
+            content_hash = hashlib.sha256(result).hexdigest()
+            track_hashes[audio_id] = content_hash
+            files.setdefault(content_hash, result)
+
+        by_hash = self._load(set(files))
+        new_hashes = [h for h in files if h not in by_hash]
+        results = await asyncio.gather(
+            *(self._analyze_file(h, files[h]) for h in new_hashes),
+            return_exceptions=True
+        )
+        analysed = {}
+        for content_hash, result in zip(new_hashes, results):
+            if isinstance(result, BaseException):
+                self.failures += 1
+                logger.warning(f"Feature extraction failed for file {content_hash[:12]}: {result}")
+            elif result is not None:
+                analysed[content_hash] = result
+        by_hash.update(analysed)
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for content_hash, result in analysed.items():
+            pipe.setex(f"audio_features:{content_hash}", self.ttl_seconds, json.dumps(result))
+        for audio_id, content_hash in track_hashes.items():
+            if content_hash in by_hash:
+                features[audio_id] = by_hash[content_hash]
+                pipe.setex(f"audio_features:track:{audio_id}", self.ttl_seconds, content_hash)
+        pipe.execute()
+
+        # Tracks served without a fresh analysis of their own
+        self.cache_hits += sum(1 for h in track_hashes.values() if h in by_hash) - len(analysed)
+        return features
+
+    def _load(self, content_hashes: set) -> Dict[str, Dict[str, Any]]:
+        if not content_hashes:
+            return {}
+        hashes = list(content_hashes)
+        raw = self.redis_client.mget([f"audio_features:{h}" for h in hashes])
+        return {h: json.loads(data) for h, data in zip(hashes, raw) if data}
+
+    async def _download(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        async with self._download_semaphore:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return await response.read()
+
+    async def _analyze_file(self, content_hash: str, data: bytes) -> Optional[Dict[str, Any]]:
+        if not self.ffmpeg_available and not is_wav(data):
+            self.undecodable += 1
+            return None
+        if content_hash in self._inflight:
+            # The same file is being analysed for another request right now
+            return await asyncio.shield(self._inflight[content_hash])
+
+        loop = asyncio.get_running_loop()
+        analysis = loop.run_in_executor(self._pool_executor(), extract_features, data)
+        self._inflight[content_hash] = analysis
+        try:
+            features = await analysis
+        finally:
+            del self._inflight[content_hash]
+        self.analysed += 1
+        return features
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'analysed': self.analysed,
+            'cache_hits': self.cache_hits,
+            'failures': self.failures,
+            'undecodable': self.undecodable,
+            'ffmpeg_available': self.ffmpeg_available,
+            'workers': self.max_workers
+        }
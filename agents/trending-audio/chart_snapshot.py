@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Chart Snapshot Module for Trending-Audio Agent
+Binary struct-of-arrays encoding of chart snapshots with lazy row hydration
+"""
+
+import json
+import logging
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'CHS1'
+_ALIGN = 8
+_EPOCH = datetime(1970, 1, 1)  # discovered_at is naive UTC
+
+# Fixed-width columns, read back as zero-copy views
+NUMERIC_COLUMNS = {
+    'rank': np.int32,
+    'usage_count': np.int64,
+    'trend_score': np.float64,
+    'duration_seconds': np.int32,
+    'discovered_at': np.float64,  # epoch seconds
+    'energy': np.float32,         # from features; NaN when not analysed
+    'tempo': np.float32
+}
+# Low-cardinality strings, stored as int16 codes into a vocabulary (-1 = None)
+CATEGORICAL_COLUMNS = ['platform', 'genre', 'mood']
+# Free text, stored as one UTF-8 blob plus uint32 offsets; decoded per row
+TEXT_COLUMNS = ['audio_id', 'title', 'artist', 'preview_url', 'features']
+
+
+def encode_chart(tracks: Sequence[Any]) -> bytes:
+    """Encode chart rows (TrendingAudio models) into one binary snapshot
+
+    Layout: magic, uint32 header length, JSON header (row count, vocabularies,
+    column offsets), then each column's buffer aligned to 8 bytes.
+    """
+    blocks: List[bytes] = []
+    columns: Dict[str, Dict[str, Any]] = {}
+    vocabularies: Dict[str, List[str]] = {}
+    position = 0
+
+    def add(name: str, array: np.ndarray, **extra):
+        nonlocal position
+        data = array.tobytes()
+        columns[name] = {'dtype': array.dtype.str, 'offset': position, 'length': len(array), **extra}
+        padding = -len(data) % _ALIGN
+        blocks.append(data + b'\0' * padding)
+        position += len(data) + padding
+
+    for name, dtype in NUMERIC_COLUMNS.items():
+        if name == 'discovered_at':
+            values = [(t.discovered_at - _EPOCH).total_seconds() for t in tracks]
+        elif name == 'energy':
+            values = [(t.features or {}).get('energy', np.nan) for t in tracks]
+        elif name == 'tempo':
+            values = [(t.features or {}).get('tempo') or np.nan for t in tracks]
+        else:
+            values = [getattr(t, name) for t in tracks]
+        add(name, np.array(values, dtype=dtype))
+
+    for name in CATEGORICAL_COLUMNS:
+        values = [getattr(t, name) for t in tracks]
+        vocabulary = sorted({v for v in values if v is not None})
+        codes = {v: i for i, v in enumerate(vocabulary)}
+        vocabularies[name] = vocabulary
+        add(name, np.array([codes[v] if v is not None else -1 for v in values], dtype=np.int16))
+
+    for name in TEXT_COLUMNS:
+        values = [getattr(t, name) for t in tracks]
+        if name == 'features':
+            values = [json.dumps(v, separators=(',', ':')) if v else None for v in values]
+        encoded = [v.encode('utf-8') if v is not None else b'' for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        add(f"{name}.offsets", offsets)
+        add(f"{name}.valid", np.array([v is not None for v in values], dtype=np.uint8))
+        add(f"{name}.data", np.frombuffer(b''.join(encoded), dtype=np.uint8))
+
+    header = json.dumps({
+        'count': len(tracks),
+        'columns': columns,
+        'vocabularies': vocabularies
+    }, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-(len(MAGIC) + 4 + len(header)) % _ALIGN)
+    return MAGIC + struct.pack('<I', len(header)) + header + b''.join(blocks)
+
+
+class ChartSnapshot:
+    """Read-only view over an encoded chart
+
+    Decoding parses only the small JSON header; ``column`` returns numpy
+    views straight over the buffer, and ``text`` decodes single strings.
+    Indexing (``snapshot[i]``) builds a ``model`` instance for that row only,
+    memoised, so callers that read ten rows of a two-hundred-row chart pay
+    for ten objects.
+    """
+
+    def __init__(self, data: bytes, model: Callable[..., Any]):
+        if data[:4] != MAGIC:
+            raise ValueError("Not a chart snapshot")
+        header_length, = struct.unpack_from('<I', data, 4)
+        header = json.loads(data[8:8 + header_length])
+        self._buffer = memoryview(data)[8 + header_length:]
+        self._columns = header['columns']
+        self.vocabularies: Dict[str, List[str]] = header['vocabularies']
+        self.count = header['count']
+        self.data = data
+        self.model = model
+        self.nbytes = len(data)
+        self._rows: Dict[int, Any] = {}
+
+    @classmethod
+    def from_models(cls, tracks: Sequence[Any], model: Callable[..., Any]) -> 'ChartSnapshot':
+        """Encode freshly scraped rows, keeping the models already built"""
+        snapshot = cls(encode_chart(tracks), model)
+        snapshot._rows = dict(enumerate(tracks))
+        return snapshot
+
+    def __len__(self) -> int:
+        return self.count
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy array for a numeric or categorical (codes) column"""
+        spec = self._columns[name]
+        return np.frombuffer(self._buffer, dtype=np.dtype(spec['dtype']),
+                             count=spec['length'], offset=spec['offset'])
+
+    def categorical(self, name: str, row: int) -> Optional[str]:
+        code = int(self.column(name)[row])
+        return self.vocabularies[name][code] if code >= 0 else None
+
+    def text(self, name: str, row: int) -> Optional[str]:
+        if not self.column(f"{name}.valid")[row]:
+            return None
+        offsets = self.column(f"{name}.offsets")
+        start = self._columns[f"{name}.data"]['offset'] + int(offsets[row])
+        end = self._columns[f"{name}.data"]['offset'] + int(offsets[row + 1])
+        return bytes(self._buffer[start:end]).decode('utf-8')
+
+    def texts(self, name: str) -> List[Optional[str]]:
+        """Every value of a text column, decoded from one slice of the blob"""
+        valid = self.column(f"{name}.valid")
+        offsets = self.column(f"{name}.offsets")
+        spec = self._columns[f"{name}.data"]
+        blob = bytes(self._buffer[spec['offset']:spec['offset'] + spec['length']])
+        return [
+            blob[offsets[row]:offsets[row + 1]].decode('utf-8') if valid[row] else None
+            for row in range(self.count)
+        ]
+
+    def __getitem__(self, row: int) -> Any:
+        if row < 0:
+            row += self.count
+        if not 0 <= row < self.count:
+            raise IndexError(row)
+        if row not in self._rows:
+            features = self.text('features', row)
+            self._rows[row] = self.model(
+                audio_id=self.text('audio_id', row),
+                platform=self.categorical('platform', row),
+                title=self.text('title', row),
+                artist=self.text('artist', row),
+                rank=int(self.column('rank')[row]),
+                usage_count=int(self.column('usage_count')[row]),
+                trend_score=float(self.column('trend_score')[row]),
+                duration_seconds=int(self.column('duration_seconds')[row]),
+                genre=self.categorical('genre', row),
+                mood=self.categorical('mood', row),
+                preview_url=self.text('preview_url', row),
+                features=json.loads(features) if features else None,
+                discovered_at=_EPOCH + timedelta(seconds=float(self.column('discovered_at')[row]))
+            )
+        return self._rows[row]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self[row] for row in range(self.count))
+
+    def rows(self, indices: Optional[Iterable[int]] = None) -> List[Any]:
+        return [self[row] for row in (indices if indices is not None else range(self.count))]
+
+    @property
+    def hydrated(self) -> int:
+        return len(self._rows)
+
+
+class ChartRows:
+    """Several charts read as one sequence of rows, hydrated on access"""
+
+    def __init__(self, snapshots: Sequence[ChartSnapshot]):
+        self.snapshots = list(snapshots)
+        self._starts = np.cumsum([0] + [len(s) for s in self.snapshots])
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        chart = int(np.searchsorted(self._starts, index, side='right')) - 1
+        return self.snapshots[chart][int(index - self._starts[chart])]
+
+    def __iter__(self) -> Iterator[Any]:
+        return (row for snapshot in self.snapshots for row in snapshot)
+
+    def column(self, name: str) -> np.ndarray:
+        return np.concatenate([s.column(name) for s in self.snapshots]) if self.snapshots else np.empty(0)
+
+    def texts(self, name: str) -> List[Optional[str]]:
+        return [value for s in self.snapshots for value in s.texts(name)]
+
+    def categories(self, name: str) -> Tuple[List[str], np.ndarray]:
+        """A merged vocabulary and every row's code into it (-1 = None)"""
+        vocabulary = sorted({v for s in self.snapshots for v in s.vocabularies[name]})
+        codes = {v: i for i, v in enumerate(vocabulary)}
+        remapped = [
+            # The trailing -1 maps a missing value's code (-1) onto itself
+            np.array([codes[v] for v in s.vocabularies[name]] + [-1], dtype=np.int32)[s.column(name)]
+            for s in self.snapshots
+        ]
+        return vocabulary, np.concatenate(remapped) if remapped else np.empty(0, dtype=np.int32)
+
+    @property
+    def hydrated(self) -> int:
+        return sum(s.hydrated for s in self.snapshots)
+
+
+def benchmark(tracks: Sequence[Any], model: Callable[..., Any], repeat: int = 50,
+              top_n: int = 10) -> Dict[str, Any]:
+    """Compare the JSON + pydantic cache format against columnar snapshots
+
+    Measures, per chart, the encoded size, the time and peak allocation to
+    read it back the way ``scrape`` does (count plus top ``top_n`` rows),
+    and the time to reach every trend score.
+    """
+    import time
+    import tracemalloc
+
+    json_data = json.dumps([t.dict() for t in tracks], default=str)
+    columnar_data = encode_chart(tracks)
+
+    def read_json():
+        rows = [model(**item) for item in json.loads(json_data)]
+        return len(rows), rows[:top_n]
+
+    def read_columnar():
+        snapshot = ChartSnapshot(columnar_data, model)
+        return len(snapshot), snapshot.rows(range(min(top_n, len(snapshot))))
+
+    def scores_json():
+        return [model(**item).trend_score for item in json.loads(json_data)]
+
+    def scores_columnar():
+        return ChartSnapshot(columnar_data, model).column('trend_score')
+
+    def measure(fn) -> Dict[str, float]:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        elapsed = (time.perf_counter() - started) / repeat
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {'ms': round(elapsed * 1000, 3), 'peak_kb': round(peak / 1024, 1)}
+
+    return {
+        'rows': len(tracks),
+        'json': {'bytes': len(json_data.encode('utf-8')), 'top_n': measure(read_json), 'all_scores': measure(scores_json)},
+        'columnar': {'bytes': len(columnar_data), 'top_n': measure(read_columnar), 'all_scores': measure(scores_columnar)}
+    }
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Rights Cache Module for Trending-Audio Agent
+Bulk Redis lookups and writes of rights verdicts, with negative caching
+"""
+
+import json
+import logging
+from typing import Dict, List, Any, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class RightsCache:
+    """Rights verdicts under ``audio_rights:{audio_id}``, read and written in bulk
+
+    ``get_many`` is a single MGET however many tracks are asked for, and
+    ``put_many`` a single non-transactional pipeline. Verdicts where no
+    licence was found are negative entries: still cached, so a chart full of
+    unlicensed tracks isn't re-checked on every request, but for
+    ``negative_ttl`` only, since licensing databases pick up new tracks.
+    Every Redis round trip is counted.
+    """
+
+    def __init__(self, redis_client: redis.Redis, ttl_seconds: int = 7 * 86400,
+                 negative_ttl: int = 3600, prefix: str = "audio_rights"):
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl = negative_ttl
+        self.prefix = prefix
+
+        self.round_trips = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _key(self, audio_id: str) -> str:
+        return f"{self.prefix}:{audio_id}"
+
+    def get_many(self, audio_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached verdicts for the IDs that have one, in one round trip"""
+        if not audio_ids:
+            return {}
+        try:
+            raw = self.redis_client.mget([self._key(a) for a in audio_ids])
+        except redis.RedisError as e:
+            logger.warning(f"Rights cache read failed: {e}")
+            return {}
+        finally:
+            self.round_trips += 1
+
+        found = {}
+        for audio_id, data in zip(audio_ids, raw):
+            if data is None:
+                self.misses += 1
+                continue
+            entry = json.loads(data)
+            if entry.pop('negative', False):
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            found[audio_id] = entry
+        return found
+
+    def put_many(self, verdicts: List[Tuple[Dict[str, Any], bool]]):
+        """Store ``(rights, negative)`` pairs in one pipelined round trip"""
+        if not verdicts:
+            return
+        pipe = self.redis_client.pipeline(transaction=False)
+        for rights, negative in verdicts:
+            pipe.setex(
+                self._key(rights['audio_id']),
+                self.negative_ttl if negative else self.ttl_seconds,
+                json.dumps(dict(rights, negative=True) if negative else rights, default=str)
+            )
+        try:
+            pipe.execute()
+            self.writes += len(verdicts)
+        except redis.RedisError as e:
+            logger.warning(f"Rights cache write failed: {e}")
+        finally:
+            self.round_trips += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            'round_trips': self.round_trips,
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+            'writes': self.writes
+        }
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Scoring Module for Trending-Audio Agent
+Column-array candidate scoring and partial top-K selection for many contexts at once
+"""
+
+import logging
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from alternative_index import ENERGY_LEVELS
+
+logger = logging.getLogger(__name__)
+
+# Feature match is left out (and the rest renormalised) for tracks without
+# measured features or contexts without energy/tempo targets, which keeps
+# the original 0.3/0.5/0.2 blend for those
+DEFAULT_WEIGHTS = {'mood': 0.3, 'trend': 0.5, 'rights': 0.2, 'features': 0.15}
+
+
+class CandidateColumns:
+    """Struct-of-arrays view of scoreable tracks
+
+    Built once per request from the track models (or, via ``from_chart``,
+    cached chart columns) and their rights; every context is then scored
+    against the same arrays.
+    """
+
+    def __init__(self, tracks: List[Any], rights: Dict[str, Any]):
+        self.tracks = tracks
+        self.rights = rights
+        n = len(tracks)
+
+        moods = sorted({t.mood for t in tracks if t.mood})
+        self.mood_codes = {m: i for i, m in enumerate(moods)}
+        platforms = sorted({t.platform for t in tracks})
+        self.platform_codes = {p: i for i, p in enumerate(platforms)}
+
+        self.trend = np.fromiter((t.trend_score for t in tracks), dtype=np.float32, count=n) / 100.0
+        self.mood = np.fromiter((self.mood_codes.get(t.mood, -1) for t in tracks), dtype=np.int32, count=n)
+        self.platform = np.fromiter((self.platform_codes[t.platform] for t in tracks), dtype=np.int32, count=n)
+        self.verified = np.fromiter((t.audio_id in rights for t in tracks), dtype=bool, count=n)
+        self.cleared = np.fromiter(
+            (t.audio_id in rights and rights[t.audio_id].is_cleared for t in tracks), dtype=bool, count=n
+        )
+        self.energy = np.fromiter(
+            ((t.features or {}).get('energy', np.nan) for t in tracks), dtype=np.float32, count=n
+        )
+        self.tempo = np.fromiter(
+            ((t.features or {}).get('tempo') or np.nan for t in tracks), dtype=np.float32, count=n
+        )
+
+    @classmethod
+    def from_chart(cls, rows: Any, rights: Dict[str, Any]) -> 'CandidateColumns':
+        """Columns taken straight from cached chart snapshots (``ChartRows``)
+
+        Only the ID column is decoded; ``tracks`` stays lazy, so models are
+        built just for the tracks a caller reads back.
+        """
+        columns = cls.__new__(cls)
+        columns.tracks = rows
+        columns.rights = rights
+
+        moods, columns.mood = rows.categories('mood')
+        columns.mood_codes = {m: i for i, m in enumerate(moods)}
+        platforms, columns.platform = rows.categories('platform')
+        columns.platform_codes = {p: i for i, p in enumerate(platforms)}
+
+        ids = rows.texts('audio_id')
+        columns.trend = rows.column('trend_score').astype(np.float32) / 100.0
+        columns.verified = np.fromiter((a in rights for a in ids), dtype=bool, count=len(ids))
+        columns.cleared = np.fromiter((a in rights and rights[a].is_cleared for a in ids), dtype=bool, count=len(ids))
+        columns.energy = rows.column('energy').astype(np.float32)
+        columns.tempo = rows.column('tempo').astype(np.float32)
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.tracks)
+
+
+def score_contexts(columns: CandidateColumns, contexts: List[Dict[str, Any]],
+                   weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Match scores, one row per context and one column per track
+
+    Tracks whose rights aren't verified, or outside a context's
+    ``platforms``, score -inf so they're never picked.
+    """
+    w = dict(DEFAULT_WEIGHTS, **(weights or {}))
+    n = len(columns)
+
+    context_moods = np.array([columns.mood_codes.get(c.get('mood', 'neutral'), -2) for c in contexts], dtype=np.int32)
+    mood_match = np.where(columns.mood[None, :] == context_moods[:, None], 1.0, 0.5)
+    rights_weight = np.where(columns.cleared, 1.0, 0.3)
+    base = w['mood'] * mood_match + w['trend'] * columns.trend + w['rights'] * rights_weight
+
+    # Energy/tempo closeness per (context, track); NaN where either side is missing
+    target_energy = np.array([_energy_target(c.get('energy')) for c in contexts], dtype=np.float32)
+    target_tempo = np.array([float(c['tempo']) if c.get('tempo') else np.nan for c in contexts], dtype=np.float32)
+    energy_match = 1.0 - np.minimum(1.0, np.abs(columns.energy[None, :] - target_energy[:, None]))
+    tempo_match = np.maximum(0.0, 1.0 - np.abs(columns.tempo[None, :] - target_tempo[:, None]) / 60.0)
+    with np.errstate(invalid='ignore'):
+        stacked = np.stack([energy_match, tempo_match])
+        present = ~np.isnan(stacked)
+        feature_match = np.where(present, stacked, 0.0).sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+    has_features = present.any(axis=0)
+
+    # Dividing by the weights in play keeps scores on a 0-1 scale
+    base_total = w['mood'] + w['trend'] + w['rights']
+    scores = np.where(
+        has_features,
+        (base + w['features'] * feature_match) / (base_total + w['features']),
+        base / base_total
+    )
+    scores[:, ~columns.verified] = -np.inf
+    for row, context in enumerate(contexts):
+        if context.get('platforms'):
+            allowed = [columns.platform_codes[p] for p in context['platforms'] if p in columns.platform_codes]
+            scores[row, ~np.isin(columns.platform, allowed)] = -np.inf
+    return scores.reshape(len(contexts), n)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best scores, best first, without a full sort"""
+    valid = int(np.isfinite(scores).sum())
+    k = min(k, valid)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def _energy_target(energy: Any) -> float:
+    if energy is None:
+        return np.nan
+    if isinstance(energy, str):
+        return ENERGY_LEVELS.get(energy, 0.5)
+    return float(energy)
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+import alternative_index
+from alternative_index import RoyaltyFreeIndex
+
+CATALOG = [
+    {'audio_id': 'rf1', 'title': 'Calm Piano', 'source': 'artlist', 'mood': 'calm', 'genre': 'classical',
+     'energy': 'low', 'tempo': 70, 'duration_seconds': 120, 'embedding': [1.0, 0.0, 0.0]},
+    {'audio_id': 'rf2', 'title': 'Summer Pop', 'source': 'epidemic_sound', 'mood': 'upbeat', 'genre': 'pop',
+     'energy': 0.8, 'tempo': 124, 'duration_seconds': 30, 'embedding': [0.0, 2.0, 0.0]},
+    {'audio_id': 'rf3', 'title': 'Night Drive', 'source': 'artlist', 'mood': 'upbeat', 'genre': 'electronic',
+     'energy': 'high', 'tempo': 128, 'duration_seconds': 200, 'embedding': [0.0, 1.0, 1.0]},
+    {'audio_id': 'rf4', 'title': 'Lo-fi Study', 'source': 'youtube_audio_library', 'mood': None, 'genre': None,
+     'energy': 0.3, 'tempo': 85, 'duration_seconds': 90, 'embedding': [0.5, 0.5, 0.0]}
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    return RoyaltyFreeIndex.build(str(tmp_path / 'index'), CATALOG)
+
+
+def ids(results):
+    return [r['audio_id'] for r in results]
+
+
+def test_build_writes_columns(index):
+    assert len(index) == 4
+    assert index.meta['moods'] == ['calm', 'unknown', 'upbeat']
+    assert index.meta['genres'] == ['classical', 'electronic', 'pop', 'unknown']
+    assert index.meta['embedding_dim'] == 3
+    assert isinstance(index.features, np.memmap)
+    np.testing.assert_allclose(np.linalg.norm(index.embeddings, axis=1), 1.0, rtol=1e-6)
+
+
+def test_nearest_by_features(index):
+    results = index.search(k=2, energy='high', tempo=127)
+
+    assert ids(results) == ['rf3', 'rf2']
+    assert results[0]['tempo'] == 128.0
+    assert results[0]['match_score'] > results[1]['match_score']
+
+
+def test_mood_and_genre_filters(index):
+    assert ids(index.search(k=5, moods=['upbeat'], tempo=120)) == ['rf2', 'rf3']
+    assert ids(index.search(k=5, moods=['upbeat'], genres=['electronic'])) == ['rf3']
+    assert ids(index.search(k=5, moods=['unknown'])) == ['rf4']
+    assert index.search(k=5, moods=['melancholy']) == []
+
+
+def test_max_duration_filter(index):
+    results = index.search(k=5, energy=0.8, max_duration=60)
+
+    assert ids(results) == ['rf2']
+    assert results[0]['duration_seconds'] == 30.0
+
+
+def test_embedding_distance(index):
+    assert ids(index.search(k=1, embedding=[0.0, 0.0, 3.0])) == ['rf3']
+    assert ids(index.search(k=1, embedding=[2.0, 0.0, 0.0])) == ['rf1']
+
+
+def test_query_embedding_is_not_modified(index):
+    embedding = np.array([0.0, 0.0, 3.0], dtype=np.float32)
+
+    index.search(k=1, embedding=embedding)
+
+    assert embedding.tolist() == [0.0, 0.0, 3.0]
+
+
+def test_top_k_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(alternative_index, 'CHUNK_ROWS', 3)
+    catalog = [{'audio_id': f"rf{i}", 'tempo': 60 + i, 'duration_seconds': 60} for i in range(20)]
+    index = RoyaltyFreeIndex.build(str(tmp_path / 'index'), catalog)
+
+    assert ids(index.search(k=4, tempo=71.2)) == ['rf11', 'rf12', 'rf10', 'rf13']
+    assert len(index.search(k=50, tempo=70)) == 20
+
+
+def test_mixed_embedding_lengths_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        RoyaltyFreeIndex.build(str(tmp_path / 'index'), [
+            {'audio_id': 'a', 'embedding': [1.0, 0.0]},
+            {'audio_id': 'b'}
+        ])
+
+
+def test_rebuild_swaps_in_new_version(tmp_path):
+    root = str(tmp_path / 'index')
+    first = RoyaltyFreeIndex.build(root, CATALOG)
+    second = RoyaltyFreeIndex.build(root, CATALOG[:2])
+    third = RoyaltyFreeIndex.build(root, CATALOG[:1])
+
+    assert os.path.islink(root)
+    assert len(RoyaltyFreeIndex(root)) == 1
+    # The build readers may still hold stays; older ones are removed
+    assert os.path.isdir(second.version_dir)
+    assert not os.path.exists(first.version_dir)
+    assert len(first.search(k=5)) == 4
+    assert third.version_dir != second.version_dir
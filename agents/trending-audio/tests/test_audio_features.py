@@ -0,0 +1,81 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from audio_features import SAMPLE_RATE, compute_features, decode_audio, extract_features, is_wav
+
+
+def click_track(bpm, seconds=8.0, rate=SAMPLE_RATE):
+    samples = np.zeros(int(rate * seconds), dtype=np.float32)
+    for start in (np.arange(0, seconds, 60.0 / bpm) * rate).astype(int):
+        samples[start:start + 200] = 0.8
+    return samples
+
+
+def to_wav(samples, rate=SAMPLE_RATE, channels=1):
+    pcm = (np.repeat(samples, channels) * 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('bpm', [90, 120, 140])
+def test_tempo_of_click_track(bpm):
+    features = compute_features(click_track(bpm))
+
+    assert features['tempo'] == pytest.approx(bpm, rel=0.05)
+    assert features['duration_seconds'] == pytest.approx(8.0, abs=0.01)
+
+
+def test_feature_shapes_and_ranges():
+    features = compute_features(click_track(120))
+
+    assert 0.0 < features['energy'] <= 1.0
+    assert len(features['chroma']) == 12
+    assert max(features['chroma']) == pytest.approx(1.0, abs=1e-3)
+    assert np.linalg.norm(features['embedding']) == pytest.approx(1.0, abs=1e-3)
+    assert 0.0 < features['spectral_centroid'] < SAMPLE_RATE / 2
+
+
+def test_louder_signal_has_more_energy():
+    quiet = compute_features(click_track(120) * 0.05)
+    loud = compute_features(click_track(120))
+
+    assert loud['energy'] > quiet['energy']
+
+
+def test_silence_and_short_input():
+    silence = compute_features(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert silence['tempo'] == 0.0
+    assert silence['energy'] == 0.0
+
+    short = compute_features(np.full(100, 0.1, dtype=np.float32))
+    assert short['tempo'] == 0.0
+    assert len(short['embedding']) == 20
+
+
+def test_decode_wav_resamples_and_mixes_down():
+    samples = click_track(120, seconds=2.0, rate=44100)
+    decoded = decode_audio(to_wav(samples, rate=44100, channels=2))
+
+    assert decoded.dtype == np.float32
+    assert len(decoded) == pytest.approx(2 * SAMPLE_RATE, abs=2)
+    assert decoded.max() == pytest.approx(0.8, abs=1e-3)
+
+
+def test_extract_features_from_wav():
+    features = extract_features(to_wav(click_track(120)))
+
+    assert features['tempo'] == pytest.approx(120, rel=0.05)
+
+
+def test_is_wav():
+    assert is_wav(to_wav(np.zeros(10, dtype=np.float32)))
+    assert not is_wav(b'ID3\x04\x00' + b'\x00' * 20)
+    assert not is_wav(b'')
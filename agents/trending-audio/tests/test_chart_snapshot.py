@@ -0,0 +1,136 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from chart_snapshot import ChartRows, ChartSnapshot, encode_chart
+
+FIELDS = ['audio_id', 'platform', 'title', 'artist', 'rank', 'usage_count', 'trend_score',
+          'duration_seconds', 'genre', 'mood', 'preview_url', 'features', 'discovered_at']
+
+
+def track(audio_id, platform='tiktok', **overrides):
+    values = {
+        'audio_id': audio_id,
+        'platform': platform,
+        'title': f"Title {audio_id} ✨",
+        'artist': 'Artist',
+        'rank': 1,
+        'usage_count': 1_000_000,
+        'trend_score': 87.5,
+        'duration_seconds': 30,
+        'genre': 'pop',
+        'mood': 'upbeat',
+        'preview_url': f"https://cdn.example.com/{audio_id}.mp3",
+        'features': {'tempo': 120.0, 'energy': 0.8},
+        'discovered_at': datetime(2024, 5, 1, 12, 30, 15, 250000)
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def as_dict(row):
+    return {field: getattr(row, field) for field in FIELDS}
+
+
+def test_round_trip():
+    tracks = [
+        track('a1', rank=1),
+        track('a2', platform='youtube', rank=2, genre='hip-hop', mood='chill', trend_score=42.0),
+        track('a3', rank=3, title='', artist='')
+    ]
+    snapshot = ChartSnapshot(encode_chart(tracks), SimpleNamespace)
+
+    assert len(snapshot) == 3
+    assert [as_dict(row) for row in snapshot] == [as_dict(t) for t in tracks]
+    assert snapshot.column('rank').tolist() == [1, 2, 3]
+    assert snapshot.texts('audio_id') == ['a1', 'a2', 'a3']
+
+
+def test_none_fields_round_trip():
+    tracks = [
+        track('a1', genre=None, mood=None, preview_url=None, features=None),
+        track('a2', features={'energy': 0.4}),
+        track('a3')
+    ]
+    snapshot = ChartSnapshot(encode_chart(tracks), SimpleNamespace)
+
+    first = snapshot[0]
+    assert first.genre is None
+    assert first.mood is None
+    assert first.preview_url is None
+    assert first.features is None
+    assert snapshot.categorical('genre', 0) is None
+    assert snapshot.text('preview_url', 0) is None
+    assert [as_dict(row) for row in snapshot] == [as_dict(t) for t in tracks]
+
+    # Missing features are NaN in the numeric columns
+    energy = snapshot.column('energy')
+    tempo = snapshot.column('tempo')
+    assert np.isnan(energy[0]) and np.isnan(tempo[0])
+    assert energy[1] == pytest.approx(0.4) and np.isnan(tempo[1])
+    assert tempo[2] == 120.0
+
+
+def test_empty_chart():
+    snapshot = ChartSnapshot(encode_chart([]), SimpleNamespace)
+
+    assert len(snapshot) == 0
+    assert list(snapshot) == []
+    assert snapshot.column('trend_score').shape == (0,)
+    assert snapshot.texts('title') == []
+    with pytest.raises(IndexError):
+        snapshot[0]
+
+
+def test_rows_hydrate_lazily():
+    tracks = [track(f"a{i}", rank=i) for i in range(50)]
+    snapshot = ChartSnapshot(encode_chart(tracks), SimpleNamespace)
+
+    assert snapshot.column('trend_score').shape == (50,)
+    assert snapshot.hydrated == 0
+    assert snapshot[-1].audio_id == 'a49'
+    assert snapshot[10] is snapshot[10]
+    assert snapshot.hydrated == 2
+
+
+def test_columns_are_aligned_views():
+    snapshot = ChartSnapshot(encode_chart([track('a1'), track('a2')]), SimpleNamespace)
+
+    for name in ['rank', 'usage_count', 'trend_score', 'discovered_at']:
+        column = snapshot.column(name)
+        assert not column.flags.owndata
+        assert column.ctypes.data % column.dtype.alignment == 0
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError):
+        ChartSnapshot(b'[{"audio_id": "a1"}]', SimpleNamespace)
+
+
+def test_chart_rows_merge_vocabularies():
+    tiktok = ChartSnapshot(encode_chart([track('t1', mood='upbeat'), track('t2', mood=None)]), SimpleNamespace)
+    empty = ChartSnapshot(encode_chart([]), SimpleNamespace)
+    youtube = ChartSnapshot(encode_chart([track('y1', platform='youtube', mood='chill')]), SimpleNamespace)
+    rows = ChartRows([tiktok, empty, youtube])
+
+    assert len(rows) == 3
+    assert rows[2].audio_id == 'y1'
+    assert rows.texts('audio_id') == ['t1', 't2', 'y1']
+
+    moods, codes = rows.categories('mood')
+    assert moods == ['chill', 'upbeat']
+    assert codes.tolist() == [1, -1, 0]
+    platforms, codes = rows.categories('platform')
+    assert [platforms[c] for c in codes] == ['tiktok', 'tiktok', 'youtube']
+
+
+def test_no_chart_rows():
+    rows = ChartRows([])
+
+    assert len(rows) == 0
+    assert rows.column('trend_score').shape == (0,)
+    moods, codes = rows.categories('mood')
+    assert moods == []
+    assert codes.shape == (0,)
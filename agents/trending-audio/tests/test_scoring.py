@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from chart_snapshot import ChartRows, ChartSnapshot, encode_chart
+from scoring import CandidateColumns, score_contexts, top_k
+from test_chart_snapshot import track
+
+
+def rights(*cleared, restricted=()):
+    result = {audio_id: SimpleNamespace(is_cleared=True) for audio_id in cleared}
+    result.update({audio_id: SimpleNamespace(is_cleared=False) for audio_id in restricted})
+    return result
+
+
+def test_top_k_best_first():
+    scores = np.array([0.2, 0.9, 0.5, 0.7, 0.1])
+
+    assert top_k(scores, 3).tolist() == [1, 3, 2]
+    assert top_k(scores, 10).tolist() == [1, 3, 2, 0, 4]
+
+
+def test_top_k_skips_masked_scores():
+    scores = np.array([-np.inf, 0.4, -np.inf, 0.8])
+
+    assert top_k(scores, 3).tolist() == [3, 1]
+    assert top_k(np.full(4, -np.inf), 2).tolist() == []
+    assert top_k(scores, 0).tolist() == []
+
+
+def test_top_k_ties_keep_order():
+    assert top_k(np.array([0.5, 0.5, 0.5, 0.1]), 4).tolist() == [0, 1, 2, 3]
+
+
+def test_unverified_tracks_are_masked():
+    tracks = [track('a1'), track('a2'), track('a3')]
+    columns = CandidateColumns(tracks, rights('a1', restricted=['a3']))
+
+    scores = score_contexts(columns, [{'mood': 'upbeat'}, {'mood': 'chill'}])
+
+    assert scores.shape == (2, 3)
+    assert np.isneginf(scores[:, 1]).all()
+    assert np.isfinite(scores[:, [0, 2]]).all()
+    # Cleared rights outscore restricted ones, all else equal
+    assert (scores[:, 0] > scores[:, 2]).all()
+    assert top_k(scores[0], 5).tolist() == [0, 2]
+
+
+def test_platform_filter_masks_other_platforms():
+    tracks = [track('t1'), track('y1', platform='youtube'), track('i1', platform='instagram')]
+    columns = CandidateColumns(tracks, rights('t1', 'y1', 'i1'))
+
+    scores = score_contexts(columns, [
+        {'platforms': ['youtube']},
+        {'platforms': ['tiktok', 'instagram']},
+        {'platforms': ['snapchat']},
+        {}
+    ])
+
+    assert np.isfinite(scores[0]).tolist() == [False, True, False]
+    assert np.isfinite(scores[1]).tolist() == [True, False, True]
+    assert np.isneginf(scores[2]).all()
+    assert np.isfinite(scores[3]).all()
+
+
+def test_mood_and_trend_blend():
+    tracks = [
+        track('a1', mood='chill', trend_score=100.0, features=None),
+        track('a2', mood='upbeat', trend_score=100.0, features=None),
+        track('a3', mood=None, trend_score=0.0, features=None)
+    ]
+    columns = CandidateColumns(tracks, rights('a1', 'a2', 'a3'))
+
+    scores = score_contexts(columns, [{'mood': 'chill'}])[0]
+
+    # Without features the original 0.3/0.5/0.2 blend applies
+    assert scores.tolist() == pytest.approx([1.0, 0.85, 0.35])
+
+
+def test_feature_match_prefers_closer_tracks():
+    tracks = [
+        track('slow', features={'tempo': 70.0, 'energy': 0.2}),
+        track('fast', features={'tempo': 128.0, 'energy': 0.85}),
+        track('plain', features=None)
+    ]
+    columns = CandidateColumns(tracks, rights('slow', 'fast', 'plain'))
+
+    scores = score_contexts(columns, [
+        {'mood': 'upbeat', 'energy': 'high', 'tempo': 125},
+        {'mood': 'upbeat', 'energy': 'low'},
+        {'mood': 'upbeat'}
+    ])
+
+    assert scores[0, 1] > scores[0, 0]
+    assert scores[1, 0] > scores[1, 1]
+    # A context without targets ignores features altogether
+    assert scores[2].tolist() == pytest.approx([scores[2, 2]] * 3)
+
+
+def test_chart_columns_match_model_columns():
+    tracks = [
+        track('a1', mood='chill', trend_score=60.0),
+        track('a2', platform='youtube', mood=None, features=None),
+        track('a3', mood='upbeat', features={'energy': 0.3})
+    ]
+    grants = rights('a1', 'a3', restricted=['a2'])
+    contexts = [{'mood': 'chill', 'energy': 'low', 'tempo': 100}, {'platforms': ['tiktok']}]
+    rows = ChartRows([
+        ChartSnapshot(encode_chart(tracks[:2]), SimpleNamespace),
+        ChartSnapshot(encode_chart(tracks[2:]), SimpleNamespace)
+    ])
+
+    from_models = score_contexts(CandidateColumns(tracks, grants), contexts)
+    from_chart = score_contexts(CandidateColumns.from_chart(rows, grants), contexts)
+
+    np.testing.assert_allclose(from_chart, from_models)
+    assert rows.hydrated == 0